@@ -0,0 +1,163 @@
+"""
+Бенчмарк времени импорта модулей парсера (python -X importtime).
+
+Запуск из корня проекта:
+    python -m benchmarks.import_time --budget-ms 40
+
+Каждый модуль импортируется в отдельном чистом интерпретаторе repeat раз, перед каждым замером
+в таком же интерпретаторе измеряется время импорта обязательных зависимостей (BASELINE_MODULES).
+Собственное время импорта модуля - медиана разностей этих замеров: шум машины влияет на оба замера,
+поэтому бюджет проверяется для собственного времени, а не для полного.
+Для каждого модуля выводится полное и собственное время импорта и самые тяжелые зависимости верхнего уровня.
+Код возврата 1, если собственное время импорта хотя бы одного модуля превышает бюджет.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import NamedTuple
+
+MODULES = (
+    "parsers.url_parser",
+    "parsers.data_parser",
+    "parsers.jobs",
+    "main",
+)
+
+# Обязательные зависимости парсера, их время импорта не входит в бюджет.
+BASELINE_MODULES = ("asyncio", "httpx", "lxml.etree")
+
+# Модули, которые не должны загружаться при импорте: они нужны только отдельным сценариям.
+LAZY_MODULES = (
+    "requests",
+    "bs4",
+    "sqlite3",
+    "cProfile",
+    "multiprocessing",
+    "pyarrow",
+    "numpy",
+    "pandas",
+    "polars",
+    "pyinstrument",
+)
+
+# Модули, которые импортирует и сам интерпретатор, например, site.
+_STARTUP_MODULES = {"site", "encodings", "_frozen_importlib_external"}
+
+
+class ImportTiming(NamedTuple):
+    module: str
+    total_us: int
+    # Самые тяжелые модули, импортированные этим модулем: (название, мкс).
+    heaviest: list[tuple[str, int]]
+    # Модули из LAZY_MODULES, которые загрузились при импорте.
+    eager: list[str]
+
+
+def _import_time(*modules: str) -> list[tuple[int, str, int]]:
+    """
+    :param modules: Названия модулей, которые импортируются в чистом интерпретаторе.
+    :return: Строки вывода python -X importtime: (отступ, название модуля, суммарное время в мкс).
+    """
+
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(modules)}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        # Байт-код сохраняется, чтобы повторные запуски не тратили время на компиляцию.
+        env={
+            key: value
+            for key, value in os.environ.items()
+            if key != "PYTHONDONTWRITEBYTECODE"
+        },
+    )
+
+    lines = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        lines.append((len(name) - len(name.lstrip()), name.strip(), int(cumulative)))
+    return lines
+
+
+def measure_baseline() -> int:
+    """
+    :return: Время импорта BASELINE_MODULES в чистом интерпретаторе в мкс.
+    """
+
+    return sum(
+        cumulative
+        for indent, name, cumulative in _import_time(*BASELINE_MODULES)
+        if indent == 1 and name in BASELINE_MODULES
+    )
+
+
+def measure(module: str, top: int = 5) -> ImportTiming:
+    """
+    :param module: Название модуля.
+    :param top: Количество самых тяжелых зависимостей в результате.
+    :return: Время импорта модуля в чистом интерпретаторе.
+    """
+
+    total = 0
+    dependencies = []
+    loaded = set()
+    for indent, name, cumulative in _import_time(module):
+        loaded.add(name.split(".")[0])
+        if name == module and indent == 1:
+            total = cumulative
+        elif indent == 3:
+            dependencies.append((name, cumulative))
+
+    dependencies.sort(key=lambda dependency: dependency[1], reverse=True)
+    return ImportTiming(
+        module,
+        total,
+        dependencies[:top],
+        [name for name in LAZY_MODULES if name in loaded - _STARTUP_MODULES],
+    )
+
+
+def main() -> int:
+    arguments = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arguments.add_argument("--modules", nargs="+", default=list(MODULES))
+    arguments.add_argument("--budget-ms", type=float, default=40.0)
+    arguments.add_argument("--repeat", type=int, default=7)
+    options = arguments.parse_args()
+
+    print(f"{'':<24} {'total':>8}    {'own':>8}")
+    over_budget = []
+    for module in options.modules:
+        samples = []
+        for _ in range(max(options.repeat, 1)):
+            baseline_us = measure_baseline()
+            timing = measure(module)
+            samples.append((timing.total_us - baseline_us, timing))
+        samples.sort(key=lambda sample: sample[0])
+        own_us, timing = samples[len(samples) // 2]
+
+        own_ms = own_us / 1000
+        heaviest = ", ".join(
+            f"{name} {elapsed / 1000:.1f}" for name, elapsed in timing.heaviest
+        )
+        print(
+            f"{module:<24} {timing.total_us / 1000:>8.1f} ms {own_ms:>8.1f} ms"
+            f"  [{heaviest}]"
+        )
+        if timing.eager:
+            print(f"{'':<24} eager: {', '.join(timing.eager)}")
+        if own_ms > options.budget_ms or timing.eager:
+            over_budget.append(module)
+
+    if over_budget:
+        print(f"\nImport time budget exceeded: {', '.join(over_budget)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+"""
+Синтетический маркетплейс в стиле parsinger.ru для бенчмарков.
+Страницы генерируются детерминированно по номеру категории и товара,
+поэтому размер каталога ограничен только параметрами, а не памятью.
+"""
+import asyncio
+import random
+from contextlib import asynccontextmanager
+from math import ceil
+from re import compile
+from typing import AsyncIterator
+from typing import Optional
+
+from aiohttp import web
+
+
+CATEGORIES = ["watch", "mobile", "mouse", "hdd", "headphones"]
+
+_LISTING_PAGE = compile(r"index(\d+)_page_(\d+)\.html")
+_PRODUCT_CARD = compile(r"(\w+)/(\d+)/(\d+)_(\d+)\.html")
+
+
+class MockMarketplace:
+    """
+    Генератор HTML разметки: nav_menu, pagen, sale_button и карточки товаров
+    с p_header, in_stock и price.
+    """
+
+    def __init__(
+        self,
+        products: int = 1000,
+        products_per_page: int = 32,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        """
+        :param products: Общее количество товаров, распределяется поровну между категориями.
+        :param products_per_page: Количество товаров на одной странице категории.
+        :param latency: Задержка ответа в секундах.
+        :param error_rate: Доля запросов, на которые сервер отвечает ошибкой 500.
+        :param seed: Начальное значение генератора случайных ошибок.
+        """
+
+        self.products_per_category = max(ceil(products / len(CATEGORIES)), 1)
+        self.products_per_page = products_per_page
+        self.pages_per_category = ceil(self.products_per_category / products_per_page)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.__random = random.Random(seed)
+
+    @property
+    def products(self) -> int:
+        return self.products_per_category * len(CATEGORIES)
+
+    def nav_menu(self) -> str:
+        links = "".join(
+            f'<a href="index{number}_page_1.html"><div id="{category}">{category}</div></a>'
+            for number, category in enumerate(CATEGORIES, start=1)
+        )
+        return f'<div class="nav_menu">{links}</div>'
+
+    def pagen(self, category_number: int) -> str:
+        links = "".join(
+            f'<a href="index{category_number}_page_{page}.html">{page}</a>'
+            for page in range(1, self.pages_per_category + 1)
+        )
+        return f'<div class="pagen">{links}</div>'
+
+    def listing_page(self, category_number: int, page: int) -> Optional[str]:
+        if not 1 <= category_number <= len(CATEGORIES):
+            return None
+        if not 1 <= page <= self.pages_per_category:
+            return None
+
+        category = CATEGORIES[category_number - 1]
+        first = (page - 1) * self.products_per_page + 1
+        last = min(first + self.products_per_page - 1, self.products_per_category)
+
+        items = "".join(
+            f'<div class="item"><div class="img_box">'
+            f'<a class="name_item" href="{category}/{category_number}/{category_number}_{number}.html">'
+            f"{category} {number}</a>"
+            f'<div class="description"><li>Бренд: brand {number % 17}</li>\n'
+            f"<li>Тип: type {category_number}</li>\n</div>"
+            f'<p class="price">{self.price(number)} руб</p>'
+            f'<div class="sale_button">'
+            f'<a href="{category}/{category_number}/{category_number}_{number}.html">Подробнее</a>'
+            f"</div></div></div>"
+            for number in range(first, last + 1)
+        )
+        return self.__page(
+            f"{self.nav_menu()}<div class='item_card'>{items}</div>"
+            f"{self.pagen(category_number)}"
+        )
+
+    def product_card(self, category_number: int, number: int) -> Optional[str]:
+        if not 1 <= category_number <= len(CATEGORIES):
+            return None
+        if not 1 <= number <= self.products_per_category:
+            return None
+
+        category = CATEGORIES[category_number - 1]
+        return self.__page(
+            f"{self.nav_menu()}<div class='description'>"
+            f'<p id="p_header">{category} {number}</p>'
+            f'<p class="article">Артикул: {category_number * 10_000_000 + number}</p>'
+            f'<ul id="description">\n'
+            f'<li id="brand">Бренд: brand {number % 17}</li>\n'
+            f'<li id="type">Тип: type {category_number}</li>\n'
+            f'<li id="color">Цвет: color {number % 5}</li>\n'
+            f"</ul>"
+            f'<div class="sale"><span id="in_stock">В наличии: {number % 50}</span>'
+            f'<p class="price">Цена: <span id="price">{self.price(number)} руб</span></p>'
+            f'<p class="old_price">Старая цена: '
+            f'<span id="old_price">{self.price(number) + 100} руб</span></p>'
+            f"</div></div>"
+        )
+
+    @staticmethod
+    def price(number: int) -> int:
+        return 500 + number * 7 % 10_000
+
+    def should_fail(self) -> bool:
+        return self.error_rate > 0 and self.__random.random() < self.error_rate
+
+    @staticmethod
+    def __page(body: str) -> str:
+        return f'<html><head><meta charset="utf-8"></head><body>{body}</body></html>'
+
+    def render(self, path: str) -> Optional[str]:
+        """
+        :param path: Путь страницы относительно /html/.
+        :return: HTML разметка страницы или None, если страницы не существует.
+        """
+
+        listing = _LISTING_PAGE.fullmatch(path)
+        if listing:
+            return self.listing_page(int(listing.group(1)), int(listing.group(2)))
+
+        card = _PRODUCT_CARD.fullmatch(path)
+        if card:
+            return self.product_card(int(card.group(2)), int(card.group(4)))
+
+        return None
+
+    def application(self) -> web.Application:
+        """
+        :return: Приложение aiohttp, отдающее страницы по адресам /html/....
+        """
+
+        async def handle(request: web.Request) -> web.Response:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            if self.should_fail():
+                return web.Response(status=500, text="Internal Server Error")
+
+            page = self.render(request.match_info["path"])
+            if page is None:
+                return web.Response(status=404, text="Not Found")
+            return web.Response(text=page, content_type="text/html", charset="utf-8")
+
+        app = web.Application()
+        app.router.add_get("/html/{path:.+}", handle)
+        return app
+
+
+@asynccontextmanager
+async def serve(
+    marketplace: MockMarketplace, host: str = "127.0.0.1", port: int = 0
+) -> AsyncIterator[str]:
+    """
+    Контекстный менеджер для запуска локального сервера маркетплейса.
+    :param marketplace: Генератор страниц.
+    :param host: Адрес сервера.
+    :param port: Порт сервера, 0 - любой свободный.
+    :return: Базовый URL адрес магазина для URLParser.
+    """
+
+    runner = web.AppRunner(marketplace.application(), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+
+    try:
+        bound_port = runner.addresses[0][1]
+        yield f"http://{host}:{bound_port}/html/"
+    finally:
+        await runner.cleanup()
@@ -0,0 +1,322 @@
+"""
+Бенчмарк точек входа URLParser и DataParser на локальном синтетическом маркетплейсе.
+
+Запуск из корня проекта:
+    python -m benchmarks.run_benchmarks --products 10000 --latency 0.005
+
+Для каждой точки входа выводятся: страниц в секунду, p50/p99 задержки загрузки страницы,
+время разбора одной страницы и пиковое потребление памяти (RSS).
+Каждая точка входа выполняется в отдельном процессе, сервер - тоже в отдельном процессе.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+from typing import Callable
+from typing import NamedTuple
+from typing import Optional
+
+import httpx
+
+from benchmarks.mock_marketplace import MockMarketplace
+from benchmarks.mock_marketplace import serve
+from parsers import extractors
+from parsers.data_parser import DataParser
+from parsers.executor import ParsingExecutor
+from parsers.session import ParserSession
+from parsers.url_parser import URLParser
+
+
+class Entry(NamedTuple):
+    """
+    Точка входа: что подготовить заранее, что измерять и какой функцией разбирается страница.
+    """
+
+    inputs: Optional[str]
+    call: Callable[[URLParser, DataParser, Any], Any]
+    parse: Callable[[bytes], Any]
+    sample_page: str
+
+
+ENTRIES: dict[str, Entry] = {
+    "get_category_urls": Entry(
+        None,
+        lambda url_parser, data_parser, _: url_parser.get_category_urls(),
+        extractors.extract_category_links,
+        "index1_page_1.html",
+    ),
+    "get_url_for_each_category_page": Entry(
+        None,
+        lambda url_parser, data_parser, _: url_parser.get_url_for_each_category_page(),
+        extractors.extract_pagination_links,
+        "index1_page_1.html",
+    ),
+    "get_url_for_each_product_card": Entry(
+        None,
+        lambda url_parser, data_parser, _: url_parser.get_url_for_each_product_card(),
+        extractors.extract_product_links,
+        "index1_page_1.html",
+    ),
+    "get_total_product_price": Entry(
+        "product_urls",
+        lambda url_parser, data_parser, urls: data_parser.get_total_product_price(urls),
+        extractors.extract_product_value,
+        "watch/1/1_1.html",
+    ),
+    "write_csv_cards": Entry(
+        "product_urls",
+        lambda url_parser, data_parser, urls: data_parser.write_csv(
+            urls, table_filename="bench_cards"
+        ),
+        extractors.extract_product_card,
+        "watch/1/1_1.html",
+    ),
+    "write_csv_pages": Entry(
+        "page_urls",
+        lambda url_parser, data_parser, urls: data_parser.write_csv(
+            urls, table_filename="bench_pages"
+        ),
+        extractors.extract_listing_items,
+        "index1_page_1.html",
+    ),
+    "stream_csv": Entry(
+        None,
+        lambda url_parser, data_parser, _: data_parser.stream_csv(
+            url_parser.iter_url_for_each_product_card(), table_filename="bench_stream"
+        ),
+        extractors.extract_product_card,
+        "watch/1/1_1.html",
+    ),
+}
+
+
+class TimingTransport(httpx.AsyncBaseTransport):
+    """
+    Транспорт httpx, измеряющий время загрузки каждой страницы (до получения всего тела ответа).
+    """
+
+    def __init__(self) -> None:
+        self.__transport = httpx.AsyncHTTPTransport()
+        self.latencies: list[float] = []
+        self.errors = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        response = await self.__transport.handle_async_request(request)
+        # Тело читается без распаковки: заголовки кодирования передаются в ответ вместе с ним.
+        content = b"".join([chunk async for chunk in response.aiter_raw()])
+        await response.aclose()
+        self.latencies.append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            self.errors += 1
+
+        return httpx.Response(
+            response.status_code, headers=response.headers, content=content
+        )
+
+    def reset(self) -> None:
+        self.latencies = []
+        self.errors = 0
+
+    async def aclose(self) -> None:
+        await self.__transport.aclose()
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def peak_rss_mb() -> float:
+    """
+    :return: Пиковый RSS текущего процесса и его дочерних процессов (пул разбора) в мегабайтах.
+    """
+
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    self_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return (self_rss + children_rss) * scale / 1024 / 1024
+
+
+def measure_parse_time(parse: Callable[[bytes], Any], page: bytes) -> float:
+    """
+    :return: Среднее время разбора одной страницы в миллисекундах.
+    """
+
+    repeats = 200
+    start = time.perf_counter()
+    for _ in range(repeats):
+        parse(page)
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+async def run_entry_async(
+    name: str, base_url: str, workers: int, parser_backend: str
+) -> dict[str, Any]:
+    entry = ENTRIES[name]
+    transport = TimingTransport()
+
+    async with ParserSession(
+        transport=transport,
+        workers=workers,
+        max_connections_per_host=workers,
+        executor=ParsingExecutor(parser_backend),
+    ) as session:
+        url_parser = URLParser(session, base_shop_url=base_url)
+        data_parser = DataParser(session)
+
+        # Входные данные подготавливаются до начала измерений.
+        inputs = None
+        if entry.inputs == "product_urls":
+            inputs = await url_parser.get_url_for_each_product_card()
+        elif entry.inputs == "page_urls":
+            inputs = await url_parser.get_url_for_each_category_page()
+
+        sample_page = (await session.get(base_url + entry.sample_page)).content
+        transport.reset()
+
+        start = time.perf_counter()
+        await entry.call(url_parser, data_parser, inputs)
+        elapsed = time.perf_counter() - start
+
+    requests_count = len(transport.latencies)
+    return {
+        "entry": name,
+        "requests": requests_count,
+        "errors": transport.errors,
+        "elapsed_s": round(elapsed, 4),
+        "pages_per_s": round(requests_count / elapsed, 1) if elapsed else 0.0,
+        "p50_fetch_ms": round(percentile(transport.latencies, 0.5) * 1000, 2),
+        "p99_fetch_ms": round(percentile(transport.latencies, 0.99) * 1000, 2),
+        "parse_ms_per_page": round(measure_parse_time(entry.parse, sample_page), 3),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def run_entry(
+    name: str, base_url: str, workers: int, parser_backend: str
+) -> dict[str, Any]:
+    """
+    Функция выполняется в отдельном процессе, чтобы пиковый RSS относился только к одной точке входа.
+    """
+
+    os.chdir(tempfile.mkdtemp(prefix="marketplace_bench_"))
+    return asyncio.run(run_entry_async(name, base_url, workers, parser_backend))
+
+
+def serve_forever(options: dict[str, Any], port_queue: Any) -> None:
+    """
+    Функция запускает сервер маркетплейса в отдельном процессе и передает его адрес через очередь.
+    """
+
+    async def main() -> None:
+        async with serve(MockMarketplace(**options)) as base_url:
+            port_queue.put(base_url)
+            await asyncio.Event().wait()
+
+    asyncio.run(main())
+
+
+def compare_with_baseline(
+    results: list[dict[str, Any]], baseline_path: str, tolerance: float
+) -> list[str]:
+    """
+    :return: Список точек входа, пропускная способность которых упала больше, чем на tolerance.
+    """
+
+    with open(baseline_path, encoding="utf-8") as file:
+        baseline = {result["entry"]: result for result in json.load(file)}
+
+    regressions = []
+    for result in results:
+        previous = baseline.get(result["entry"])
+        if previous and result["pages_per_s"] < previous["pages_per_s"] * (
+            1 - tolerance
+        ):
+            regressions.append(
+                f"{result['entry']}: {previous['pages_per_s']} -> {result['pages_per_s']} pages/s"
+            )
+    return regressions
+
+
+def main() -> int:
+    arguments = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arguments.add_argument("--products", type=int, default=1000)
+    arguments.add_argument("--products-per-page", type=int, default=32)
+    arguments.add_argument("--latency", type=float, default=0.0, help="seconds")
+    arguments.add_argument("--error-rate", type=float, default=0.0)
+    arguments.add_argument("--workers", type=int, default=20)
+    arguments.add_argument(
+        "--parser-backend", choices=ParsingExecutor.KINDS, default="process"
+    )
+    arguments.add_argument(
+        "--entries", nargs="+", choices=list(ENTRIES), default=list(ENTRIES)
+    )
+    arguments.add_argument("--json", help="save results to this file")
+    arguments.add_argument("--baseline", help="compare with results saved by --json")
+    arguments.add_argument("--tolerance", type=float, default=0.2)
+    options = arguments.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    port_queue = context.Queue()
+    server = context.Process(
+        target=serve_forever,
+        args=(
+            {
+                "products": options.products,
+                "products_per_page": options.products_per_page,
+                "latency": options.latency,
+                "error_rate": options.error_rate,
+            },
+            port_queue,
+        ),
+        daemon=True,
+    )
+    server.start()
+
+    try:
+        base_url = port_queue.get(timeout=30)
+        results = []
+        for name in options.entries:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                result = pool.submit(
+                    run_entry, name, base_url, options.workers, options.parser_backend
+                ).result()
+            results.append(result)
+            print(
+                "{entry:<32} {requests:>7} req {errors:>5} err {elapsed_s:>9} s "
+                "{pages_per_s:>9} pages/s  p50 {p50_fetch_ms:>7} ms  p99 {p99_fetch_ms:>7} ms  "
+                "parse {parse_ms_per_page:>7} ms/page  rss {peak_rss_mb:>7} MB".format(
+                    **result
+                )
+            )
+    finally:
+        server.terminate()
+        server.join()
+
+    if options.json:
+        with open(options.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    if options.baseline:
+        regressions = compare_with_baseline(
+            results, options.baseline, options.tolerance
+        )
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
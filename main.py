@@ -1,26 +1,141 @@
+import argparse
 import asyncio
+import os
+import sys
 import time
 
-from parsers.data_parser import DataParser
+from parsers.abc_class import CATEGORIES
+from parsers.executor import ParsingExecutor
+from parsers.jobs import category_jobs
+from parsers.jobs import run_jobs
+from parsers.session import ParserSession
+from parsers.sinks import SINKS
 from parsers.url_parser import URLParser
 
 
-async def main():
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Scrape product cards of several categories at once, each to its own file."
+    )
+    parser.add_argument(
+        "-c",
+        "--categories",
+        nargs="+",
+        choices=CATEGORIES,
+        default=list(CATEGORIES),
+        help="categories to scrape (default: all)",
+    )
+    parser.add_argument(
+        "-f",
+        "--output-format",
+        choices=list(SINKS),
+        default="csv",
+        help="output format",
+    )
+    parser.add_argument(
+        "-o", "--output-dir", default=".", help="directory for the output files"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=20,
+        help="maximum number of concurrent requests for all categories",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=20,
+        help="product cards fetched concurrently by each category job",
+    )
+    parser.add_argument(
+        "--max-connections-per-host",
+        type=int,
+        default=10,
+        help="maximum number of concurrent requests to one host",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=None,
+        help="maximum requests per second to one host (default: unlimited)",
+    )
+    parser.add_argument(
+        "--max-response-size",
+        type=int,
+        default=10 * 1024 * 1024,
+        metavar="BYTES",
+        help="responses with a larger body are dropped (default: 10 MiB)",
+    )
+    parser.add_argument(
+        "--parser-backend",
+        choices=ParsingExecutor.KINDS,
+        default="process",
+        help="pool used to parse HTML",
+    )
+    parser.add_argument(
+        "--cache", metavar="PATH", help="persistent HTTP cache (SQLite file)"
+    )
+    parser.add_argument(
+        "--url-index", metavar="PATH", help="persistent URL index (SQLite file)"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue interrupted CSV jobs from their last checkpoints",
+    )
+    parser.add_argument(
+        "--metrics-json",
+        metavar="PATH",
+        help="where to write the metrics summary (default: OUTPUT_DIR/metrics.json)",
+    )
+    return parser
+
+
+async def main(args: argparse.Namespace) -> int:
     start_time = time.perf_counter()
-    data_parser = DataParser()
-    url_parser = URLParser()
+    os.makedirs(args.output_dir, exist_ok=True)
 
-    urls = await url_parser.get_url_for_each_product_card(specific="mouse")
-    print(await data_parser.write_csv(urls, table_filename="mouse_data_table"))
+    # Модули баз SQLite импортируются, только если базы указаны.
+    url_index = None
+    if args.url_index:
+        from parsers.url_index import URLIndex
 
-    print(f"Elapsed time: {time.perf_counter() - start_time}")
+        url_index = URLIndex(args.url_index)
 
+    cache = None
+    if args.cache:
+        from parsers.cache import ResponseCache
+
+        cache = ResponseCache(args.cache)
 
-if __name__ == "__main__":
     try:
-        asyncio.run(main())
-        main().close()
+        async with ParserSession(
+            workers=args.workers,
+            max_connections_per_host=args.max_connections_per_host,
+            rate_limit=args.rate_limit,
+            max_response_size=args.max_response_size,
+            executor=ParsingExecutor(args.parser_backend),
+            cache=cache,
+        ) as session:
+            results = await run_jobs(
+                session,
+                category_jobs(args.categories, args.output_dir, args.output_format),
+                URLParser(session, url_index=url_index),
+                concurrency=args.concurrency,
+                resume=args.resume,
+            )
+            session.metrics.write_json(
+                args.metrics_json or os.path.join(args.output_dir, "metrics.json")
+            )
+    finally:
+        if url_index is not None:
+            url_index.close()
 
-    except Exception as e:
-        print(e)
-        main().close()
+    for result in results:
+        print(result)
+    print(f"Elapsed time: {time.perf_counter() - start_time}")
+    return 1 if any(result.error for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(build_arg_parser().parse_args())))
@@ -1,41 +1,140 @@
+import asyncio
 from abc import ABC
 from abc import abstractmethod
+from types import TracebackType
 from typing import Any
+from typing import Callable
+from typing import Optional
+from typing import Type
+from typing import TYPE_CHECKING
 
-from httpx import AsyncClient
-from httpx import ConnectTimeout
-from httpx import ReadTimeout
-from httpx import Response
+from parsers.resilience import FetchError
+from parsers.scheduler import Priority
+from parsers.session import ParserSession
+
+if TYPE_CHECKING:
+    from httpx import Response
+
+CATEGORIES = ("watch", "mobile", "mouse", "hdd", "headphones")
 
 
 class Parser(ABC):
     @abstractmethod
-    def __init__(self) -> None:
+    def __init__(self, session: Optional[ParserSession] = None) -> None:
         self.__starting_url: str = ""
         self.__base_shop_url: str = ""
+        self.__owns_session = session is None
+        self.__session = session if session is not None else ParserSession()
 
     @property
     def available_categories(self) -> list[str]:
-        return [
-            "watch",
-            "mobile",
-            "mouse",
-            "hdd",
-            "headphones",
-        ]
+        return list(CATEGORIES)
+
+    @property
+    def session(self) -> ParserSession:
+        return self.__session
 
-    @staticmethod
-    async def get_response(target_url: str) -> Any:
+    async def get_response(
+        self, target_url: str, priority: int = Priority.PRODUCT
+    ) -> str:
         """
         Метод для отправки HTTP запроса на стартовый URL адрес.
+        Запрос выполняется через планировщик и общий пул соединений сессии парсера.
+        :param target_url: URL адрес запроса.
+        :param priority: Приоритет запроса (категории, страницы с товарами, карточки товаров).
         :return: Текстовое содержание HTML разметки.
+        :raises FetchError: Если страницу не удалось загрузить после всех попыток.
+        """
+
+        response: "Response" = await self.session.get(target_url, priority)
+        response.encoding = "utf8"
+        return response.text
+
+    async def get_content(
+        self, target_url: str, priority: int = Priority.PRODUCT
+    ) -> bytes:
+        """
+        Метод для получения HTML разметки в виде байтов без декодирования.
+        Байты передаются в воркеры исполнителя разбора HTML разметки.
+        :param target_url: URL адрес запроса.
+        :param priority: Приоритет запроса (категории, страницы с товарами, карточки товаров).
+        :return: Содержимое ответа в виде байтов.
+        :raises FetchError: Если страницу не удалось загрузить после всех попыток.
+        """
+
+        response: "Response" = await self.session.get(target_url, priority)
+        return response.content
+
+    async def get_contents(
+        self, target_urls: list[str], priority: int = Priority.PRODUCT
+    ) -> list[tuple[str, bytes]]:
+        """
+        Метод для конкурентной загрузки нескольких страниц.
+        Страницы, которые не удалось загрузить, пропускаются (они сохраняются в session.dead_letters).
+        :param target_urls: Список URL адресов.
+        :param priority: Приоритет запросов.
+        :return: Пары (URL адрес, содержимое) в порядке target_urls.
+        """
+
+        contents = await asyncio.gather(
+            *[self.get_content(url, priority) for url in target_urls],
+            return_exceptions=True,
+        )
+
+        pages: list[tuple[str, bytes]] = []
+        for url, content in zip(target_urls, contents):
+            if isinstance(content, FetchError):
+                continue
+            if isinstance(content, BaseException):
+                raise content
+            pages.append((url, content))
+        return pages
+
+    async def parse(self, func: Callable[[Any], Any], page_html: Any) -> Any:
+        """
+        Метод для разбора HTML разметки в исполнителе сессии, вне event loop.
+        :param func: Функция разбора из модуля parsers.extractors.
+        :param page_html: HTML разметка страницы.
+        :return: Результат разбора.
+        """
+
+        with self.session.metrics.timer(
+            "parse_duration_seconds", "parses_in_flight", func=func.__name__
+        ):
+            return await self.session.executor.submit(func, page_html)
+
+    async def parse_many(
+        self, func: Callable[[Any], Any], pages_html: list[Any]
+    ) -> list[Any]:
         """
+        Метод для разбора нескольких страниц в исполнителе сессии одним вызовом.
+        :param func: Функция разбора из модуля parsers.extractors.
+        :param pages_html: Список HTML разметок страниц.
+        :return: Результаты разбора в порядке pages_html.
+        """
+
+        with self.session.metrics.timer(
+            "parse_batch_duration_seconds", "parses_in_flight", func=func.__name__
+        ):
+            return await self.session.executor.map(func, pages_html)
+
+    async def close(self) -> None:
+        """
+        Метод для закрытия сессии, если она была создана самим парсером.
+        Переданная извне сессия закрывается ее владельцем.
+        :return: None.
+        """
+
+        if self.__owns_session:
+            await self.session.aclose()
 
-        async with AsyncClient() as client:
-            try:
-                response: Response = await client.get(target_url, timeout=4)
-                response.encoding = "utf8"
-                return response.text
+    async def __aenter__(self) -> "Parser":
+        return self
 
-            except (ConnectTimeout, ReadTimeout) as error:
-                return error
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        await self.close()
@@ -0,0 +1,174 @@
+from re import compile
+from typing import Any
+from typing import Iterable
+from typing import Optional
+
+from parsers.metrics import Histogram
+from parsers.models import Product
+
+
+# Границы корзин распределения скидок в процентах от старой цены.
+DISCOUNT_BUCKETS = (0.0, 5.0, 10.0, 20.0, 30.0, 40.0, 50.0, 75.0, 100.0)
+
+_CATEGORY = compile(r"/html/(\w+)/")
+
+
+def product_category(url: str) -> str:
+    """
+    :param url: URL адрес карточки товара, например, https://parsinger.ru/html/mouse/3/3_1.html.
+    :return: Категория товара из URL адреса или пустая строка.
+    """
+
+    category = _CATEGORY.search(url)
+    return category.group(1) if category else ""
+
+
+class RunningStats:
+    """
+    Потоковая сводка по числовому значению: количество, сумма, минимум, максимум и среднее.
+    Хранит только четыре числа, сводки разных частей каталога объединяются методом merge.
+    """
+
+    __slots__ = ("count", "total", "min", "max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    def add(self, value: int) -> None:
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: "RunningStats") -> None:
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "min": self.min,
+            "max": self.max,
+            "mean": round(self.mean, 2) if self.mean is not None else None,
+        }
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(count={self.count}, sum={self.total})"
+
+
+class CatalogStats:
+    """
+    Потоковые показатели каталога, которые обновляются по мере разбора карточек товаров:
+    - количество товаров и товаров не в наличии;
+    - общая стоимость товаров в наличии (цена, умноженная на остаток), в том числе по категориям;
+    - минимальная, максимальная и средняя цена;
+    - распределение скидок (старая цена относительно текущей).
+    Память не зависит от количества товаров. Показатели, собранные по частям каталога
+    или разными воркерами, объединяются методом merge.
+    """
+
+    def __init__(self) -> None:
+        self.out_of_stock = 0
+        self.value = RunningStats()
+        self.price = RunningStats()
+        self.discount = Histogram(DISCOUNT_BUCKETS)
+        self.categories: dict[str, RunningStats] = {}
+
+    def add(self, product: Product) -> None:
+        """
+        Метод для учета одной карточки товара.
+        :param product: Данные карточки товара.
+        :return: None.
+        """
+
+        stock = product.stock or 0
+        price = product.price or 0
+        value = stock * price
+
+        self.value.add(value)
+        category = product_category(product.url)
+        self.categories.setdefault(category, RunningStats()).add(value)
+
+        if not stock:
+            self.out_of_stock += 1
+        if product.price is not None:
+            self.price.add(product.price)
+        if product.old_price and product.price is not None:
+            discount = max(product.old_price - product.price, 0) / product.old_price
+            self.discount.observe(round(discount * 100, 2))
+
+    def merge(self, other: "CatalogStats") -> "CatalogStats":
+        """
+        :param other: Показатели другой части каталога.
+        :return: Текущий объект, дополненный показателями other.
+        """
+
+        self.out_of_stock += other.out_of_stock
+        self.value.merge(other.value)
+        self.price.merge(other.price)
+        self.discount.merge(other.discount)
+        for category, stats in other.categories.items():
+            self.categories.setdefault(category, RunningStats()).merge(stats)
+        return self
+
+    @classmethod
+    def combine(cls, parts: Iterable["CatalogStats"]) -> "CatalogStats":
+        """
+        :param parts: Показатели частей каталога.
+        :return: Новый объект с показателями всего каталога.
+        """
+
+        result = cls()
+        for part in parts:
+            result.merge(part)
+        return result
+
+    @property
+    def products(self) -> int:
+        return self.value.count
+
+    @property
+    def total_value(self) -> int:
+        return self.value.total
+
+    def summary(self) -> dict[str, Any]:
+        """
+        :return: Показатели в виде словаря, например, для записи в JSON.
+        """
+
+        buckets = [*map(str, DISCOUNT_BUCKETS), "+Inf"]
+        return {
+            "products": self.products,
+            "out_of_stock": self.out_of_stock,
+            "total_value": self.total_value,
+            "price": self.price.summary(),
+            "discount": {
+                **self.discount.summary(),
+                "buckets": dict(zip(buckets, self.discount.counts)),
+            },
+            "categories": {
+                category: stats.summary()
+                for category, stats in sorted(self.categories.items())
+            },
+        }
+
+    def __str__(self):
+        return (
+            f"Products: {self.products}, out of stock: {self.out_of_stock}, "
+            f"total value: {self.total_value} rub."
+        )
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(products={self.products})"
@@ -0,0 +1,233 @@
+import sqlite3
+import time
+from typing import NamedTuple
+from typing import Optional
+
+from httpx import Request
+from httpx import Response
+
+# Количество обращений к записям, после которого их время сохраняется в базе.
+_ACCESS_BATCH_SIZE = 100
+
+
+class CachedResponse(NamedTuple):
+    """
+    Ответ, сохраненный в кэше.
+    """
+
+    url: str
+    content: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+    def to_response(self) -> Response:
+        """
+        :return: Объект ответа httpx, собранный из данных кэша.
+        """
+
+        headers = {}
+        if self.etag:
+            headers["ETag"] = self.etag
+        if self.last_modified:
+            headers["Last-Modified"] = self.last_modified
+
+        return Response(
+            200,
+            content=self.content,
+            headers=headers,
+            request=Request("GET", self.url),
+        )
+
+
+class ResponseCache:
+    """
+    Постоянный кэш HTTP ответов в базе SQLite, ключом является URL адрес.
+    Свежие записи (моложе ttl) отдаются без запроса к серверу, устаревшие проверяются
+    условным запросом (If-None-Match / If-Modified-Since). При превышении max_size
+    удаляются записи, к которым дольше всего не обращались (LRU). Суммарный размер содержимого
+    хранится в памяти, а время обращения к записям сохраняется пачками, поэтому чтение из кэша
+    не выполняет запись в базу.
+    В автономном режиме (offline) сеть не используется, отдается любая сохраненная запись.
+    """
+
+    def __init__(
+        self,
+        path: str = "http_cache.sqlite3",
+        ttl: Optional[float] = 3600,
+        max_size: Optional[int] = None,
+        offline: bool = False,
+    ) -> None:
+        """
+        :param path: Путь к файлу базы данных.
+        :param ttl: Время в секундах, в течение которого запись считается свежей, None - всегда свежая.
+        :param max_size: Максимальный суммарный размер содержимого в байтах, None - без ограничений.
+        :param offline: Автономный режим, ответы берутся только из кэша.
+        """
+
+        self.__ttl = ttl
+        self.__max_size = max_size
+        self.__offline = offline
+        self.__connection = sqlite3.connect(path)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute("PRAGMA synchronous=NORMAL")
+        self.__connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                content BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+            """
+        )
+        self.__connection.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)"
+        )
+        self.__connection.commit()
+        (self.__total_size,) = self.__connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        # Время последнего обращения к записям, еще не сохраненное в базе.
+        self.__accessed: dict[str, float] = {}
+        self.evict()
+
+    @property
+    def offline(self) -> bool:
+        return self.__offline
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """
+        :param url: URL адрес.
+        :return: Сохраненный ответ или None, если записи нет.
+        """
+
+        row = self.__connection.execute(
+            "SELECT url, content, etag, last_modified, fetched_at FROM responses WHERE url = ?",
+            (url,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        self.__accessed[url] = time.time()
+        if len(self.__accessed) >= _ACCESS_BATCH_SIZE:
+            self.__save_accessed()
+        return CachedResponse(*row)
+
+    def is_fresh(self, cached: CachedResponse) -> bool:
+        """
+        :param cached: Сохраненный ответ.
+        :return: True, если запись моложе ttl и ее можно отдать без запроса к серверу.
+        """
+
+        return self.__ttl is None or time.time() - cached.fetched_at < self.__ttl
+
+    @staticmethod
+    def revalidation_headers(cached: Optional[CachedResponse]) -> dict[str, str]:
+        """
+        :param cached: Устаревший сохраненный ответ.
+        :return: Заголовки условного запроса.
+        """
+
+        headers: dict[str, str] = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+        return headers
+
+    def store(self, url: str, response: Response) -> None:
+        """
+        Метод для сохранения успешного ответа сервера.
+        :param url: URL адрес.
+        :param response: Ответ сервера.
+        :return: None.
+        """
+
+        now = time.time()
+        content = response.content
+        replaced = self.__connection.execute(
+            "SELECT size FROM responses WHERE url = ?", (url,)
+        ).fetchone()
+        self.__connection.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                url,
+                content,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+                now,
+                now,
+                len(content),
+            ),
+        )
+        self.__connection.commit()
+        self.__accessed.pop(url, None)
+        self.__total_size += len(content) - (replaced[0] if replaced else 0)
+
+        if self.__max_size is not None and self.__total_size > self.__max_size:
+            self.evict()
+
+    def refresh(self, url: str) -> None:
+        """
+        Метод продлевает свежесть записи после ответа 304 Not Modified.
+        :param url: URL адрес.
+        :return: None.
+        """
+
+        now = time.time()
+        self.__connection.execute(
+            "UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE url = ?",
+            (now, now, url),
+        )
+        self.__connection.commit()
+        self.__accessed.pop(url, None)
+
+    def evict(self) -> None:
+        """
+        Метод удаляет записи, к которым дольше всего не обращались,
+        пока суммарный размер кэша превышает max_size.
+        :return: None.
+        """
+
+        if self.__max_size is None or self.__total_size <= self.__max_size:
+            return
+
+        self.__save_accessed()
+        rows = self.__connection.execute(
+            "SELECT url, size FROM responses ORDER BY accessed_at"
+        )
+        evicted: list[tuple[str]] = []
+        for url, size in rows:
+            if self.__total_size <= self.__max_size:
+                break
+            evicted.append((url,))
+            self.__total_size -= size
+
+        self.__connection.executemany("DELETE FROM responses WHERE url = ?", evicted)
+        self.__connection.commit()
+
+    def __save_accessed(self) -> None:
+        """
+        Метод сохраняет накопленное время обращения к записям одной транзакцией.
+        :return: None.
+        """
+
+        if self.__accessed:
+            self.__connection.executemany(
+                "UPDATE responses SET accessed_at = ? WHERE url = ?",
+                [(accessed_at, url) for url, accessed_at in self.__accessed.items()],
+            )
+            self.__connection.commit()
+            self.__accessed = {}
+
+    def close(self) -> None:
+        self.__save_accessed()
+        self.__connection.close()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(offline={self.__offline})"
@@ -0,0 +1,199 @@
+import json
+import os
+import sqlite3
+import time
+from typing import AsyncIterable
+from typing import AsyncIterator
+from typing import NamedTuple
+from typing import Optional
+
+
+class CheckpointState(NamedTuple):
+    """
+    Состояние прерванного обхода на момент последней контрольной точки.
+    """
+
+    offset: int
+    rows: int
+    schema: tuple[str, ...]
+    widened: bool
+    discovered: bool
+    finished: bool
+
+
+class Checkpoint:
+    """
+    Контрольные точки потоковой записи в базе SQLite. Сохраняются найденные URL адреса карточек
+    (граница обхода), URL адреса уже записанных карточек и размер файла после последней записанной строки.
+    При возобновлении файл обрезается до сохраненного размера, поэтому строки, записанные после
+    последней контрольной точки, не дублируются: их карточки загружаются заново.
+    Контрольная точка сохраняется каждые interval строк или каждые period секунд.
+    """
+
+    def __init__(
+        self,
+        path: str = "checkpoint.sqlite3",
+        interval: int = 100,
+        period: float = 30.0,
+    ) -> None:
+        """
+        :param path: Путь к файлу базы данных.
+        :param interval: Количество строк между контрольными точками.
+        :param period: Максимальное время в секундах между контрольными точками.
+        """
+
+        self.interval = max(interval, 1)
+        self.period = period
+        self.__connection = sqlite3.connect(path)
+        self.__connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS urls (
+                url TEXT PRIMARY KEY,
+                position INTEGER NOT NULL,
+                done INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            """
+        )
+        self.__connection.commit()
+        self.__done: list[str] = []
+        self.__saved_at = time.monotonic()
+
+    def begin(self, filename: str, resume: bool = False) -> Optional[CheckpointState]:
+        """
+        Метод для начала записи файла.
+        :param filename: Путь к итоговому файлу.
+        :param resume: Если флаг True, то возвращается состояние прерванной записи того же файла.
+        Если файл удален или короче сохраненного размера, то запись начинается заново.
+        :return: Состояние прерванной записи или None, если запись начинается заново.
+        """
+
+        meta = self.__meta()
+        if (
+            resume
+            and meta.get("filename") == filename
+            and "offset" in meta
+            and os.path.isfile(filename)
+            and os.path.getsize(filename) >= int(meta["offset"])
+        ):
+            return CheckpointState(
+                offset=int(meta["offset"]),
+                rows=int(meta["rows"]),
+                schema=tuple(json.loads(meta["schema"])),
+                widened=meta["widened"] == "1",
+                discovered=meta.get("discovered") == "1",
+                finished=meta.get("finished") == "1",
+            )
+
+        with self.__connection:
+            self.__connection.execute("DELETE FROM urls")
+            self.__connection.execute("DELETE FROM meta")
+            self.__connection.execute(
+                "INSERT INTO meta VALUES ('filename', ?)", (filename,)
+            )
+        self.__done = []
+        return None
+
+    async def track(self, source: AsyncIterable[str]) -> AsyncIterator[str]:
+        """
+        Метод сохраняет найденные URL адреса в границу обхода и пропускает уже записанные карточки.
+        После исчерпания источника граница обхода считается полной.
+        :param source: Асинхронный источник URL адресов карточек товаров.
+        :return: Асинхронный итератор по URL адресам, карточки которых еще не записаны.
+        """
+
+        (position,) = self.__connection.execute("SELECT COUNT(*) FROM urls").fetchone()
+        async for url in source:
+            cursor = self.__connection.execute(
+                "INSERT OR IGNORE INTO urls (url, position) VALUES (?, ?)",
+                (url, position),
+            )
+            position += cursor.rowcount
+            if cursor.rowcount or not self.is_done(url):
+                yield url
+
+        with self.__connection:
+            self.__connection.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('discovered', '1')"
+            )
+
+    async def pending(self) -> AsyncIterator[str]:
+        """
+        :return: URL адреса из границы обхода, карточки которых еще не записаны, в порядке обнаружения.
+        """
+
+        urls = self.__connection.execute(
+            "SELECT url FROM urls WHERE done = 0 ORDER BY position"
+        ).fetchall()
+        for (url,) in urls:
+            yield url
+
+    def is_done(self, url: str) -> bool:
+        row = self.__connection.execute(
+            "SELECT done FROM urls WHERE url = ?", (url,)
+        ).fetchone()
+        return bool(row and row[0])
+
+    def mark_done(self, url: str) -> None:
+        """
+        Метод отмечает карточку как записанную, отметка сохраняется вместе со следующей контрольной точкой.
+        :param url: URL адрес карточки товара.
+        :return: None.
+        """
+
+        self.__done.append(url)
+
+    def due(self) -> bool:
+        """
+        :return: True, если пора сохранить контрольную точку.
+        """
+
+        return (
+            len(self.__done) >= self.interval
+            or time.monotonic() - self.__saved_at >= self.period
+        )
+
+    def save(
+        self, offset: int, rows: int, schema: tuple[str, ...], widened: bool
+    ) -> None:
+        """
+        Метод для сохранения контрольной точки одной транзакцией.
+        :param offset: Размер файла в байтах после последней записанной строки.
+        :param rows: Количество записанных строк.
+        :param schema: Колонки характеристик таблицы.
+        :param widened: Признак того, что колонки характеристик расширялись после записи первых строк.
+        :return: None.
+        """
+
+        with self.__connection:
+            self.__connection.executemany(
+                "UPDATE urls SET done = 1 WHERE url = ?",
+                [(url,) for url in self.__done],
+            )
+            self.__connection.executemany(
+                "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                [
+                    ("offset", str(offset)),
+                    ("rows", str(rows)),
+                    ("schema", json.dumps(schema, ensure_ascii=False)),
+                    ("widened", "1" if widened else "0"),
+                ],
+            )
+        self.__done = []
+        self.__saved_at = time.monotonic()
+
+    def finish(self) -> None:
+        with self.__connection:
+            self.__connection.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('finished', '1')"
+            )
+
+    def __meta(self) -> dict[str, str]:
+        return dict(self.__connection.execute("SELECT key, value FROM meta").fetchall())
+
+    def close(self) -> None:
+        self.__connection.commit()
+        self.__connection.close()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}()"
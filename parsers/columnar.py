@@ -0,0 +1,218 @@
+from importlib import import_module
+from typing import Any
+from typing import Iterable
+
+from parsers.aggregates import product_category
+from parsers.extractors import ListingItem
+from parsers.models import Product
+from parsers.sinks import CSV_COLUMNS
+
+
+FRAME_BACKENDS = ("numpy", "pandas", "polars")
+
+NUMERIC_COLUMNS = ("stock", "price", "old_price")
+
+_NUMBER = r"(\d+)"
+_CATEGORY = r"/html/(\w+)/"
+
+
+def _import(backend: str) -> Any:
+    """
+    :param backend: Название библиотеки: "numpy", "pandas" или "polars".
+    :return: Модуль библиотеки.
+    """
+
+    if backend not in FRAME_BACKENDS:
+        raise ValueError(
+            'The specified backend "%s" is not one of %s.'
+            % (backend, ", ".join(FRAME_BACKENDS))
+        )
+
+    try:
+        return import_module(backend)
+    except ImportError as error:
+        extra = "polars" if backend == "polars" else "frame"
+        raise ImportError(
+            f"Columnar output requires {backend}, install it with: poetry install -E {extra}"
+        ) from error
+
+
+def clean_numeric(values: Any, backend: str = "pandas") -> Any:
+    """
+    Функция для векторного получения чисел из текстовой колонки со значениями вида "1234 руб"
+    или "В наличии: 5": регулярное выражение применяется ко всей колонке сразу, без цикла по строкам.
+    :param values: Колонка pandas.Series или polars.Series, либо список строк.
+    :param backend: Библиотека, в которой выполняется обработка: "pandas" или "polars".
+    :return: Колонка целых чисел, пустые значения для строк без числа.
+    """
+
+    if backend == "polars":
+        polars = _import("polars")
+        return (
+            polars.Series(values, dtype=polars.Utf8)
+            .str.extract(_NUMBER, 1)
+            .cast(polars.Int64)
+        )
+
+    pandas = _import("pandas")
+    return (
+        pandas.Series(values, dtype="string")
+        .str.extract(_NUMBER, expand=False)
+        .astype("Int64")
+    )
+
+
+class ProductColumns:
+    """
+    Колоночное представление карточек товаров: каждое поле хранится отдельным списком,
+    категория определяется по URL адресу карточки.
+    Преобразуется в словарь массивов NumPy, pandas.DataFrame или polars.DataFrame
+    с целочисленными колонками stock, price и old_price и категориальной колонкой category.
+    """
+
+    COLUMNS = ("title", "article", "category", *NUMERIC_COLUMNS, "url")
+
+    def __init__(self, products: Iterable[Product] = ()) -> None:
+        self.columns: dict[str, list[Any]] = {name: [] for name in self.COLUMNS}
+        self.extend(products)
+
+    def append(self, product: Product) -> None:
+        columns = self.columns
+        columns["title"].append(product.title)
+        columns["article"].append(product.article)
+        columns["category"].append(product_category(product.url))
+        columns["stock"].append(product.stock)
+        columns["price"].append(product.price)
+        columns["old_price"].append(product.old_price)
+        columns["url"].append(product.url)
+
+    def extend(self, products: Iterable[Product]) -> None:
+        for product in products:
+            self.append(product)
+
+    def to_numpy(self) -> dict[str, Any]:
+        """
+        :return: Словарь массивов NumPy. Числовые колонки - маскированные массивы int64,
+        пустые значения скрыты маской.
+        """
+
+        numpy = _import("numpy")
+        arrays: dict[str, Any] = {
+            name: numpy.array(self.columns[name], dtype=object)
+            for name in ("title", "article", "url")
+        }
+        arrays["category"] = numpy.array(self.columns["category"], dtype=str)
+        for name in NUMERIC_COLUMNS:
+            values = self.columns[name]
+            mask = numpy.fromiter(
+                (value is None for value in values), dtype=bool, count=len(values)
+            )
+            data = numpy.fromiter(
+                (value or 0 for value in values), dtype=numpy.int64, count=len(values)
+            )
+            arrays[name] = numpy.ma.masked_array(data, mask=mask)
+        return arrays
+
+    def to_pandas(self) -> Any:
+        """
+        :return: pandas.DataFrame, числовые колонки имеют тип Int64, категория - category.
+        """
+
+        pandas = _import("pandas")
+        frame = pandas.DataFrame(
+            {
+                name: pandas.array(
+                    self.columns[name],
+                    dtype="Int64" if name in NUMERIC_COLUMNS else "string",
+                )
+                for name in self.COLUMNS
+            }
+        )
+        frame["category"] = frame["category"].astype("category")
+        return frame
+
+    def to_polars(self) -> Any:
+        """
+        :return: polars.DataFrame, числовые колонки имеют тип Int64, категория - Categorical.
+        """
+
+        polars = _import("polars")
+        return polars.DataFrame(
+            self.columns,
+            schema={
+                name: polars.Int64 if name in NUMERIC_COLUMNS else polars.Utf8
+                for name in self.COLUMNS
+            },
+        ).with_columns(polars.col("category").cast(polars.Categorical))
+
+    def to_frame(self, backend: str = "pandas") -> Any:
+        """
+        :param backend: "numpy", "pandas" или "polars".
+        :return: Колоночное представление карточек товаров в указанной библиотеке.
+        """
+
+        _import(backend)
+        return getattr(self, f"to_{backend}")()
+
+    def __len__(self) -> int:
+        return len(self.columns["url"])
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(rows={len(self)})"
+
+
+def listing_frame(items: Iterable[ListingItem], backend: str = "pandas") -> Any:
+    """
+    Функция для получения таблицы товаров со страниц с карточками товаров.
+    Цены вида "1234 руб" преобразуются в числа векторно, функцией clean_numeric.
+    :param items: Товары со страниц с карточками товаров.
+    :param backend: "pandas" или "polars".
+    :return: DataFrame с колонками title и price.
+    """
+
+    items = list(items)
+    module = _import(backend)
+    return module.DataFrame(
+        {
+            "title": [item.title for item in items],
+            "price": clean_numeric([item.price for item in items], backend),
+        }
+    )
+
+
+def read_csv_frame(filename: str, backend: str = "pandas", delimiter: str = ";") -> Any:
+    """
+    Функция для загрузки таблицы, записанной DataParser.write_csv с заголовками.
+    Колонки наличия и цен очищаются векторно, категория определяется по URL адресу карточки.
+    :param filename: Путь к CSV файлу.
+    :param backend: "pandas" или "polars".
+    :param delimiter: Разделитель колонок.
+    :return: DataFrame с колонками title, article, характеристиками товара, stock, price, old_price, url и category.
+    """
+
+    if backend == "polars":
+        polars = _import("polars")
+        frame = polars.read_csv(
+            filename, separator=delimiter, infer_schema_length=0, encoding="utf8-lossy"
+        ).rename(lambda name: CSV_COLUMNS.get(name.lstrip("\ufeff"), name))
+        return frame.with_columns(
+            *(
+                polars.col(name).str.extract(_NUMBER, 1).cast(polars.Int64)
+                for name in NUMERIC_COLUMNS
+            ),
+            polars.col("url")
+            .str.extract(_CATEGORY, 1)
+            .cast(polars.Categorical)
+            .alias("category"),
+        )
+
+    pandas = _import("pandas")
+    frame = pandas.read_csv(
+        filename, sep=delimiter, encoding="utf-8-sig", dtype="string"
+    ).rename(columns=CSV_COLUMNS)
+    for name in NUMERIC_COLUMNS:
+        frame[name] = clean_numeric(frame[name], backend)
+    frame["category"] = (
+        frame["url"].str.extract(_CATEGORY, expand=False).astype("category")
+    )
+    return frame
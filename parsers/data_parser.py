@@ -1,15 +1,36 @@
-import asyncio
 import csv
-import itertools
+import os
 from re import compile
 from re import Pattern
-
-import httpx
-import requests
-from bs4 import BeautifulSoup
-from httpx import Response
+from typing import Any
+from typing import AsyncIterable
+from typing import Optional
+from typing import TYPE_CHECKING
+from typing import Union
 
 from parsers.abc_class import Parser
+from parsers.extractors import extract_listing_items
+from parsers.extractors import extract_product_card
+from parsers.extractors import ListingItem
+from parsers.models import intern_schema
+from parsers.models import Product
+from parsers.models import union_schema
+from parsers.pipeline import iterate
+from parsers.pipeline import stream_map
+from parsers.resilience import FetchError
+from parsers.scheduler import Priority
+from parsers.session import ParserSession
+from parsers.sinks import card_headers
+from parsers.sinks import Sink
+from parsers.sinks import widen_csv
+
+if TYPE_CHECKING:
+    # Модули загружаются только методами, которые их используют.
+    from parsers.aggregates import CatalogStats
+    from parsers.checkpoint import Checkpoint
+    from parsers.snapshots import SnapshotStore
+    from parsers.state import CrawlDelta
+    from parsers.state import CrawlState
 
 
 class DataParser(Parser):
@@ -17,249 +38,537 @@ class DataParser(Parser):
     Класс для работы с данными, полученными в ходе анализа HTML страниц товаров.
     """
 
-    def __init__(self):
-        pass
+    def __init__(self, session: Optional[ParserSession] = None):
+        super().__init__(session)
 
-    async def get_total_product_price(self, products_url: list[str]) -> str:
+    async def get_total_product_price(
+        self, products_url: Union[list[str], AsyncIterable[str]]
+    ) -> str:
         """
         Метод для получения суммы общей стоимости товаров, размещенной на площадке.
-        :param products_url: Список URL адресов на все товары.
+        Стоимость суммируется по мере разбора карточек, см. метод aggregate.
+        :param products_url: Список URL адресов на все товары или асинхронный источник URL адресов.
         :return: Информация об общей стоимости товаров.
         """
 
-        async def fetch_total_price_for_each_product(product_url: str) -> int:
-            """
-            Вложенная функция для обхода всех URL адресов, сбора информации о количестве товаров и их стоимости.
-            :param product_url: URL адрес товара.
-            :return: После получения информации о количестве и стоимости товаров,
-            функция возвращает итоговую стоимость всех товаров.
-            """
+        with self.session.metrics.stage("get_total_product_price"):
+            stats = await self.aggregate(products_url)
+            return f"Total price of items placed in the marketplace is: {stats.total_value} rub."
 
-            each_item_html_page = await self.get_response(product_url)
-            soup = BeautifulSoup(each_item_html_page, "lxml")
-            item_quantity_tag = soup.find("span", id="in_stock")
-            item_price_tag = soup.find("span", id="price")
+    async def aggregate(
+        self,
+        products_url: Union[list[str], AsyncIterable[str]],
+        stats: Optional["CatalogStats"] = None,
+        concurrency: int = 20,
+        queue_size: int = 100,
+    ) -> "CatalogStats":
+        """
+        Метод для потокового подсчета показателей каталога за один обход: общая стоимость,
+        стоимость по категориям, количество товаров и товаров не в наличии, статистика цен и скидок.
+        Карточки учитываются сразу после разбора и в памяти не накапливаются.
+        Незагруженные карточки сохраняются в session.dead_letters и не искажают показатели.
+        :param products_url: Список URL адресов карточек товаров или асинхронный источник URL адресов,
+        например, URLParser.iter_url_for_each_product_card.
+        :param stats: Показатели, которые необходимо дополнить, например, собранные предыдущей частью каталога.
+        :param concurrency: Количество одновременно загружаемых карточек.
+        :param queue_size: Размер очереди разобранных карточек.
+        :return: Показатели каталога.
+        """
 
-            item_quantity: list[int] = [
-                int(quantity.text.split(": ")[1]) for quantity in item_quantity_tag
-            ]
-            item_price: list[int] = [
-                int(price.text.split(" ")[0]) for price in item_price_tag
-            ]
+        from parsers.aggregates import CatalogStats
 
-            return sum([x * y for x, y in zip(item_quantity, item_price)])
+        with self.session.metrics.stage("aggregate"):
+            stats = stats if stats is not None else CatalogStats()
+            source = (
+                iterate(products_url)
+                if isinstance(products_url, list)
+                else products_url
+            )
 
-        tasks = [
-            fetch_total_price_for_each_product(current_url)
-            for current_url in products_url
-        ]
-        total_price = sum(await asyncio.gather(*tasks))
+            async for product in stream_map(
+                source,
+                self.__fetch_product_card,
+                concurrency=concurrency,
+                queue_size=queue_size,
+                metrics=self.session.metrics,
+                name="fetch_product_card",
+            ):
+                if product is not None:
+                    stats.add(product)
+            return stats
+
+    async def collect_frame(
+        self,
+        products_url: Union[list[str], AsyncIterable[str]],
+        backend: str = "pandas",
+        concurrency: int = 20,
+        queue_size: int = 100,
+    ) -> Any:
+        """
+        Метод для получения карточек товаров в колоночном виде для последующей аналитики.
+        Карточки складываются в колонки по мере разбора, цены и остаток уже являются числами,
+        поэтому повторная загрузка CSV и очистка значений не требуются.
+        Для записи необходимы numpy и pandas (poetry install -E frame) или polars (poetry install -E polars).
+        :param products_url: Список URL адресов карточек товаров или асинхронный источник URL адресов.
+        :param backend: "numpy" - словарь массивов, "pandas" или "polars" - DataFrame.
+        :param concurrency: Количество одновременно загружаемых карточек.
+        :param queue_size: Размер очереди разобранных карточек.
+        :return: Колонки title, article, category, stock, price, old_price и url.
+        """
 
-        return f"Total price of items placed in the marketplace is: {total_price} rub."
+        from parsers.columnar import ProductColumns
+
+        with self.session.metrics.stage("collect_frame"):
+            columns = ProductColumns()
+            source = (
+                iterate(products_url)
+                if isinstance(products_url, list)
+                else products_url
+            )
+
+            async for product in stream_map(
+                source,
+                self.__fetch_product_card,
+                concurrency=concurrency,
+                queue_size=queue_size,
+                metrics=self.session.metrics,
+                name="fetch_product_card",
+            ):
+                if product is not None:
+                    columns.append(product)
+            return columns.to_frame(backend)
+
+    async def write_change_feed(
+        self,
+        products_url: Union[list[str], AsyncIterable[str]],
+        store: "SnapshotStore",
+        events_filename: str = "changes",
+        label: str = "",
+        keep: int = 2,
+        concurrency: int = 20,
+        queue_size: int = 100,
+    ) -> int:
+        """
+        Метод для получения ленты изменений цен и остатков. Карточки товаров сохраняются
+        в новый снимок каталога, который сравнивается с предыдущим снимком с тем же label.
+        В файл JSON Lines записываются только изменения: цены, старой цены и остатка,
+        новые и удаленные товары. Товары, карточки которых не удалось загрузить,
+        переносятся из предыдущего снимка и не считаются удаленными.
+        :param products_url: Список URL адресов карточек товаров или асинхронный источник URL адресов.
+        :param store: Хранилище снимков каталога.
+        :param events_filename: Название файла с событиями без расширения.
+        :param label: Описание снимка, например, категория. Сравниваются снимки с одинаковым label.
+        :param keep: Количество хранимых снимков.
+        :param concurrency: Количество одновременно загружаемых карточек.
+        :param queue_size: Размер очереди разобранных карточек.
+        :return: Количество записанных событий. При первом запуске все товары записываются как added.
+        """
+
+        from parsers.snapshots import write_events
+
+        with self.session.metrics.stage("write_change_feed"):
+            previous = store.snapshots(label)
+            snapshot_id = store.create(label)
+            source = (
+                iterate(products_url)
+                if isinstance(products_url, list)
+                else products_url
+            )
+
+            failed_urls: list[str] = []
+
+            async def fetch_product_card(product_url: str) -> Optional[Product]:
+                product = await self.__fetch_product_card(product_url)
+                if product is None:
+                    failed_urls.append(product_url)
+                return product
+
+            batch: list[Product] = []
+            async for product in stream_map(
+                source,
+                fetch_product_card,
+                concurrency=concurrency,
+                queue_size=queue_size,
+                metrics=self.session.metrics,
+                name="fetch_product_card",
+            ):
+                if product is not None:
+                    batch.append(product)
+                if len(batch) >= queue_size:
+                    store.add(snapshot_id, batch)
+                    batch = []
+            store.add(snapshot_id, batch)
+
+            previous_id = previous[-1] if previous else 0
+            store.carry_over(previous_id, snapshot_id, failed_urls)
+            events_count = write_events(
+                store.diff(previous_id, snapshot_id), events_filename
+            )
+            # Прерванный обход оставляет незавершенный снимок, который не используется для сравнения.
+            store.complete(snapshot_id)
+            store.prune(label, keep)
+            return events_count
 
     async def write_csv(
         self,
         products_url: list[str],
         table_filename: str = "result_table",
         write_headers: bool = True,
+        checkpoint: Optional["Checkpoint"] = None,
+        resume: bool = False,
     ) -> None:
         """
         Метод для записи данных в формат csv.
         :param table_filename: Название итогового файла.
         :param products_url: Список URL адресов на страницу товара.
         :param write_headers: Если флаг True, то в csv файле будут записаны заголовки таблицы.
+        :param checkpoint: Контрольные точки записи карточек товаров. Если указаны, то карточки
+        записываются потоково (см. stream_csv) и строки следуют в порядке загрузки карточек.
+        :param resume: Если флаг True, то запись продолжается с последней контрольной точки.
         :return: None.
         """
 
-        if await self.__is_product_card_url(products_url, self.available_categories):
+        with self.session.metrics.stage("write_csv"):
+            if await self.__is_product_card_url(
+                products_url, self.available_categories
+            ):
+                if checkpoint is not None:
+                    await self.stream_csv(
+                        iterate(products_url),
+                        table_filename,
+                        write_headers,
+                        checkpoint=checkpoint,
+                        resume=resume,
+                    )
+                    return
+
+                # Получаем данные для записи в CSV.
+                products = await self.__get_data_from_item_card(products_url)
+
+                # Колонки характеристик - объединение характеристик всех полученных карточек.
+                schema = union_schema(product.schema for product in products)
+
+                if write_headers:
+
+                    # Создаем CSV файл и записываем заголовки
+                    await self.__write_headers(
+                        card_headers(schema),
+                        filename=table_filename,
+                    )
+
+                    # получаем данные и дополняем созданный CSV файл.
+                    await self.__card_data_writer(
+                        products, schema, filename=table_filename, mode="a"
+                    )
+
+                else:
+                    await self.__card_data_writer(
+                        products, schema, filename=table_filename
+                    )
 
-            # Получаем данные для записи в CSV.
-            (
-                title_list,
-                article_list,
-                description_list,
-                stock_list,
-                current_price_list,
-                old_price_list,
-                items_url,
-            ) = await self.__get_data_from_item_card(products_url)
+            else:
+                items = await self.__get_data_from_page(products_url)
+                await self.__page_data_writer(items, filename=table_filename)
 
-            if write_headers:
+    async def write_csv_incremental(
+        self,
+        products_url: list[str],
+        state: "CrawlState",
+        table_filename: str = "result_table",
+        write_headers: bool = True,
+    ) -> "CrawlDelta":
+        """
+        Метод для инкрементального обновления каталога товаров.
+        Карточки загружаются через ResponseCache сессии: свежие записи кэша не загружаются,
+        устаревшие проверяются условными запросами (304 Not Modified без тела ответа).
+        Карточки, содержимое которых совпадает с сохраненным в state, повторно не разбираются.
+        Новые и измененные товары сохраняются в state, отсутствующие в products_url удаляются.
+        В таблицу записываются только добавленные и измененные в этом запуске товары,
+        полный каталог хранится в state (CrawlState.products).
+        :param products_url: Список URL адресов на страницу товара.
+        :param state: Хранилище состояния каталога.
+        :param table_filename: Название файла с добавленными и измененными товарами.
+        :param write_headers: Если флаг True, то в csv файле будут записаны заголовки таблицы.
+        :return: Отчет о добавленных, измененных и удаленных товарах.
+        :raises ValueError: Если для сессии не задан кэш ответов.
+        """
+
+        from parsers.state import CrawlDelta
+
+        if self.session.cache is None:
+            raise ValueError("The response cache is not set for %r." % self.session)
+
+        with self.session.metrics.stage("write_csv_incremental"):
+            state.begin_run()
+            pages_html = dict(await self.get_contents(products_url, Priority.PRODUCT))
+
+            # Разбираются только новые и изменившиеся карточки.
+            # Товары, карточки которых не удалось загрузить, остаются в state без изменений.
+            modified_pages = []
+            for position, page in enumerate(products_url):
+                if page not in pages_html:
+                    state.keep(page, position)
+                    continue
+
+                page_html = pages_html[page]
+                content_hash = state.hash_content(page_html)
+                if not state.is_unchanged(page, content_hash, position):
+                    modified_pages.append((position, page, page_html, content_hash))
+
+            products = await self.parse_many(
+                extract_product_card,
+                [page_html for _, _, page_html, _ in modified_pages],
+            )
 
-                # Создаем CSV файл и записываем заголовки
+            added: list[str] = []
+            changed: list[str] = []
+            modified_products: list[Product] = []
+            for (position, page, _, content_hash), product in zip(
+                modified_pages, products
+            ):
+                product.url = page
+                status = state.upsert(product, content_hash, position)
+                if status == "added":
+                    added.append(product.article)
+                elif status == "changed":
+                    changed.append(product.article)
+                else:
+                    continue
+                modified_products.append(product)
+
+            removed = state.remove_unseen()
+            schema = union_schema(product.schema for product in modified_products)
+
+            if write_headers:
                 await self.__write_headers(
-                    await self.__generate_card_headers(products_url),
+                    card_headers(schema),
                     filename=table_filename,
                 )
-
-                # получаем данные и дополняем созданный CSV файл.
                 await self.__card_data_writer(
-                    title_list,
-                    article_list,
-                    description_list,
-                    stock_list,
-                    current_price_list,
-                    old_price_list,
-                    items_url,
-                    filename=table_filename,
-                    mode="a",
+                    modified_products, schema, filename=table_filename, mode="a"
                 )
-
             else:
                 await self.__card_data_writer(
-                    title_list,
-                    article_list,
-                    description_list,
-                    stock_list,
-                    current_price_list,
-                    old_price_list,
-                    items_url,
-                    filename=table_filename,
+                    modified_products, schema, filename=table_filename
                 )
 
-        else:
-            (
-                title_list,
-                description_list,
-                price_list,
-            ) = await self.__get_data_from_page(products_url)
-
-            await self.__page_data_writer(
-                title_list, description_list, price_list, filename=table_filename
+            return CrawlDelta(
+                added=added,
+                changed=changed,
+                removed=removed,
+                unchanged=len(pages_html) - len(modified_pages),
             )
 
-    async def __get_data_from_item_card(
-        self, products_url: list[str]
-    ) -> tuple[
-        list[str],
-        list[str],
-        list[list[str]],
-        list[str],
-        list[str],
-        list[str],
-        list[str],
-    ]:
+    async def stream_csv(
+        self,
+        products_url: AsyncIterable[str],
+        table_filename: str = "result_table",
+        write_headers: bool = True,
+        concurrency: int = 20,
+        queue_size: int = 100,
+        checkpoint: Optional["Checkpoint"] = None,
+        resume: bool = False,
+    ) -> int:
         """
-        Метод для получения внутренней информации с карточки товара (раздел "Подробнее").
-        :param products_url: Список с URL адресами товаров.
-        :return: Кортеж из списков, содержащих информацию о каждом товаре.
+        Метод для потоковой записи карточек товаров в формат csv.
+        Карточки загружаются и разбираются по мере поступления URL адресов,
+        каждая строка записывается в файл сразу после разбора карточки.
+        Колонки характеристик формируются по мере появления новых характеристик, если они появились
+        после записи первых строк, то в конце таблица перезаписывается с выравниванием колонок.
+        :param products_url: Асинхронный источник URL адресов карточек товаров,
+        например, URLParser.iter_url_for_each_product_card.
+        :param table_filename: Название итогового файла.
+        :param write_headers: Если флаг True, то в csv файле будут записаны заголовки таблицы.
+        :param concurrency: Количество одновременно загружаемых карточек.
+        :param queue_size: Размер очереди разобранных карточек.
+        :param checkpoint: Контрольные точки: найденные и записанные URL адреса, размер файла.
+        :param resume: Если флаг True, то запись продолжается с последней контрольной точки:
+        строки после нее удаляются, уже записанные карточки повторно не загружаются,
+        а если все URL адреса были найдены, то и обход магазина не повторяется.
+        :return: Количество записанных строк.
         """
 
-        title_list: list[str] = []
-        article_list: list[str] = []
-        description_list: list[list[str]] = []
-        stock_list: list[str] = []
-        current_price_list: list[str] = []
-        old_price_list: list[str] = []
-        items_url: list[str] = [page for page in products_url]
-
-        with requests.Session() as session:
-            for page in products_url:
-                response = session.get(page)
-                response.encoding = "utf8"
-
-                items_title = await self.__get_soup_data(response, "p", id="p_header")
-                items_article = await self.__get_soup_data(
-                    response, "p", class_="article"
-                )
-                items_description = await self.__get_soup_data(
-                    response, "ul", id="description"
-                )
-                items_in_stock = await self.__get_soup_data(
-                    response, "span", id="in_stock"
-                )
-                items_current_price = await self.__get_soup_data(
-                    response, "span", id="price"
-                )
-                items_old_price = await self.__get_soup_data(
-                    response, "span", id="old_price"
+        with self.session.metrics.stage("stream_csv"):
+            filename = f"{table_filename}.csv"
+            state = checkpoint.begin(filename, resume) if checkpoint else None
+            if state is not None and state.finished:
+                print(f"Таблица '{filename}' уже записана")
+                return state.rows
+
+            rows_count = state.rows if state else 0
+            schema: tuple[str, ...] = intern_schema(state.schema) if state else ()
+            covered_schemas: set[int] = set()
+            widened = state.widened if state else False
+
+            if checkpoint is not None:
+                if state is not None:
+                    os.truncate(filename, state.offset)
+                products_url = (
+                    checkpoint.pending()
+                    if state is not None and state.discovered
+                    else checkpoint.track(products_url)
                 )
 
-                title_list.extend([item for item in items_title])
-                article_list.extend(
-                    [article.split(": ")[1].strip() for article in items_article]
-                )
-                description_list.extend(
-                    [item.split("\n") for item in items_description]
+            with open(
+                filename, "a" if state else "w", encoding="utf-8-sig", newline=""
+            ) as file:
+                writer = csv.writer(file, delimiter=";")
+
+                async for product in stream_map(
+                    products_url,
+                    self.__fetch_product_card,
+                    concurrency=concurrency,
+                    queue_size=queue_size,
+                    metrics=self.session.metrics,
+                    name="fetch_product_card",
+                ):
+                    if product is None:
+                        continue
+
+                    if id(product.schema) not in covered_schemas:
+                        covered_schemas.add(id(product.schema))
+                        extended_schema = union_schema((schema, product.schema))
+                        widened = widened or (
+                            bool(rows_count) and extended_schema is not schema
+                        )
+                        schema = extended_schema
+
+                    if write_headers and not rows_count:
+                        writer.writerow(card_headers(schema))
+
+                    writer.writerow(self.__card_row(product, schema))
+                    file.flush()
+                    rows_count += 1
+
+                    if checkpoint is not None:
+                        checkpoint.mark_done(product.url)
+                        if checkpoint.due():
+                            checkpoint.save(
+                                os.fstat(file.fileno()).st_size,
+                                rows_count,
+                                schema,
+                                widened,
+                            )
+
+                if checkpoint is not None:
+                    checkpoint.save(
+                        os.fstat(file.fileno()).st_size, rows_count, schema, widened
+                    )
+
+            if widened:
+                widen_csv(
+                    filename,
+                    len(schema),
+                    card_headers(schema) if write_headers else None,
                 )
-                stock_list.extend([item.split(": ")[1] for item in items_in_stock])
-                current_price_list.extend([item for item in items_current_price])
-                old_price_list.extend([item for item in items_old_price])
+            if checkpoint is not None:
+                checkpoint.finish()
 
-        return (
-            title_list,
-            article_list,
-            description_list,
-            stock_list,
-            current_price_list,
-            old_price_list,
-            items_url,
-        )
+            print(f"Таблица '{filename}' записана")
+            return rows_count
 
-    async def __get_data_from_page(
-        self, products_page_url: list[str]
-    ) -> tuple[list[str], list[list[str]], list[str]]:
+    async def stream_to_sink(
+        self,
+        products_url: AsyncIterable[str],
+        sink: Sink,
+        concurrency: int = 20,
+        queue_size: int = 100,
+    ) -> int:
         """
-        Метод для получения информации о товаре со страницы с карточками товаров.
-        :param products_page_url: Список с URL адресами товаров.
-        :return: Кортеж из списков, содержащих информацию о каждом товаре.
+        Метод для потоковой записи карточек товаров в типизированном виде (CSV, JSON Lines, Parquet).
+        Карточки записываются по мере разбора, sink сбрасывает их в файл пачками.
+        :param products_url: Асинхронный источник URL адресов карточек товаров.
+        :param sink: Объект для записи, например, созданный функцией parsers.sinks.create_sink.
+        :param concurrency: Количество одновременно загружаемых карточек.
+        :param queue_size: Размер очереди разобранных карточек.
+        :return: Количество записанных строк.
         """
 
-        title_list: list[str] = []
-        description_list: list[list[str]] = []
-        price_list: list[str] = []
+        with self.session.metrics.stage("stream_to_sink"):
+            with sink:
+                async for product in stream_map(
+                    products_url,
+                    self.__fetch_product_card,
+                    concurrency=concurrency,
+                    queue_size=queue_size,
+                    metrics=self.session.metrics,
+                    name="fetch_product_card",
+                ):
+                    if product is not None:
+                        sink.write(product)
+
+            print(f"The file named '{sink.filename}' has been recorded")
+            return sink.rows_count
+
+    async def __fetch_product_card(self, product_url: str) -> Optional[Product]:
+        """
+        Метод для загрузки и разбора одной карточки товара.
+        :param product_url: URL адрес карточки товара.
+        :return: Данные карточки товара или None, если карточку не удалось загрузить.
+        """
 
-        with requests.Session() as session:
-            for page in products_page_url:
-                response = session.get(page)
-                response.encoding = "utf8"
+        try:
+            page_html = await self.get_content(product_url, Priority.PRODUCT)
+        except FetchError:
+            return None
 
-                items_title = await self.__get_soup_data(
-                    response, "a", class_="name_item"
-                )
-                items_description = await self.__get_soup_data(
-                    response, "div", class_="description"
-                )
-                items_price = await self.__get_soup_data(response, "p", class_="price")
+        product = await self.parse(extract_product_card, page_html)
+        product.url = product_url
+        return product
 
-                title_list.extend([item.strip() for item in items_title])
-                description_list.extend(
-                    [item.split("\n") for item in items_description]
-                )
-                price_list.extend([item for item in items_price])
+    async def __get_data_from_item_card(self, products_url: list[str]) -> list[Product]:
+        """
+        Метод для получения внутренней информации с карточки товара (раздел "Подробнее").
+        Каждая страница разбирается один раз, все поля извлекаются из одного дерева.
+        :param products_url: Список с URL адресами товаров.
+        :return: Список карточек товаров в порядке products_url.
+        """
 
-        return (
-            title_list,
-            description_list,
-            price_list,
+        # Карточки загружаются конкурентно в порядке products_url,
+        # незагруженные карточки пропускаются и не смещают строки таблицы.
+        pages = await self.get_contents(products_url, Priority.PRODUCT)
+        products = await self.parse_many(
+            extract_product_card, [page_html for _, page_html in pages]
         )
 
-    @staticmethod
-    async def __generate_card_headers(item_card_url: list[str]) -> list[str]:
+        for (page, _), product in zip(pages, products):
+            product.url = page
+        return products
+
+    async def __get_data_from_page(
+        self, products_page_url: list[str]
+    ) -> list[ListingItem]:
         """
-        Метод для генерации заголовков csv таблицы.
-        :param item_card_url: Список URL адресов с карточками товаров.
-        :return: Список заголовков.
+        Метод для получения информации о товаре со страницы с карточками товаров.
+        :param products_page_url: Список с URL адресами товаров.
+        :return: Список товаров в порядке products_page_url.
         """
 
-        card_url = httpx.get(item_card_url[1])
-        card_url.encoding = "utf-8"
+        # Страницы загружаются конкурентно в порядке products_page_url.
+        pages = await self.get_contents(products_page_url, Priority.LISTING)
+        pages_items = await self.parse_many(
+            extract_listing_items, [page_html for _, page_html in pages]
+        )
 
-        soup = BeautifulSoup(card_url, "lxml")
-        description = soup.find("ul", id="description")
-        description_list = [i.text.split(": ")[0].strip() for i in description]
+        return [item for page_items in pages_items for item in page_items]
 
-        headers_list = [header for header in description_list if header]
+    @staticmethod
+    def __card_row(product: Product, schema: tuple[str, ...]) -> tuple:
+        """
+        :param product: Данные карточки товара.
+        :param schema: Колонки характеристик таблицы.
+        :return: Строка таблицы с карточками товаров, характеристики выровнены по колонкам.
+        """
 
-        return [
-            "Наименование",
-            "Артикул",
-            *headers_list,
-            "Наличие",
-            "Цена",
-            "Старая цена",
-            "Ссылка на карточку с товаром",
-        ]
+        return (
+            product.title,
+            product.article,
+            *product.aligned_values(schema),
+            product.stock,
+            product.price,
+            product.old_price,
+            product.url,
+        )
 
     @staticmethod
     async def __write_headers(
@@ -279,13 +588,15 @@ class DataParser(Parser):
 
     @staticmethod
     async def __card_data_writer(
-        *args: list[str] | list[list[str]],
+        products: list[Product],
+        schema: tuple[str, ...],
         filename: str,
         mode: str = "w",
     ) -> None:
         """
         Метод для записи переданных данных в файл формата CSV.
-        :param args: Списки, содержащие информацию о товарах.
+        :param products: Список карточек товаров.
+        :param schema: Колонки характеристик таблицы.
         :param filename: Название файла, по умолчанию "result_table.csv".
         :param mode: Режима обработки файла.
         :return: None.
@@ -295,37 +606,19 @@ class DataParser(Parser):
             f"{filename}.csv", mode=mode, encoding="utf-8-sig", newline=""
         ) as file:
             writer = csv.writer(file, delimiter=";")
-            for (
-                title,
-                article,
-                descr,
-                stock,
-                current_price,
-                old_price,
-                url,
-            ) in itertools.zip_longest(*args):
-                flatten = (
-                    title,
-                    article,
-                    *[x.split(":")[1].strip() for x in descr if x],
-                    stock,
-                    current_price,
-                    old_price,
-                    url,
-                )
-
-                writer.writerow(flatten)
+            for product in products:
+                writer.writerow(DataParser.__card_row(product, schema))
         print(f"Таблица '{filename}.csv' записана")
 
     @staticmethod
     async def __page_data_writer(
-        *args: list[str] | list[list[str]],
+        items: list[ListingItem],
         filename: str,
         mode: str = "w",
     ) -> None:
         """
         Метод для записи переданных данных в файл формата CSV.
-        :param args: Списки, содержащие информацию о товарах.
+        :param items: Список товаров со страниц с карточками товаров.
         :param filename: Название файла, по умолчанию "result_table.csv".
         :param mode: Режима обработки файла.
         :return: None.
@@ -335,37 +628,16 @@ class DataParser(Parser):
             f"{filename}.csv", mode=mode, encoding="utf-8-sig", newline=""
         ) as file:
             writer = csv.writer(file, delimiter=";")
-            for title, description, price in itertools.zip_longest(*args):
+            for item in items:
                 flatten = (
-                    title,
-                    *[x.split(":")[1].strip() for x in description if x],
-                    price,
+                    item.title,
+                    *[value for _, value in item.description],
+                    item.price,
                 )
 
                 writer.writerow(flatten)
         print(f"The table named '{filename}.csv' has been recorded")
 
-    @staticmethod
-    async def __get_soup_data(item_url: Response, *args, **kwargs) -> list[str]:
-        """
-        Метод для создания объекта BeautifulSoup и поиск элементов по указанным тегам и атрибутам.
-        :param item_url: URL адрес на товар.
-        :param args: HTML тег для поиска элемента.
-        :param kwargs: HTML аттрибуты для поиска элемента.
-        :return: Список найденных значений.
-        """
-
-        soup = BeautifulSoup(item_url.text, "lxml")
-        searched_tag = soup.find_all(args, kwargs)
-
-        if kwargs.get("class_"):
-            kwargs["class"] = kwargs.get("class_")
-            kwargs.pop("class_")
-            searched_tag = soup.find_all(args, attrs=kwargs)
-            return [item_data.text for item_data in searched_tag]
-
-        return [item_data.text for item_data in searched_tag]
-
     @staticmethod
     async def __is_product_card_url(
         checked_urls: list[str], checked_categories: list[str]
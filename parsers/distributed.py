@@ -0,0 +1,633 @@
+import asyncio
+import glob
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import sys
+import time
+import uuid
+from abc import ABC
+from abc import abstractmethod
+from typing import Any
+from typing import NamedTuple
+from typing import Optional
+from urllib.parse import urljoin
+
+from parsers.abc_class import Parser
+from parsers.aggregates import product_category
+from parsers.data_parser import DataParser
+from parsers.extractors import extract_product_links
+from parsers.frontier import normalize_url
+from parsers.models import Product
+from parsers.pipeline import iterate
+from parsers.resilience import FetchError
+from parsers.scheduler import Priority
+from parsers.session import ParserSession
+from parsers.sinks import JsonLinesSink
+from parsers.sinks import Sink
+from parsers.url_parser import URLParser
+
+
+TASK_STATUSES = ("pending", "leased", "done", "failed")
+
+
+class Task(NamedTuple):
+    """
+    Задание распределенного обхода: диапазон страниц с товарами.
+    """
+
+    id: str
+    pages: tuple[str, ...]
+    specific: Optional[str] = None
+    attempts: int = 0
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {"pages": self.pages, "specific": self.specific}, ensure_ascii=False
+        )
+
+    @classmethod
+    def from_json(cls, task_id: str, payload: str, attempts: int = 0) -> "Task":
+        data = json.loads(payload)
+        return cls(task_id, tuple(data["pages"]), data["specific"], attempts)
+
+
+class WorkQueue(ABC):
+    """
+    Очередь заданий с арендой (lease). Воркер берет задание в аренду на lease_seconds секунд
+    и продлевает ее, пока обрабатывает задание. Если воркер завершился, не подтвердив задание,
+    то после окончания аренды задание снова выдается другому воркеру (at-least-once).
+    После max_attempts неудачных попыток задание помечается как failed.
+    """
+
+    def __init__(self, max_attempts: int = 3) -> None:
+        """
+        :param max_attempts: Максимальное количество попыток выполнения задания.
+        """
+
+        self.max_attempts = max_attempts
+
+    @abstractmethod
+    def put(self, tasks: list[Task]) -> None:
+        """
+        Метод для добавления заданий. Уже существующие задания не изменяются,
+        поэтому повторное планирование обхода не сбрасывает выполненные задания.
+        :param tasks: Задания.
+        :return: None.
+        """
+
+    @abstractmethod
+    def lease(self, worker: str, lease_seconds: float) -> Optional[Task]:
+        """
+        :param worker: Идентификатор воркера.
+        :param lease_seconds: Время аренды в секундах.
+        :return: Задание или None, если свободных заданий нет.
+        """
+
+    @abstractmethod
+    def extend(self, task_id: str, worker: str, lease_seconds: float) -> bool:
+        """
+        :param task_id: Идентификатор задания.
+        :param worker: Идентификатор воркера.
+        :param lease_seconds: Новое время аренды в секундах, начиная с текущего момента.
+        :return: True, если задание все еще арендовано воркером.
+        """
+
+    @abstractmethod
+    def complete(self, task_id: str, worker: str) -> None:
+        pass
+
+    @abstractmethod
+    def fail(self, task_id: str, worker: str, error: str) -> None:
+        pass
+
+    @abstractmethod
+    def counts(self) -> dict[str, int]:
+        """
+        :return: Количество заданий в каждом статусе: pending, leased, done и failed.
+        """
+
+    def unfinished(self) -> int:
+        counts = self.counts()
+        return counts["pending"] + counts["leased"]
+
+    def close(self) -> None:
+        pass
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.counts()})"
+
+
+class SQLiteQueue(WorkQueue):
+    """
+    Очередь заданий в файле SQLite для запуска воркеров в нескольких процессах одной машины
+    и для тестов. Аренда выдается в транзакции BEGIN IMMEDIATE, поэтому одно задание
+    не достанется двум воркерам одновременно.
+    """
+
+    def __init__(self, path: str = "work_queue.sqlite3", max_attempts: int = 3) -> None:
+        """
+        :param path: Путь к файлу базы данных.
+        :param max_attempts: Максимальное количество попыток выполнения задания.
+        """
+
+        super().__init__(max_attempts)
+        self.__connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS tasks (
+                id TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                worker TEXT,
+                lease_until REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT
+            )
+            """
+        )
+
+    def put(self, tasks: list[Task]) -> None:
+        with self.__connection:
+            self.__connection.executemany(
+                "INSERT OR IGNORE INTO tasks (id, payload) VALUES (?, ?)",
+                [(task.id, task.to_json()) for task in tasks],
+            )
+
+    def lease(self, worker: str, lease_seconds: float) -> Optional[Task]:
+        now = time.time()
+        self.__connection.execute("BEGIN IMMEDIATE")
+        try:
+            self.__connection.execute(
+                "UPDATE tasks SET status = 'failed', error = 'lease expired' "
+                "WHERE status = 'leased' AND lease_until < ? AND attempts >= ?",
+                (now, self.max_attempts),
+            )
+            row = self.__connection.execute(
+                "SELECT id, payload, attempts FROM tasks "
+                "WHERE status = 'pending' OR (status = 'leased' AND lease_until < ?) "
+                "ORDER BY id LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is not None:
+                self.__connection.execute(
+                    "UPDATE tasks SET status = 'leased', worker = ?, lease_until = ?, "
+                    "attempts = attempts + 1 WHERE id = ?",
+                    (worker, now + lease_seconds, row[0]),
+                )
+            self.__connection.execute("COMMIT")
+        except BaseException:
+            self.__connection.execute("ROLLBACK")
+            raise
+
+        if row is None:
+            return None
+        task_id, payload, attempts = row
+        return Task.from_json(task_id, payload, attempts + 1)
+
+    def extend(self, task_id: str, worker: str, lease_seconds: float) -> bool:
+        with self.__connection:
+            cursor = self.__connection.execute(
+                "UPDATE tasks SET lease_until = ? "
+                "WHERE id = ? AND worker = ? AND status = 'leased'",
+                (time.time() + lease_seconds, task_id, worker),
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, task_id: str, worker: str) -> None:
+        # Результат задания записывается целиком, поэтому подтверждение от воркера,
+        # аренда которого истекла, тоже принимается.
+        with self.__connection:
+            self.__connection.execute(
+                "UPDATE tasks SET status = 'done', worker = ?, error = NULL WHERE id = ?",
+                (worker, task_id),
+            )
+
+    def fail(self, task_id: str, worker: str, error: str) -> None:
+        with self.__connection:
+            self.__connection.execute(
+                "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "error = ?, lease_until = NULL "
+                "WHERE id = ? AND worker = ? AND status = 'leased'",
+                (self.max_attempts, error, task_id, worker),
+            )
+
+    def counts(self) -> dict[str, int]:
+        counts = dict.fromkeys(TASK_STATUSES, 0)
+        counts.update(
+            self.__connection.execute(
+                "SELECT status, COUNT(*) FROM tasks GROUP BY status"
+            ).fetchall()
+        )
+        return counts
+
+    def errors(self) -> dict[str, str]:
+        """
+        :return: Последняя ошибка каждого задания, которое не удалось выполнить.
+        """
+
+        return dict(
+            self.__connection.execute(
+                "SELECT id, error FROM tasks WHERE status = 'failed'"
+            ).fetchall()
+        )
+
+    def close(self) -> None:
+        self.__connection.close()
+
+
+# Аренда задания одной командой на стороне Redis: задания хранятся в сортированном множестве,
+# оценка - время, с которого задание можно выдать (0 - новое задание, иначе - окончание аренды).
+_REDIS_LEASE = """
+while true do
+    local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, 1)
+    if #ids == 0 then
+        return false
+    end
+    local id = ids[1]
+    local attempts = tonumber(redis.call('HGET', KEYS[2], id) or '0')
+    if attempts >= tonumber(ARGV[4]) then
+        redis.call('ZREM', KEYS[1], id)
+        redis.call('HSET', KEYS[4], id, 'lease expired')
+    else
+        redis.call('ZADD', KEYS[1], ARGV[2], id)
+        redis.call('HSET', KEYS[2], id, attempts + 1)
+        redis.call('HSET', KEYS[3], id, ARGV[3])
+        return {id, attempts + 1}
+    end
+end
+"""
+
+
+def _text(value: Any) -> Any:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+class RedisQueue(WorkQueue):
+    """
+    Очередь заданий в Redis для запуска воркеров на нескольких машинах.
+    Принимает клиент с интерфейсом redis-py (redis.Redis или совместимый), сам пакет redis
+    проектом не устанавливается. Для тестов и локального запуска используется SQLiteQueue
+    с тем же интерфейсом.
+    """
+
+    def __init__(
+        self, client: Any, name: str = "marketplace", max_attempts: int = 3
+    ) -> None:
+        """
+        :param client: Клиент Redis, например, redis.Redis.from_url("redis://localhost:6379/0").
+        :param name: Префикс ключей очереди.
+        :param max_attempts: Максимальное количество попыток выполнения задания.
+        """
+
+        super().__init__(max_attempts)
+        self.__client = client
+        self.__queue = f"{name}:queue"
+        self.__tasks = f"{name}:tasks"
+        self.__attempts = f"{name}:attempts"
+        self.__workers = f"{name}:workers"
+        self.__done = f"{name}:done"
+        self.__failed = f"{name}:failed"
+        self.__lease = client.register_script(_REDIS_LEASE)
+
+    def put(self, tasks: list[Task]) -> None:
+        for task in tasks:
+            if self.__client.hsetnx(self.__tasks, task.id, task.to_json()):
+                self.__client.zadd(self.__queue, {task.id: 0})
+
+    def lease(self, worker: str, lease_seconds: float) -> Optional[Task]:
+        now = time.time()
+        leased = self.__lease(
+            keys=[self.__queue, self.__attempts, self.__workers, self.__failed],
+            args=[now, now + lease_seconds, worker, self.max_attempts],
+        )
+        if not leased:
+            return None
+
+        task_id, attempts = _text(leased[0]), int(leased[1])
+        payload = _text(self.__client.hget(self.__tasks, task_id))
+        return Task.from_json(task_id, payload, attempts)
+
+    def __is_owner(self, task_id: str, worker: str) -> bool:
+        return _text(self.__client.hget(self.__workers, task_id)) == worker
+
+    def extend(self, task_id: str, worker: str, lease_seconds: float) -> bool:
+        if not self.__is_owner(task_id, worker):
+            return False
+        return bool(
+            self.__client.zadd(
+                self.__queue, {task_id: time.time() + lease_seconds}, xx=True, ch=True
+            )
+        )
+
+    def complete(self, task_id: str, worker: str) -> None:
+        self.__client.zrem(self.__queue, task_id)
+        self.__client.sadd(self.__done, task_id)
+
+    def fail(self, task_id: str, worker: str, error: str) -> None:
+        if not self.__is_owner(task_id, worker):
+            return
+
+        attempts = int(self.__client.hget(self.__attempts, task_id) or 0)
+        if attempts >= self.max_attempts:
+            self.__client.zrem(self.__queue, task_id)
+            self.__client.hset(self.__failed, task_id, error)
+        else:
+            self.__client.zadd(self.__queue, {task_id: 0}, xx=True)
+
+    def counts(self) -> dict[str, int]:
+        now = time.time()
+        return {
+            "pending": self.__client.zcount(self.__queue, "-inf", now),
+            "leased": self.__client.zcount(self.__queue, f"({now}", "+inf"),
+            "done": self.__client.scard(self.__done),
+            "failed": self.__client.hlen(self.__failed),
+        }
+
+
+def merge_shards(shard_dir: str, sink: Sink) -> int:
+    """
+    Функция для объединения результатов воркеров в одну таблицу.
+    Шарды читаются в порядке заданий, товары с повторяющимися артикулами записываются один раз
+    (при повторном выполнении задания его товары могут попасть в несколько шардов).
+    :param shard_dir: Каталог с шардами в формате JSON Lines.
+    :param sink: Объект для записи итоговой таблицы, например, созданный функцией create_sink.
+    :return: Количество записанных строк.
+    """
+
+    articles: set[str] = set()
+    with sink:
+        for shard in sorted(glob.glob(os.path.join(shard_dir, "*.jsonl"))):
+            if shard.endswith(".part.jsonl"):
+                continue
+            with open(shard, encoding="utf-8") as file:
+                for line in file:
+                    product = Product.from_record(json.loads(line))
+                    if product.article not in articles:
+                        articles.add(product.article)
+                        sink.write(product)
+    return sink.rows_count
+
+
+class Coordinator:
+    """
+    Координатор распределенного обхода: делит страницы с товарами на задания
+    по partition_size страниц (в порядке категорий и страниц) и объединяет результаты воркеров.
+    """
+
+    def __init__(
+        self,
+        queue: WorkQueue,
+        url_parser: URLParser,
+        shard_dir: str = "shards",
+        partition_size: int = 10,
+    ) -> None:
+        """
+        :param queue: Очередь заданий.
+        :param url_parser: Парсер, через который определяются страницы с товарами.
+        :param shard_dir: Каталог, в который воркеры записывают результаты.
+        :param partition_size: Количество страниц с товарами в одном задании.
+        """
+
+        self.queue = queue
+        self.url_parser = url_parser
+        self.shard_dir = shard_dir
+        self.partition_size = max(partition_size, 1)
+
+    async def plan(self, specific: Optional[str] = None) -> int:
+        """
+        Метод для постановки заданий в очередь.
+        :param specific: Категория товара, None - все категории.
+        :return: Количество заданий.
+        """
+
+        # Воркеры сравнивают категорию с категорией из URL адреса карточки без приведения.
+        if specific is not None:
+            specific = specific.strip().lower()
+
+        pages = await self.url_parser.get_url_for_each_category_page(specific)
+        tasks = [
+            Task(
+                f"{number:06d}",
+                tuple(pages[start : start + self.partition_size]),
+                specific,
+            )
+            for number, start in enumerate(range(0, len(pages), self.partition_size))
+        ]
+        self.queue.put(tasks)
+        return len(tasks)
+
+    async def wait(self, poll_interval: float = 1.0) -> dict[str, int]:
+        """
+        Метод ожидает, пока все задания будут выполнены или отклонены.
+        :param poll_interval: Интервал опроса очереди в секундах.
+        :return: Количество заданий в каждом статусе.
+        """
+
+        while self.queue.unfinished():
+            await asyncio.sleep(poll_interval)
+        return self.queue.counts()
+
+    def merge(self, sink: Sink) -> int:
+        """
+        :param sink: Объект для записи итоговой таблицы.
+        :return: Количество записанных строк.
+        """
+
+        return merge_shards(self.shard_dir, sink)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.queue!r})"
+
+
+class Worker(Parser):
+    """
+    Воркер распределенного обхода. Берет задания из очереди, загружает страницы с товарами
+    и карточки товаров и записывает каждое задание в отдельный шард JSON Lines.
+    Шард появляется под итоговым именем только после записи всех карточек задания,
+    поэтому повторное выполнение задания перезаписывает шард, а не дополняет его.
+    """
+
+    def __init__(
+        self,
+        queue: WorkQueue,
+        session: Optional[ParserSession] = None,
+        shard_dir: str = "shards",
+        worker_id: Optional[str] = None,
+        lease_seconds: float = 60.0,
+        concurrency: int = 20,
+    ) -> None:
+        """
+        :param queue: Очередь заданий.
+        :param session: Общая сессия парсеров.
+        :param shard_dir: Каталог для результатов заданий.
+        :param worker_id: Идентификатор воркера, по умолчанию - имя хоста, PID и случайный суффикс.
+        :param lease_seconds: Время аренды задания, аренда продлевается каждые lease_seconds / 3 секунд.
+        :param concurrency: Количество одновременно загружаемых карточек.
+        """
+
+        super().__init__(session)
+        self.queue = queue
+        self.shard_dir = shard_dir
+        self.worker_id = (
+            worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        )
+        self.lease_seconds = lease_seconds
+        self.concurrency = concurrency
+        os.makedirs(shard_dir, exist_ok=True)
+
+    async def run(
+        self, max_tasks: Optional[int] = None, poll_interval: float = 1.0
+    ) -> int:
+        """
+        Метод обрабатывает задания, пока в очереди есть невыполненные задания.
+        :param max_tasks: Максимальное количество заданий, None - без ограничений.
+        :param poll_interval: Интервал опроса очереди в секундах, пока задания арендованы другими воркерами.
+        :return: Количество выполненных заданий.
+        """
+
+        completed = 0
+        with self.session.metrics.stage("distributed_worker"):
+            while max_tasks is None or completed < max_tasks:
+                task = self.queue.lease(self.worker_id, self.lease_seconds)
+                if task is None:
+                    if not self.queue.unfinished():
+                        break
+                    await asyncio.sleep(poll_interval)
+                    continue
+
+                heartbeat = asyncio.create_task(self.__heartbeat(task))
+                try:
+                    await self.process(task)
+                except Exception as error:
+                    # Ошибка одного задания не останавливает воркер: задание отклоняется,
+                    # а не остается в аренде до истечения ее срока.
+                    self.queue.fail(
+                        task.id,
+                        self.worker_id,
+                        str(error)
+                        if isinstance(error, FetchError)
+                        else f"{error.__class__.__name__}: {error}",
+                    )
+                    self.session.metrics.inc("distributed_tasks_total", result="failed")
+                else:
+                    self.queue.complete(task.id, self.worker_id)
+                    self.session.metrics.inc("distributed_tasks_total", result="done")
+                    completed += 1
+                finally:
+                    heartbeat.cancel()
+        return completed
+
+    async def process(self, task: Task) -> int:
+        """
+        Метод для выполнения одного задания.
+        :param task: Задание.
+        :return: Количество записанных карточек товаров.
+        :raises FetchError: Если часть страниц или карточек задания не удалось загрузить.
+        """
+
+        pages = await self.get_contents(list(task.pages), Priority.LISTING)
+        if len(pages) < len(task.pages):
+            loaded = {url for url, _ in pages}
+            missing = [url for url in task.pages if url not in loaded]
+            raise FetchError(
+                missing[0], f"{len(missing)} listing pages were not loaded"
+            )
+
+        pages_links = await self.parse_many(
+            extract_product_links, [page_html for _, page_html in pages]
+        )
+        # Ссылки разрешаются относительно страницы, на которой они найдены,
+        # поэтому воркеру не нужен базовый URL адрес магазина.
+        product_urls = list(
+            dict.fromkeys(
+                url
+                for (page_url, _), page_links in zip(pages, pages_links)
+                for url in (
+                    normalize_url(urljoin(page_url, href)) for href in page_links
+                )
+                if task.specific is None or product_category(url) == task.specific
+            )
+        )
+
+        shard = os.path.join(self.shard_dir, task.id)
+        sink = JsonLinesSink(f"{shard}.part")
+        rows = await DataParser(self.session).stream_to_sink(
+            iterate(product_urls), sink, concurrency=self.concurrency
+        )
+        if rows < len(product_urls):
+            os.remove(sink.filename)
+            raise FetchError(
+                task.pages[0],
+                f"{len(product_urls) - rows} product cards were not loaded",
+            )
+
+        os.replace(sink.filename, f"{shard}.jsonl")
+        return rows
+
+    async def __heartbeat(self, task: Task) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            self.queue.extend(task.id, self.worker_id, self.lease_seconds)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.worker_id!r})"
+
+
+async def run_worker(
+    queue: WorkQueue, shard_dir: str = "shards", **session_options: Any
+) -> int:
+    """
+    :param queue: Очередь заданий.
+    :param shard_dir: Каталог для результатов заданий.
+    :param session_options: Параметры ParserSession, например, workers и rate_limit.
+    :return: Количество выполненных заданий.
+    """
+
+    async with ParserSession(**session_options) as session:
+        return await Worker(queue, session, shard_dir).run()
+
+
+def _worker_process(
+    queue_path: str, shard_dir: str, session_options: dict[str, Any]
+) -> None:
+    queue = SQLiteQueue(queue_path)
+    try:
+        asyncio.run(run_worker(queue, shard_dir, **session_options))
+        failed = queue.counts()["failed"]
+    finally:
+        queue.close()
+
+    # Процесс завершается с кодом 1, если часть заданий окончательно отклонена.
+    if failed:
+        sys.exit(1)
+
+
+def run_local_workers(
+    queue_path: str, shard_dir: str = "shards", workers: int = 4, **session_options: Any
+) -> list[int]:
+    """
+    Функция для запуска воркеров в отдельных процессах на одной машине с очередью SQLiteQueue.
+    У каждого процесса свой пул соединений и свой исполнитель разбора HTML разметки.
+    :param queue_path: Путь к файлу очереди SQLiteQueue.
+    :param shard_dir: Каталог для результатов заданий.
+    :param workers: Количество процессов.
+    :param session_options: Параметры ParserSession для каждого воркера.
+    :return: Коды завершения процессов: 1, если после обхода в очереди остались
+    отклоненные задания (failed), или код ошибки процесса.
+    """
+
+    processes = [
+        multiprocessing.Process(
+            target=_worker_process, args=(queue_path, shard_dir, session_options)
+        )
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    return [process.exitcode or 0 for process in processes]
@@ -0,0 +1,188 @@
+import asyncio
+import os
+from concurrent.futures import BrokenExecutor
+from concurrent.futures import Executor
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Callable
+from typing import Optional
+from typing import Sequence
+
+
+def _apply_batch(
+    func: Callable[[Any], Any], items: Sequence[Any]
+) -> list[tuple[bool, Any]]:
+    """
+    Функция выполняется в воркере пула и обрабатывает сразу пачку элементов,
+    чтобы снизить накладные расходы на передачу данных между процессами.
+    :param func: Функция разбора HTML разметки.
+    :param items: Пачка элементов для обработки.
+    :return: Список пар (успех, результат или исключение) в порядке items.
+    """
+
+    results: list[tuple[bool, Any]] = []
+    for item in items:
+        try:
+            results.append((True, func(item)))
+        except Exception as error:
+            results.append((False, error))
+    return results
+
+
+class ParsingExecutor:
+    """
+    Исполнитель для разбора HTML разметки вне event loop.
+    По умолчанию использует пул процессов, что позволяет задействовать все ядра.
+    Если пул процессов недоступен, используется пул потоков.
+    Запросы на разбор, пришедшие в одной итерации event loop, объединяются в пачки.
+    """
+
+    KINDS = ("process", "thread")
+
+    def __init__(
+        self,
+        kind: str = "process",
+        max_workers: Optional[int] = None,
+        batch_size: int = 16,
+    ) -> None:
+        """
+        :param kind: Тип пула: "process" или "thread".
+        :param max_workers: Количество воркеров, по умолчанию равно количеству ядер.
+        :param batch_size: Максимальное количество элементов в одной пачке.
+        """
+
+        if kind not in self.KINDS:
+            raise ValueError(
+                'The specified executor kind "%s" is not one of %s.'
+                % (kind, ", ".join(self.KINDS))
+            )
+
+        self.__kind = kind
+        self.__max_workers = max_workers or os.cpu_count() or 1
+        self.__batch_size = max(batch_size, 1)
+        self.__pool: Optional[Executor] = None
+        self.__pending: list[tuple[Callable[[Any], Any], Any, asyncio.Future]] = []
+        self.__flush_scheduled = False
+        self.__batch_tasks: set[asyncio.Task] = set()
+
+    @property
+    def kind(self) -> str:
+        return self.__kind
+
+    async def submit(self, func: Callable[[Any], Any], item: Any) -> Any:
+        """
+        Метод для постановки элемента в очередь на разбор.
+        :param func: Функция разбора, должна быть объявлена на уровне модуля.
+        :param item: HTML разметка страницы.
+        :return: Результат выполнения func(item).
+        """
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        self.__pending.append((func, item, future))
+
+        if len(self.__pending) >= self.__batch_size:
+            self.__flush()
+        elif not self.__flush_scheduled:
+            self.__flush_scheduled = True
+            loop.call_soon(self.__flush)
+
+        return await future
+
+    async def map(self, func: Callable[[Any], Any], items: Sequence[Any]) -> list:
+        """
+        :param func: Функция разбора, должна быть объявлена на уровне модуля.
+        :param items: Элементы для обработки.
+        :return: Результаты в порядке items.
+        """
+
+        return list(await asyncio.gather(*[self.submit(func, item) for item in items]))
+
+    def shutdown(self) -> None:
+        """
+        Метод для остановки пула воркеров.
+        :return: None.
+        """
+
+        if self.__pool is not None:
+            self.__pool.shutdown(wait=True, cancel_futures=True)
+            self.__pool = None
+
+    def __flush(self) -> None:
+        """
+        Метод группирует ожидающие элементы по функции разбора и отправляет их в пул пачками.
+        :return: None.
+        """
+
+        self.__flush_scheduled = False
+        pending, self.__pending = self.__pending, []
+
+        batches: dict[Callable[[Any], Any], list[tuple[Any, asyncio.Future]]] = {}
+        for func, item, future in pending:
+            batches.setdefault(func, []).append((item, future))
+
+        for func, entries in batches.items():
+            for start in range(0, len(entries), self.__batch_size):
+                task = asyncio.ensure_future(
+                    self.__run_batch(func, entries[start : start + self.__batch_size])
+                )
+                self.__batch_tasks.add(task)
+                task.add_done_callback(self.__batch_tasks.discard)
+
+    async def __run_batch(
+        self,
+        func: Callable[[Any], Any],
+        entries: list[tuple[Any, asyncio.Future]],
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        items = [item for item, _ in entries]
+
+        try:
+            try:
+                results = await loop.run_in_executor(
+                    self.__get_pool(), _apply_batch, func, items
+                )
+            except BrokenExecutor:
+                self.__fallback_to_threads()
+                results = await loop.run_in_executor(
+                    self.__get_pool(), _apply_batch, func, items
+                )
+
+        except Exception as error:
+            for _, future in entries:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        for (_, future), (success, result) in zip(entries, results):
+            if future.done():
+                continue
+            if success:
+                future.set_result(result)
+            else:
+                future.set_exception(result)
+
+    def __get_pool(self) -> Executor:
+        if self.__pool is None:
+            if self.__kind == "process":
+                try:
+                    # multiprocessing загружается только для пула процессов.
+                    from concurrent.futures import ProcessPoolExecutor
+
+                    self.__pool = ProcessPoolExecutor(max_workers=self.__max_workers)
+                except (OSError, NotImplementedError, ImportError):
+                    self.__kind = "thread"
+
+            if self.__pool is None:
+                self.__pool = ThreadPoolExecutor(max_workers=self.__max_workers)
+
+        return self.__pool
+
+    def __fallback_to_threads(self) -> None:
+        if self.__pool is not None:
+            self.__pool.shutdown(wait=False, cancel_futures=True)
+        self.__pool = None
+        self.__kind = "thread"
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(kind={self.__kind!r}, max_workers={self.__max_workers})"
@@ -0,0 +1,317 @@
+from typing import Any
+from typing import Iterator
+from typing import NamedTuple
+from typing import Optional
+from typing import Union
+
+from lxml import etree
+
+from parsers.models import Product
+
+HtmlContent = Union[str, bytes]
+
+
+def _has_class(class_name: str) -> str:
+    """
+    :param class_name: Название CSS класса.
+    :return: XPath условие, аналогичное поиску по class_ в BeautifulSoup.
+    """
+
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+
+# XPath выражения компилируются один раз при импорте модуля.
+_STRING = etree.XPath("string()")
+
+_LISTING_TITLES = etree.XPath(f"//a[{_has_class('name_item')}]")
+_LISTING_DESCRIPTIONS = etree.XPath(f"//div[{_has_class('description')}]")
+_LISTING_PRICES = etree.XPath(f"//p[{_has_class('price')}]")
+
+_NAV_MENU_LINKS = etree.XPath(f"(//div[{_has_class('nav_menu')}])[1]//a/@href")
+_NAV_MENU_ITEMS = etree.XPath(f"(//div[{_has_class('nav_menu')}])[1]//a[@href]")
+_NAV_MENU_LABEL = etree.XPath("string((descendant::*[@id or @class])[1]/@id)")
+_NAV_MENU_CLASS = etree.XPath("string((descendant::*[@id or @class])[1]/@class)")
+_PAGINATION_LINKS = etree.XPath(f"(//div[{_has_class('pagen')}])[1]//a/@href")
+_PRODUCT_LINKS = etree.XPath(
+    f"//div[{_has_class('sale_button')}]/descendant::a[1]/@href"
+)
+
+_UTF8_PARSER = etree.HTMLParser(encoding="utf-8")
+_TEXT_PARSER = etree.HTMLParser()
+
+# Карточка товара разбирается инкрементально: события генерируются только для этих тегов.
+_CARD_TAGS = ("p", "span", "ul")
+_CARD_SPANS = {"in_stock": "stock", "price": "price", "old_price": "old_price"}
+_CARD_FIELDS = ("title", "article", "description", "stock", "price", "old_price")
+# Размер фрагмента разметки, передаваемого инкрементальному парсеру за один раз.
+FEED_CHUNK_SIZE = 4 * 1024
+# Количество пропущенных закрытых элементов, после которого обработанная разметка удаляется из дерева.
+_DROP_INTERVAL = 64
+
+
+class PageLinks(NamedTuple):
+    """
+    Все ссылки страницы магазина, извлеченные за один разбор.
+    """
+
+    categories: tuple[tuple[str, str], ...]
+    pagination: tuple[str, ...]
+    products: tuple[str, ...]
+
+
+class ListingItem(NamedTuple):
+    """
+    Данные товара со страницы с карточками товаров.
+    """
+
+    title: str
+    description: tuple[tuple[str, str], ...]
+    price: str
+
+
+def parse_html(page_html: HtmlContent) -> etree._Element:
+    """
+    Функция для однократного построения дерева HTML разметки.
+    Байты декодируются как UTF-8, так же как и текст ответа в Parser.get_response.
+    :param page_html: HTML разметка страницы в виде строки или байтов.
+    :return: Корневой элемент дерева.
+    """
+
+    parser = _UTF8_PARSER if isinstance(page_html, bytes) else _TEXT_PARSER
+    return etree.fromstring(page_html, parser)
+
+
+def _description_pairs(element: etree._Element) -> tuple[tuple[str, str], ...]:
+    """
+    :param element: Элемент, содержащий строки вида "Характеристика: значение".
+    :return: Кортеж пар (характеристика, значение).
+    """
+
+    pairs = []
+    for line in "".join(element.itertext()).split("\n"):
+        key, separator, value = line.partition(":")
+        if separator:
+            pairs.append((key.strip(), value.strip()))
+    return tuple(pairs)
+
+
+def _after_colon(text: str) -> str:
+    return text.partition(": ")[2].strip()
+
+
+def _card_field(element: etree._Element) -> Optional[str]:
+    """
+    :param element: Элемент разметки карточки товара.
+    :return: Поле карточки, которое содержит элемент, или None.
+    """
+
+    tag = element.tag
+    if tag == "span":
+        return _CARD_SPANS.get(element.get("id"))
+    if tag == "p":
+        if element.get("id") == "p_header":
+            return "title"
+        if "article" in (element.get("class") or "").split():
+            return "article"
+    elif tag == "ul" and element.get("id") == "description":
+        return "description"
+    return None
+
+
+def _iter_card_elements(page_html: HtmlContent) -> Iterator[etree._Element]:
+    """
+    Функция передает разметку инкрементальному парсеру фрагментами по FEED_CHUNK_SIZE,
+    поэтому разбор прекращается, как только вызывающий код перестает запрашивать элементы.
+    :param page_html: HTML разметка карточки товара.
+    :return: Итератор по закрытым элементам p, span и ul в порядке закрывающих тегов.
+    """
+
+    parser = etree.HTMLPullParser(
+        events=("end",),
+        tag=_CARD_TAGS,
+        encoding="utf-8" if isinstance(page_html, bytes) else None,
+    )
+    for start in range(0, len(page_html), FEED_CHUNK_SIZE):
+        parser.feed(page_html[start : start + FEED_CHUNK_SIZE])
+        for _, element in parser.read_events():
+            yield element
+
+    if page_html:
+        parser.close()
+        for _, element in parser.read_events():
+            yield element
+
+
+def _drop_preceding(element: etree._Element) -> None:
+    """
+    Функция удаляет из дерева уже обработанную разметку: содержимое закрытого элемента,
+    предшествующие ему элементы и элементы, предшествующие его предкам.
+    :param element: Закрытый элемент.
+    :return: None.
+    """
+
+    element.clear(keep_tail=True)
+    while element is not None:
+        parent = element.getparent()
+        while element.getprevious() is not None:
+            del parent[0]
+        element = parent
+
+
+def _scan_product_card(
+    page_html: HtmlContent, fields: tuple[str, ...] = _CARD_FIELDS
+) -> dict[str, Any]:
+    """
+    Функция для инкрементального разбора карточки товара. Из дерева сразу удаляются
+    обработанные элементы, а разбор прекращается, как только найдены все поля,
+    поэтому целое дерево страницы не строится. Для каждого поля используется первый найденный элемент.
+    :param page_html: HTML разметка карточки товара.
+    :param fields: Поля карточки, которые необходимо извлечь.
+    :return: Словарь найденных полей: текст элемента или пары характеристик для description.
+    """
+
+    found: dict[str, Any] = {}
+    skipped = 0
+    for element in _iter_card_elements(page_html):
+        field = _card_field(element)
+
+        if field in fields and field not in found:
+            found[field] = (
+                _description_pairs(element)
+                if field == "description"
+                else _STRING(element)
+            )
+            if len(found) == len(fields):
+                break
+        else:
+            skipped += 1
+            if skipped % _DROP_INTERVAL:
+                continue
+
+        # Элементы внутри полей карточки (например, span внутри цены) удаляются вместе с полем.
+        if not any(map(_card_field, element.iterancestors(_CARD_TAGS))):
+            _drop_preceding(element)
+
+    return found
+
+
+def extract_product_card(page_html: HtmlContent, url: str = "") -> Product:
+    """
+    Функция для извлечения всех полей карточки товара за один инкрементальный разбор страницы.
+    :param page_html: HTML разметка карточки товара.
+    :param url: URL адрес карточки товара.
+    :return: Данные карточки товара.
+    """
+
+    fields = _scan_product_card(page_html)
+
+    return Product(
+        title=fields.get("title", ""),
+        article=_after_colon(fields.get("article", "")),
+        description=fields.get("description", ()),
+        stock=_after_colon(fields.get("stock", "")),
+        price=fields.get("price", ""),
+        old_price=fields.get("old_price", ""),
+        url=url,
+    )
+
+
+def extract_product_value(page_html: HtmlContent) -> int:
+    """
+    Функция для подсчета стоимости всех единиц товара в наличии.
+    Разбор прекращается сразу после того, как найдены остаток и цена.
+    :param page_html: HTML разметка карточки товара.
+    :return: Произведение количества товара в наличии на его цену.
+    """
+
+    fields = _scan_product_card(page_html, ("stock", "price"))
+    stock = _after_colon(fields.get("stock", ""))
+    price = fields.get("price", "").split(" ")[0]
+
+    return int(stock) * int(price) if stock and price else 0
+
+
+def extract_listing_items(page_html: HtmlContent) -> list[ListingItem]:
+    """
+    Функция для извлечения всех товаров со страницы с карточками товаров.
+    :param page_html: HTML разметка страницы с товарами.
+    :return: Список товаров в порядке их расположения на странице.
+    """
+
+    tree = parse_html(page_html)
+
+    return [
+        ListingItem(
+            title="".join(title.itertext()).strip(),
+            description=_description_pairs(description),
+            price="".join(price.itertext()),
+        )
+        for title, description, price in zip(
+            _LISTING_TITLES(tree), _LISTING_DESCRIPTIONS(tree), _LISTING_PRICES(tree)
+        )
+    ]
+
+
+def extract_category_links(page_html: HtmlContent) -> list[str]:
+    """
+    :param page_html: HTML разметка любой страницы магазина.
+    :return: Относительные ссылки на категории из блока nav_menu.
+    """
+
+    return [str(href) for href in _NAV_MENU_LINKS(parse_html(page_html))]
+
+
+def extract_category_menu(page_html: HtmlContent) -> list[tuple[str, str]]:
+    """
+    :param page_html: HTML разметка любой страницы магазина.
+    :return: Пары (относительная ссылка, метка категории) из блока nav_menu.
+    Метка - id (или class) первого вложенного элемента ссылки, либо ее текст.
+    """
+
+    return _category_menu(parse_html(page_html))
+
+
+def _category_menu(tree: etree._Element) -> list[tuple[str, str]]:
+    return [
+        (
+            str(link.get("href")),
+            (_NAV_MENU_LABEL(link) or _NAV_MENU_CLASS(link) or "".join(link.itertext()))
+            .strip()
+            .lower(),
+        )
+        for link in _NAV_MENU_ITEMS(tree)
+    ]
+
+
+def extract_page_links(page_html: HtmlContent) -> PageLinks:
+    """
+    Функция для извлечения ссылок на категории, страницы категории и карточки товаров
+    из одного дерева, чтобы каждая страница магазина загружалась и разбиралась один раз.
+    :param page_html: HTML разметка страницы категории.
+    :return: Ссылки страницы.
+    """
+
+    tree = parse_html(page_html)
+    return PageLinks(
+        categories=tuple(_category_menu(tree)),
+        pagination=tuple(str(href) for href in _PAGINATION_LINKS(tree)),
+        products=tuple(str(href) for href in _PRODUCT_LINKS(tree)),
+    )
+
+
+def extract_pagination_links(page_html: HtmlContent) -> list[str]:
+    """
+    :param page_html: HTML разметка страницы категории.
+    :return: Относительные ссылки на страницы категории из блока pagen.
+    """
+
+    return [str(href) for href in _PAGINATION_LINKS(parse_html(page_html))]
+
+
+def extract_product_links(page_html: HtmlContent) -> list[str]:
+    """
+    :param page_html: HTML разметка страницы с товарами.
+    :return: Относительные ссылки на карточки товаров из блоков sale_button.
+    """
+
+    return [str(href) for href in _PRODUCT_LINKS(parse_html(page_html))]
@@ -0,0 +1,161 @@
+import hashlib
+import posixpath
+from math import ceil
+from math import log
+from typing import Iterator
+from typing import Optional
+from typing import Union
+from urllib.parse import parse_qsl
+from urllib.parse import urlencode
+from urllib.parse import urlsplit
+from urllib.parse import urlunsplit
+
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Функция для приведения URL адреса к единому виду, чтобы одна и та же страница
+    не загружалась повторно: схема и хост в нижнем регистре, без порта по умолчанию,
+    без фрагмента, без "./" и "../" в пути, с отсортированными параметрами запроса.
+    :param url: Абсолютный URL адрес.
+    :return: Нормализованный URL адрес.
+    """
+
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    netloc = (
+        host
+        if parts.port is None or DEFAULT_PORTS.get(scheme) == parts.port
+        else f"{host}:{parts.port}"
+    )
+
+    path = posixpath.normpath(parts.path) if parts.path else "/"
+    if parts.path.endswith("/") and not path.endswith("/"):
+        path += "/"
+
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+class BloomFilter:
+    """
+    Вероятностное множество фиксированного размера для очень больших обходов.
+    Ложноотрицательных ответов нет, доля ложноположительных не превышает error_rate
+    при количестве элементов не больше capacity.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        """
+        :param capacity: Ожидаемое количество элементов.
+        :param error_rate: Допустимая доля ложноположительных ответов.
+        """
+
+        self.__size = max(ceil(-capacity * log(error_rate) / log(2) ** 2), 8)
+        self.__hashes = max(round(self.__size / capacity * log(2)), 1)
+        self.__bits = bytearray((self.__size + 7) // 8)
+
+    def __positions(self, item: str) -> Iterator[int]:
+        # Двойное хеширование: k позиций получаются из двух половин одного хэша.
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for number in range(self.__hashes):
+            yield (first + number * second) % self.__size
+
+    def add(self, item: str) -> bool:
+        """
+        :param item: Добавляемый элемент.
+        :return: True, если элемента не было в множестве.
+        """
+
+        added = False
+        for position in self.__positions(item):
+            byte, bit = divmod(position, 8)
+            if not self.__bits[byte] & (1 << bit):
+                self.__bits[byte] |= 1 << bit
+                added = True
+        return added
+
+    def __contains__(self, item: object) -> bool:
+        return isinstance(item, str) and all(
+            self.__bits[position // 8] & (1 << (position % 8))
+            for position in self.__positions(item)
+        )
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(size={self.__size}, hashes={self.__hashes})"
+
+
+class Frontier:
+    """
+    Граница обхода: множество URL адресов, которые уже запланированы к загрузке.
+    URL адреса нормализуются перед проверкой, поэтому одна страница принимается один раз.
+    Дополнительно ограничивается глубина обхода (0 - стартовая страница, 1 - категории,
+    2 - страницы категорий, 3 - карточки товаров) и общее количество принятых URL адресов.
+    """
+
+    def __init__(
+        self,
+        max_pages: Optional[int] = None,
+        max_depth: Optional[int] = None,
+        expected_urls: Optional[int] = None,
+    ) -> None:
+        """
+        :param max_pages: Максимальное количество принятых URL адресов, None - без ограничений.
+        :param max_depth: Максимальная глубина обхода, None - без ограничений.
+        :param expected_urls: Если указано, то вместо множества используется фильтр Блума
+        на указанное количество URL адресов (для очень больших обходов).
+        """
+
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        # URL адреса, которые не удалось загрузить: результат обхода неполный.
+        self.failed: set[str] = set()
+        self.__seen: Union[set[str], BloomFilter] = (
+            BloomFilter(expected_urls) if expected_urls else set()
+        )
+        self.__admitted = 0
+
+    def add(self, url: str, depth: int = 0) -> bool:
+        """
+        Метод для добавления URL адреса в границу обхода.
+        :param url: Абсолютный URL адрес.
+        :param depth: Глубина страницы.
+        :return: True, если URL адрес новый и укладывается в ограничения обхода.
+        """
+
+        if not self.allows(depth) or self.exhausted:
+            return False
+
+        url = normalize_url(url)
+        if url in self.__seen:
+            return False
+
+        self.__seen.add(url)
+        self.__admitted += 1
+        return True
+
+    def allows(self, depth: int) -> bool:
+        """
+        :param depth: Глубина страницы.
+        :return: True, если страницы такой глубины укладываются в ограничение обхода.
+        Страницу имеет смысл загружать, только если разрешена глубина ее ссылок.
+        """
+
+        return self.max_depth is None or depth <= self.max_depth
+
+    @property
+    def exhausted(self) -> bool:
+        return self.max_pages is not None and self.__admitted >= self.max_pages
+
+    def __contains__(self, url: object) -> bool:
+        return isinstance(url, str) and normalize_url(url) in self.__seen
+
+    def __len__(self) -> int:
+        return self.__admitted
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(admitted={self.__admitted})"
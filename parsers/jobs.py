@@ -0,0 +1,126 @@
+import asyncio
+import os
+import time
+from typing import NamedTuple
+from typing import Optional
+
+from parsers.data_parser import DataParser
+from parsers.resilience import FetchError
+from parsers.session import ParserSession
+from parsers.sinks import create_sink
+from parsers.url_parser import URLParser
+
+
+class Job(NamedTuple):
+    """
+    Задание на запись карточек товаров одной категории в отдельный файл.
+    """
+
+    category: str
+    filename: str
+    output_format: str = "csv"
+
+
+class JobResult(NamedTuple):
+    category: str
+    filename: str
+    rows: int
+    elapsed: float
+    error: Optional[str] = None
+
+    def __str__(self):
+        status = f"error: {self.error}" if self.error else f"{self.rows} rows"
+        return f"{self.category} -> {self.filename}: {status} ({self.elapsed:.2f} s)"
+
+
+def category_jobs(
+    categories: list[str], output_dir: str = ".", output_format: str = "csv"
+) -> list[Job]:
+    """
+    :param categories: Категории товара.
+    :param output_dir: Каталог для итоговых файлов.
+    :param output_format: Формат файлов: "csv", "jsonl" или "parquet".
+    :return: Задания вида "<output_dir>/<категория>_data_table".
+    """
+
+    return [
+        Job(category, os.path.join(output_dir, f"{category}_data_table"), output_format)
+        for category in categories
+    ]
+
+
+async def run_jobs(
+    session: ParserSession,
+    jobs: list[Job],
+    url_parser: Optional[URLParser] = None,
+    concurrency: int = 20,
+    resume: bool = False,
+) -> list[JobResult]:
+    """
+    Функция для одновременного выполнения нескольких заданий в одной сессии парсеров.
+    Все задания используют общий пул соединений, планировщик (общее ограничение запросов)
+    и один URLParser, поэтому стартовая страница магазина загружается один раз.
+    Ошибка одного задания не останавливает остальные, она сохраняется в JobResult.error.
+    После успешной записи CSV файла его контрольная точка удаляется.
+    :param session: Общая сессия парсеров.
+    :param jobs: Задания.
+    :param url_parser: Парсер URL адресов, например, с постоянным индексом URL адресов.
+    :param concurrency: Количество одновременно загружаемых карточек в каждом задании.
+    :param resume: Если флаг True, то CSV файлы дописываются с последней контрольной точки.
+    :return: Результаты заданий в порядке jobs.
+    """
+
+    url_parser = url_parser if url_parser is not None else URLParser(session)
+    data_parser = DataParser(session)
+
+    async def run_job(job: Job) -> JobResult:
+        start_time = time.perf_counter()
+        urls = url_parser.iter_url_for_each_product_card(
+            job.category, concurrency=concurrency
+        )
+
+        try:
+            if job.output_format == "csv":
+                from parsers.checkpoint import Checkpoint
+
+                checkpoint_path = f"{job.filename}.checkpoint.sqlite3"
+                checkpoint = Checkpoint(checkpoint_path)
+                try:
+                    rows = await data_parser.stream_csv(
+                        urls,
+                        job.filename,
+                        concurrency=concurrency,
+                        checkpoint=checkpoint,
+                        resume=resume,
+                    )
+                finally:
+                    checkpoint.close()
+                # Контрольная точка нужна только для возобновления прерванного задания.
+                os.remove(checkpoint_path)
+            else:
+                sink = create_sink(job.output_format, job.filename)
+                rows = await data_parser.stream_to_sink(
+                    urls, sink, concurrency=concurrency
+                )
+        except Exception as error:
+            # Ошибка одного задания, например, sqlite3.Error базы контрольных точек,
+            # не должна прерывать остальные задания.
+            message = (
+                str(error)
+                if isinstance(error, FetchError)
+                else f"{error.__class__.__name__}: {error}"
+            )
+            return JobResult(
+                job.category,
+                job.filename,
+                0,
+                time.perf_counter() - start_time,
+                message,
+            )
+
+        return JobResult(
+            job.category, job.filename, rows, time.perf_counter() - start_time
+        )
+
+    with session.metrics.stage("run_jobs"):
+        return list(await asyncio.gather(*map(run_job, jobs)))
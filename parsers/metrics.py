@@ -0,0 +1,419 @@
+import asyncio
+import bisect
+import json
+import os
+import time
+from contextlib import asynccontextmanager
+from contextlib import contextmanager
+from typing import Any
+from typing import AsyncIterator
+from typing import Callable
+from typing import Iterator
+from typing import Optional
+
+
+PROFILERS = ("cprofile", "pyinstrument")
+
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    300.0,
+)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class Histogram:
+    """
+    Гистограмма с фиксированными границами корзин, как в Prometheus.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def merge(self, other: "Histogram") -> None:
+        """
+        Метод для объединения гистограмм, например, собранных разными воркерами.
+        :param other: Гистограмма с такими же границами корзин.
+        :return: None.
+        """
+
+        if other.buckets != self.buckets:
+            raise ValueError("Histograms with different buckets cannot be merged.")
+
+        self.counts = [count + other.counts[i] for i, count in enumerate(self.counts)]
+        self.count += other.count
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def quantile(self, fraction: float) -> float:
+        """
+        :param fraction: Квантиль от 0 до 1.
+        :return: Оценка квантиля сверху: граница корзины, в которую он попадает.
+        """
+
+        rank = fraction * self.count
+        accumulated = 0
+        for bound, count in zip(self.buckets, self.counts):
+            accumulated += count
+            if accumulated >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else 0.0,
+            "p50": round(self.quantile(0.5), 6),
+            "p90": round(self.quantile(0.9), 6),
+            "p99": round(self.quantile(0.99), 6),
+            "max": round(self.max, 6),
+        }
+
+
+class Metrics:
+    """
+    Реестр метрик обхода: счетчики, гистограммы задержек и текущие значения (gauge),
+    например, количество запросов в работе и глубина очередей.
+    Метрики экспортируются в текстовом формате Prometheus (в том числе по HTTP) или в виде JSON сводки.
+    Для стадий обхода (stage) можно включить профилирование через cProfile или pyinstrument.
+    """
+
+    def __init__(
+        self,
+        namespace: str = "marketplace",
+        profiler: Optional[str] = None,
+        profile_dir: str = "profiles",
+    ) -> None:
+        """
+        :param namespace: Префикс названий метрик.
+        :param profiler: Профилировщик стадий: "cprofile", "pyinstrument" или None - без профилирования.
+        :param profile_dir: Папка для сохранения результатов профилирования.
+        """
+
+        if profiler is not None and profiler not in PROFILERS:
+            raise ValueError(
+                'The specified profiler "%s" is not one of %s.'
+                % (profiler, ", ".join(PROFILERS))
+            )
+
+        self.namespace = namespace
+        self.profiler = profiler
+        self.profile_dir = profile_dir
+        self.__counters: dict[str, dict[Labels, float]] = {}
+        self.__gauges: dict[str, dict[Labels, float]] = {}
+        self.__gauge_callbacks: dict[str, dict[Labels, Callable[[], float]]] = {}
+        self.__histograms: dict[str, dict[Labels, Histogram]] = {}
+        self.__profiling = False
+        self.__profiles_count = 0
+
+    @staticmethod
+    def __labels(labels: dict[str, Any]) -> Labels:
+        return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        """
+        Метод для увеличения счетчика.
+        :param name: Название метрики.
+        :param value: Величина увеличения.
+        :param labels: Метки метрики.
+        :return: None.
+        """
+
+        series = self.__counters.setdefault(name, {})
+        key = self.__labels(labels)
+        series[key] = series.get(key, 0) + value
+
+    def add(self, name: str, value: float, **labels: Any) -> None:
+        """
+        Метод для изменения текущего значения (gauge), например, количества запросов в работе.
+        :param name: Название метрики.
+        :param value: Величина изменения, может быть отрицательной.
+        :param labels: Метки метрики.
+        :return: None.
+        """
+
+        series = self.__gauges.setdefault(name, {})
+        key = self.__labels(labels)
+        series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """
+        Метод для добавления значения в гистограмму.
+        :param name: Название метрики.
+        :param value: Значение, например, задержка в секундах.
+        :param labels: Метки метрики.
+        :return: None.
+        """
+
+        series = self.__histograms.setdefault(name, {})
+        key = self.__labels(labels)
+        if key not in series:
+            series[key] = Histogram()
+        series[key].observe(value)
+
+    def register_gauge(
+        self, name: str, callback: Callable[[], float], **labels: Any
+    ) -> None:
+        """
+        Метод для регистрации gauge, значение которого вычисляется при экспорте,
+        например, глубины очереди.
+        :param name: Название метрики.
+        :param callback: Функция, возвращающая текущее значение.
+        :param labels: Метки метрики.
+        :return: None.
+        """
+
+        self.__gauge_callbacks.setdefault(name, {})[self.__labels(labels)] = callback
+
+    def unregister_gauge(self, name: str, **labels: Any) -> None:
+        self.__gauge_callbacks.get(name, {}).pop(self.__labels(labels), None)
+
+    @contextmanager
+    def timer(
+        self, name: str, in_flight: Optional[str] = None, **labels: Any
+    ) -> Iterator[None]:
+        """
+        Контекстный менеджер для измерения задержки участка кода.
+        :param name: Название гистограммы.
+        :param in_flight: Название gauge для количества выполняющихся в данный момент участков.
+        :param labels: Метки метрики.
+        """
+
+        if in_flight is not None:
+            self.add(in_flight, 1, **labels)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+            if in_flight is not None:
+                self.add(in_flight, -1, **labels)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Контекстный менеджер для стадии обхода (метода URLParser или DataParser).
+        Учитывается количество запусков, длительность и количество выполняющихся стадий.
+        Если задан профилировщик, то профилируется внешняя стадия: вложенные и параллельные
+        стадии попадают в ее профиль, так как все они выполняются в одном event loop.
+        :param name: Название стадии.
+        """
+
+        self.inc("stage_runs_total", stage=name)
+
+        if self.profiler is None or self.__profiling:
+            with self.timer("stage_duration_seconds", "stages_in_flight", stage=name):
+                yield
+            return
+
+        self.__profiling = True
+        try:
+            with self.__profile(name), self.timer(
+                "stage_duration_seconds", "stages_in_flight", stage=name
+            ):
+                yield
+        finally:
+            self.__profiling = False
+
+    @contextmanager
+    def __profile(self, name: str) -> Iterator[None]:
+        """
+        Результат профилирования сохраняется в profile_dir: {stage}_{номер}.prof для cProfile
+        (просмотр через snakeviz или pstats) и {stage}_{номер}.html для pyinstrument.
+        """
+
+        os.makedirs(self.profile_dir, exist_ok=True)
+        self.__profiles_count += 1
+        path = os.path.join(self.profile_dir, f"{name}_{self.__profiles_count}")
+
+        if self.profiler == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+            except ImportError as error:
+                raise ImportError(
+                    "Profiling with pyinstrument requires the pyinstrument package, "
+                    "install it with: poetry install -E profile"
+                ) from error
+
+            profiler = Profiler(async_mode="enabled")
+            profiler.start()
+            try:
+                yield
+            finally:
+                profiler.stop()
+                with open(f"{path}.html", "w", encoding="utf-8") as file:
+                    file.write(profiler.output_html())
+            return
+
+        import cProfile
+
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            profile.dump_stats(f"{path}.prof")
+
+    def __gauge_values(self) -> dict[str, dict[Labels, float]]:
+        gauges = {name: dict(series) for name, series in self.__gauges.items()}
+        for name, callbacks in self.__gauge_callbacks.items():
+            for labels, callback in callbacks.items():
+                gauges.setdefault(name, {})[labels] = callback()
+        return gauges
+
+    def __name(self, name: str) -> str:
+        return f"{self.namespace}_{name}" if self.namespace else name
+
+    @staticmethod
+    def __format_labels(labels: Labels, extra: Labels = ()) -> str:
+        pairs = (*labels, *extra)
+        if not pairs:
+            return ""
+
+        def escape(value: str) -> str:
+            return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+        return "{%s}" % ",".join(f'{key}="{escape(value)}"' for key, value in pairs)
+
+    def to_prometheus(self) -> str:
+        """
+        :return: Метрики в текстовом формате Prometheus (exposition format 0.0.4).
+        """
+
+        lines: list[str] = []
+
+        for name, series in sorted(self.__counters.items()):
+            full_name = self.__name(name)
+            lines.append(f"# TYPE {full_name} counter")
+            for labels, value in series.items():
+                lines.append(f"{full_name}{self.__format_labels(labels)} {value:g}")
+
+        for name, series in sorted(self.__gauge_values().items()):
+            full_name = self.__name(name)
+            lines.append(f"# TYPE {full_name} gauge")
+            for labels, value in series.items():
+                lines.append(f"{full_name}{self.__format_labels(labels)} {value:g}")
+
+        for name, histograms in sorted(self.__histograms.items()):
+            full_name = self.__name(name)
+            lines.append(f"# TYPE {full_name} histogram")
+            for labels, histogram in histograms.items():
+                accumulated = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    accumulated += count
+                    bucket_labels = self.__format_labels(
+                        labels, (("le", f"{bound:g}"),)
+                    )
+                    lines.append(f"{full_name}_bucket{bucket_labels} {accumulated}")
+                bucket_labels = self.__format_labels(labels, (("le", "+Inf"),))
+                lines.append(f"{full_name}_bucket{bucket_labels} {histogram.count}")
+                lines.append(
+                    f"{full_name}_sum{self.__format_labels(labels)} {histogram.sum:g}"
+                )
+                lines.append(
+                    f"{full_name}_count{self.__format_labels(labels)} {histogram.count}"
+                )
+
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        """
+        :return: Сводка метрик: счетчики, текущие значения и квантили гистограмм.
+        Ключ каждой серии - название метрики с метками, например, 'stage_runs_total{stage="write_csv"}'.
+        """
+
+        return {
+            "counters": {
+                name + self.__format_labels(labels): value
+                for name, series in sorted(self.__counters.items())
+                for labels, value in series.items()
+            },
+            "gauges": {
+                name + self.__format_labels(labels): value
+                for name, series in sorted(self.__gauge_values().items())
+                for labels, value in series.items()
+            },
+            "histograms": {
+                name + self.__format_labels(labels): histogram.summary()
+                for name, histograms in sorted(self.__histograms.items())
+                for labels, histogram in histograms.items()
+            },
+        }
+
+    def write_json(self, path: str = "metrics.json") -> None:
+        """
+        Метод для сохранения сводки метрик в JSON файл, например, в конце обхода.
+        :param path: Путь к файлу.
+        :return: None.
+        """
+
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.summary(), file, ensure_ascii=False, indent=2)
+
+    @asynccontextmanager
+    async def serve(
+        self, host: str = "127.0.0.1", port: int = 9100
+    ) -> AsyncIterator[str]:
+        """
+        Контекстный менеджер для запуска локального HTTP сервера, отдающего метрики
+        в формате Prometheus на любой GET запрос.
+        :param host: Адрес сервера.
+        :param port: Порт сервера, 0 - любой свободный.
+        :return: URL адрес метрик.
+        """
+
+        async def handle(
+            reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+        ) -> None:
+            try:
+                # Тело запроса не используется, достаточно дочитать заголовки.
+                while (await reader.readline()).strip():
+                    pass
+
+                body = self.to_prometheus().encode("utf-8")
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\n"
+                    b"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                    b"Content-Length: %d\r\n"
+                    b"Connection: close\r\n\r\n" % len(body) + body
+                )
+                await writer.drain()
+            finally:
+                writer.close()
+
+        server = await asyncio.start_server(handle, host, port)
+        try:
+            bound_port = server.sockets[0].getsockname()[1]
+            yield f"http://{host}:{bound_port}/metrics"
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(namespace={self.namespace!r})"
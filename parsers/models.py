@@ -0,0 +1,194 @@
+import sys
+from re import compile
+from typing import Any
+from typing import Iterable
+from typing import Optional
+from typing import Union
+
+
+_NUMBER = compile(r"\d+")
+
+# Общие схемы характеристик: каждый уникальный набор названий хранится в памяти один раз.
+_SCHEMAS: dict[tuple[str, ...], tuple[str, ...]] = {}
+
+
+def parse_int(text: Union[str, int, None]) -> Optional[int]:
+    """
+    Функция для получения числа из строк вида "1234 руб" или "В наличии: 5".
+    :param text: Текстовое значение поля.
+    :return: Первое целое число в строке или None, если числа нет.
+    """
+
+    if text is None or isinstance(text, int):
+        return text
+
+    number = _NUMBER.search(text)
+    return int(number.group()) if number else None
+
+
+def intern_schema(keys: Iterable[str]) -> tuple[str, ...]:
+    """
+    :param keys: Названия характеристик товара в порядке их следования в карточке.
+    :return: Общий для всех товаров с таким же набором характеристик кортеж названий.
+    """
+
+    schema = tuple(sys.intern(key) for key in keys)
+    return _SCHEMAS.setdefault(schema, schema)
+
+
+def union_schema(schemas: Iterable[tuple[str, ...]]) -> tuple[str, ...]:
+    """
+    Функция для объединения характеристик товаров разных категорий.
+    :param schemas: Схемы товаров, например, product.schema для каждого товара.
+    :return: Общая схема: названия характеристик в порядке их первого появления.
+    """
+
+    keys: dict[str, None] = {}
+    seen: set[int] = set()
+    for schema in schemas:
+        # Схемы интернированы, поэтому одинаковые схемы обрабатываются один раз.
+        if id(schema) not in seen:
+            seen.add(id(schema))
+            keys.update(dict.fromkeys(schema))
+    return intern_schema(keys)
+
+
+class Product:
+    """
+    Данные карточки товара (раздел "Подробнее").
+    Цены и остаток хранятся числами. Названия характеристик вынесены в общую схему (schema),
+    а сам товар хранит только кортеж значений характеристик в порядке схемы.
+    """
+
+    __slots__ = (
+        "title",
+        "article",
+        "schema",
+        "values",
+        "stock",
+        "price",
+        "old_price",
+        "url",
+    )
+
+    def __init__(
+        self,
+        title: str,
+        article: str,
+        description: Iterable[tuple[str, str]] = (),
+        stock: Union[str, int, None] = None,
+        price: Union[str, int, None] = None,
+        old_price: Union[str, int, None] = None,
+        url: str = "",
+    ) -> None:
+        """
+        :param title: Наименование товара.
+        :param article: Артикул товара.
+        :param description: Пары (характеристика, значение).
+        :param stock: Количество товара в наличии, число или текст вида "В наличии: 5".
+        :param price: Цена, число или текст вида "1234 руб".
+        :param old_price: Старая цена, число или текст вида "1234 руб".
+        :param url: URL адрес карточки товара.
+        """
+
+        pairs = tuple(description)
+        self.title = title
+        self.article = article
+        self.schema = intern_schema(key for key, _ in pairs)
+        self.values = tuple(value for _, value in pairs)
+        self.stock = parse_int(stock)
+        self.price = parse_int(price)
+        self.old_price = parse_int(old_price)
+        self.url = url
+
+    @property
+    def description(self) -> tuple[tuple[str, str], ...]:
+        """
+        :return: Пары (характеристика, значение).
+        """
+
+        return tuple(zip(self.schema, self.values))
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """
+        :param key: Название характеристики.
+        :param default: Значение, если у товара нет такой характеристики.
+        :return: Значение характеристики.
+        """
+
+        try:
+            return self.values[self.schema.index(key)]
+        except ValueError:
+            return default
+
+    def aligned_values(self, schema: tuple[str, ...]) -> tuple[Optional[str], ...]:
+        """
+        :param schema: Общая схема, например, результат union_schema.
+        :return: Значения характеристик в порядке schema, None для отсутствующих у товара.
+        """
+
+        if schema is self.schema:
+            return self.values
+        return tuple(self.get(key) for key in schema)
+
+    def astuple(self) -> tuple[Any, ...]:
+        """
+        :return: Поля товара в порядке аргументов конструктора, например, для сохранения в JSON.
+        """
+
+        return (
+            self.title,
+            self.article,
+            self.description,
+            self.stock,
+            self.price,
+            self.old_price,
+            self.url,
+        )
+
+    def to_record(self) -> dict[str, Any]:
+        """
+        :return: Запись для sinks: характеристики - словарь.
+        """
+
+        return {
+            "title": self.title,
+            "article": self.article,
+            "description": dict(zip(self.schema, self.values)),
+            "stock": self.stock,
+            "price": self.price,
+            "old_price": self.old_price,
+            "url": self.url,
+        }
+
+    @classmethod
+    def from_record(cls, record: dict[str, Any]) -> "Product":
+        """
+        :param record: Запись, полученная методом to_record, например, строка JSON Lines файла.
+        :return: Данные карточки товара.
+        """
+
+        return cls(
+            record["title"],
+            record["article"],
+            record["description"].items(),
+            record["stock"],
+            record["price"],
+            record["old_price"],
+            record["url"],
+        )
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Схема заново интернируется при распаковке в основном процессе
+        # после разбора в пуле процессов.
+        return self.__class__, self.astuple()
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Product):
+            return NotImplemented
+        return self.astuple() == other.astuple()
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(article={self.article!r}, title={self.title!r})"
+        )
@@ -0,0 +1,113 @@
+import asyncio
+import itertools
+from typing import Any
+from typing import AsyncIterable
+from typing import AsyncIterator
+from typing import Awaitable
+from typing import Callable
+from typing import Iterable
+from typing import Optional
+
+from parsers.metrics import Metrics
+
+# Номера вызовов stream_map: одноименные стадии, работающие одновременно, публикуют отдельные gauge.
+_RUN_IDS = itertools.count(1)
+
+
+class _Finished:
+    """
+    Маркер завершения стадии конвейера. Содержит исключение, если стадия завершилась с ошибкой.
+    """
+
+    def __init__(self, error: Optional[BaseException] = None) -> None:
+        self.error = error
+
+
+async def iterate(items: Iterable[Any]) -> AsyncIterator[Any]:
+    """
+    Функция для превращения обычной коллекции в источник для стадий конвейера.
+    :param items: Коллекция элементов.
+    :return: Асинхронный итератор по элементам.
+    """
+
+    for item in items:
+        yield item
+
+
+async def stream_map(
+    source: AsyncIterable[Any],
+    func: Callable[[Any], Awaitable[Any]],
+    concurrency: int = 20,
+    queue_size: int = 100,
+    flatten: bool = False,
+    metrics: Optional[Metrics] = None,
+    name: str = "stream_map",
+) -> AsyncIterator[Any]:
+    """
+    Стадия конвейера: элементы источника обрабатываются воркерами конкурентно,
+    результаты отдаются по мере готовности (порядок не сохраняется).
+    Очередь результатов ограничена, поэтому при медленном потребителе воркеры
+    останавливаются и не забирают новые элементы из источника (backpressure).
+    :param source: Асинхронный источник элементов.
+    :param func: Корутина для обработки одного элемента.
+    :param concurrency: Количество одновременно обрабатываемых элементов.
+    :param queue_size: Размер очереди готовых результатов.
+    :param flatten: Если флаг True, то func возвращает коллекцию, элементы которой отдаются по одному.
+    :param metrics: Реестр метрик, в котором публикуется глубина очереди результатов стадии.
+    :param name: Название стадии в метриках. Gauge дополнительно помечается номером вызова (run),
+    поэтому одноименные стадии не перезаписывают метрики друг друга.
+    :return: Асинхронный итератор по результатам.
+    """
+
+    results: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    iterator = source.__aiter__()
+    source_lock = asyncio.Lock()
+
+    async def worker() -> None:
+        while True:
+            # Асинхронный генератор нельзя продвигать из нескольких задач одновременно.
+            async with source_lock:
+                try:
+                    item = await iterator.__anext__()
+                except StopAsyncIteration:
+                    return
+
+            result = await func(item)
+            if flatten:
+                for each_result in result:
+                    await results.put(each_result)
+            else:
+                await results.put(result)
+
+    async def supervise(workers: list[asyncio.Task]) -> None:
+        try:
+            await asyncio.gather(*workers)
+        except Exception as error:
+            await results.put(_Finished(error))
+        else:
+            await results.put(_Finished())
+
+    run = next(_RUN_IDS)
+    if metrics is not None:
+        metrics.register_gauge(
+            "pipeline_queue_depth", results.qsize, stage=name, run=run
+        )
+
+    workers = [asyncio.create_task(worker()) for _ in range(max(concurrency, 1))]
+    supervisor = asyncio.create_task(supervise(workers))
+
+    try:
+        while True:
+            result = await results.get()
+            if isinstance(result, _Finished):
+                if result.error is not None:
+                    raise result.error
+                return
+            yield result
+
+    finally:
+        for task in (*workers, supervisor):
+            task.cancel()
+        await asyncio.gather(*workers, supervisor, return_exceptions=True)
+        if metrics is not None:
+            metrics.unregister_gauge("pipeline_queue_depth", stage=name, run=run)
@@ -0,0 +1,199 @@
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import NamedTuple
+from typing import Optional
+
+
+class FetchError(Exception):
+    """
+    Базовое исключение для URL адресов, которые не удалось загрузить.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        message: str,
+        status_code: Optional[int] = None,
+        attempts: int = 1,
+    ) -> None:
+        super().__init__(f"{message}: {url}")
+        self.url = url
+        self.message = message
+        self.status_code = status_code
+        self.attempts = attempts
+
+
+class BadStatusError(FetchError):
+    """
+    Сервер ответил кодом ошибки (4xx, 5xx).
+    """
+
+
+class CircuitOpenError(FetchError):
+    """
+    Запрос не отправлен, так как для хоста разомкнут автоматический выключатель.
+    """
+
+
+class CacheMissError(FetchError):
+    """
+    Исключение возникает в автономном режиме, если URL адреса нет в кэше.
+    """
+
+
+class ResponseTooLargeError(FetchError):
+    """
+    Тело ответа больше ParserSession.max_response_size, загрузка прервана.
+    """
+
+
+class DeadLetter(NamedTuple):
+    """
+    Запись о URL адресе, который не удалось загрузить после всех попыток.
+    """
+
+    url: str
+    error: str
+    message: str
+    status_code: Optional[int]
+    attempts: int
+
+    @classmethod
+    def from_error(cls, error: FetchError) -> "DeadLetter":
+        return cls(
+            url=error.url,
+            error=error.__class__.__name__,
+            message=error.message,
+            status_code=error.status_code,
+            attempts=error.attempts,
+        )
+
+
+class RetryPolicy:
+    """
+    Политика повторных запросов с экспоненциальной задержкой и случайным разбросом (full jitter).
+    Для ответов 429 и 503 учитывается заголовок Retry-After.
+    """
+
+    def __init__(
+        self,
+        attempts: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 10.0,
+        retry_statuses: tuple[int, ...] = (429, 500, 502, 503, 504),
+    ) -> None:
+        """
+        :param attempts: Максимальное количество попыток, включая первую.
+        :param backoff: Базовая задержка в секундах.
+        :param max_backoff: Максимальная задержка в секундах.
+        :param retry_statuses: Коды ответов, при которых запрос повторяется.
+        """
+
+        self.attempts = max(attempts, 1)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retry_statuses = retry_statuses
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        :param attempt: Номер неудачной попытки, начиная с 1.
+        :param retry_after: Задержка, указанная сервером в заголовке Retry-After.
+        :return: Время ожидания перед следующей попыткой в секундах.
+        """
+
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        return random.uniform(
+            0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        )
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """
+        :param value: Значение заголовка Retry-After: количество секунд или HTTP дата.
+        :return: Задержка в секундах или None, если заголовок отсутствует или некорректен.
+        """
+
+        if not value:
+            return None
+        if value.strip().isdigit():
+            return float(value)
+
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return None
+
+
+class CircuitBreaker:
+    """
+    Автоматический выключатель для одного хоста.
+    После failure_threshold ошибок подряд запросы к хосту не отправляются recovery_timeout секунд,
+    затем пропускается один пробный запрос (полуоткрытое состояние): при успехе выключатель замыкается,
+    при ошибке - снова размыкается на recovery_timeout секунд. Пока результат пробного запроса неизвестен,
+    остальные запросы не отправляются. Если результат не записан за recovery_timeout секунд,
+    то пропускается следующий пробный запрос.
+    """
+
+    def __init__(
+        self, failure_threshold: int = 5, recovery_timeout: float = 30.0
+    ) -> None:
+        """
+        :param failure_threshold: Количество ошибок подряд, после которого выключатель размыкается.
+        :param recovery_timeout: Время в секундах до пробного запроса.
+        """
+
+        self.__failure_threshold = failure_threshold
+        self.__recovery_timeout = recovery_timeout
+        self.__failures = 0
+        self.__opened_at: Optional[float] = None
+        self.__trial = False
+
+    @property
+    def is_open(self) -> bool:
+        return (
+            self.__opened_at is not None
+            and time.monotonic() - self.__opened_at < self.__recovery_timeout
+        )
+
+    def allow_request(self) -> bool:
+        """
+        Метод необходимо вызывать перед каждым запросом к хосту.
+        :return: True, если выключатель замкнут или запрос пропускается как пробный.
+        """
+
+        if self.__opened_at is None:
+            return True
+        if self.is_open:
+            return False
+
+        # Пробный запрос: до его результата выключатель снова считается разомкнутым.
+        self.__opened_at = time.monotonic()
+        self.__trial = True
+        return True
+
+    def record_success(self) -> None:
+        self.__failures = 0
+        self.__opened_at = None
+        self.__trial = False
+
+    def record_failure(self) -> None:
+        self.__failures += 1
+        self.__trial = False
+        if self.__failures >= self.__failure_threshold:
+            self.__opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """
+        Метод освобождает пробный запрос, завершившийся без результата (например, отмененный):
+        следующий запрос к хосту будет пропущен как пробный без ожидания recovery_timeout.
+        :return: None.
+        """
+
+        if self.__trial:
+            self.__trial = False
+            self.__opened_at = time.monotonic() - self.__recovery_timeout
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(open={self.is_open})"
@@ -0,0 +1,204 @@
+import asyncio
+import itertools
+import time
+from enum import IntEnum
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Optional
+
+from httpx import URL
+
+
+class Priority(IntEnum):
+    """
+    Приоритет запроса в очереди планировщика.
+    Чем меньше значение, тем раньше запрос будет отправлен.
+    """
+
+    CATEGORY = 0
+    LISTING = 1
+    PRODUCT = 2
+
+
+class TokenBucket:
+    """
+    Ограничитель частоты запросов по алгоритму "token bucket".
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        """
+        :param rate: Количество запросов в секунду.
+        :param burst: Максимальное количество запросов, которое можно отправить подряд.
+        """
+
+        self.__rate = rate
+        self.__capacity = float(max(burst, 1))
+        self.__tokens = self.__capacity
+        self.__updated_at = time.monotonic()
+        self.__lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """
+        Метод ожидает, пока в корзине не появится свободный токен, и забирает его.
+        :return: None.
+        """
+
+        async with self.__lock:
+            while True:
+                now = time.monotonic()
+                self.__tokens = min(
+                    self.__capacity,
+                    self.__tokens + (now - self.__updated_at) * self.__rate,
+                )
+                self.__updated_at = now
+
+                if self.__tokens >= 1:
+                    self.__tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self.__tokens) / self.__rate)
+
+
+class CrawlScheduler:
+    """
+    Центральный планировщик запросов.
+    Запросы попадают в очередь с приоритетами и выполняются пулом воркеров,
+    количество которых ограничивает общее число одновременных запросов.
+    Дополнительно ограничивается количество одновременных запросов и их частота для каждого хоста.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Awaitable[Any]],
+        workers: int = 20,
+        max_requests_per_host: int = 10,
+        rate_limit: Optional[float] = None,
+        burst: int = 1,
+    ) -> None:
+        """
+        :param fetch: Корутина, выполняющая запрос по URL адресу.
+        :param workers: Количество воркеров (общее ограничение одновременных запросов).
+        :param max_requests_per_host: Максимальное количество одновременных запросов к одному хосту.
+        :param rate_limit: Максимальное количество запросов в секунду к одному хосту, None - без ограничений.
+        :param burst: Количество запросов, которое можно отправить подряд без ожидания.
+        """
+
+        self.__fetch = fetch
+        self.__workers_count = workers
+        self.__max_requests_per_host = max_requests_per_host
+        self.__rate_limit = rate_limit
+        self.__burst = burst
+
+        self.__queue: Optional[asyncio.PriorityQueue] = None
+        self.__workers: list[asyncio.Task] = []
+        self.__counter = itertools.count()
+        self.__host_limits: dict[str, asyncio.Semaphore] = {}
+        self.__host_buckets: dict[str, TokenBucket] = {}
+
+    @property
+    def pending(self) -> int:
+        """
+        :return: Количество запросов, ожидающих в очереди.
+        """
+
+        return self.__queue.qsize() if self.__queue is not None else 0
+
+    async def submit(self, target_url: str, priority: int = Priority.PRODUCT) -> Any:
+        """
+        Метод для постановки запроса в очередь и ожидания его результата.
+        :param target_url: URL адрес запроса.
+        :param priority: Приоритет запроса.
+        :return: Результат выполнения fetch для указанного URL адреса.
+        """
+
+        self.__start()
+        assert self.__queue is not None
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        await self.__queue.put((priority, next(self.__counter), target_url, future))
+        return await future
+
+    async def aclose(self) -> None:
+        """
+        Метод для остановки воркеров. Невыполненные запросы отменяются.
+        :return: None.
+        """
+
+        for worker in self.__workers:
+            worker.cancel()
+        await asyncio.gather(*self.__workers, return_exceptions=True)
+        self.__workers.clear()
+
+        while self.__queue is not None and not self.__queue.empty():
+            *_, future = self.__queue.get_nowait()
+            future.cancel()
+        self.__queue = None
+
+        self.__host_limits.clear()
+        self.__host_buckets.clear()
+
+    def __start(self) -> None:
+        """
+        Воркеры запускаются при первом запросе, так как им нужен работающий event loop.
+        :return: None.
+        """
+
+        if self.__workers:
+            return
+
+        self.__queue = asyncio.PriorityQueue()
+        self.__workers = [
+            asyncio.create_task(self.__worker()) for _ in range(self.__workers_count)
+        ]
+
+    async def __worker(self) -> None:
+        """
+        Воркер забирает из очереди запрос с наивысшим приоритетом и выполняет его
+        с учетом ограничений для хоста.
+        :return: None.
+        """
+
+        assert self.__queue is not None
+
+        while True:
+            _, _, target_url, future = await self.__queue.get()
+            try:
+                if future.cancelled():
+                    continue
+
+                host = URL(target_url).host
+                async with self.__host_limit(host):
+                    if self.__rate_limit is not None:
+                        await self.__host_bucket(host).acquire()
+                    result = await self.__fetch(target_url)
+
+                if not future.cancelled():
+                    future.set_result(result)
+
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.cancel()
+                raise
+
+            except Exception as error:
+                if not future.cancelled():
+                    future.set_exception(error)
+
+            finally:
+                self.__queue.task_done()
+
+    def __host_limit(self, host: str) -> asyncio.Semaphore:
+        if host not in self.__host_limits:
+            self.__host_limits[host] = asyncio.Semaphore(self.__max_requests_per_host)
+        return self.__host_limits[host]
+
+    def __host_bucket(self, host: str) -> TokenBucket:
+        assert self.__rate_limit is not None
+
+        if host not in self.__host_buckets:
+            self.__host_buckets[host] = TokenBucket(self.__rate_limit, self.__burst)
+        return self.__host_buckets[host]
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(workers={self.__workers_count})"
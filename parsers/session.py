@@ -0,0 +1,422 @@
+import asyncio
+from importlib.util import find_spec
+from types import TracebackType
+from typing import Optional
+from typing import Type
+from typing import TYPE_CHECKING
+
+from httpx import AsyncBaseTransport
+from httpx import AsyncClient
+from httpx import Limits
+from httpx import Response
+from httpx import TransportError
+from httpx import URL
+
+from parsers.executor import ParsingExecutor
+from parsers.metrics import Metrics
+from parsers.resilience import BadStatusError
+from parsers.resilience import CacheMissError
+from parsers.resilience import CircuitBreaker
+from parsers.resilience import CircuitOpenError
+from parsers.resilience import DeadLetter
+from parsers.resilience import FetchError
+from parsers.resilience import ResponseTooLargeError
+from parsers.resilience import RetryPolicy
+from parsers.scheduler import CrawlScheduler
+from parsers.scheduler import Priority
+
+if TYPE_CHECKING:
+    from parsers.cache import CachedResponse
+    from parsers.cache import ResponseCache
+
+
+class ParserSession:
+    """
+    Сессия парсера, владеющая единым пулом HTTP соединений.
+    Один экземпляр разделяется между URLParser и DataParser, поэтому TCP/TLS соединения
+    переиспользуются (keep-alive), а не открываются заново для каждого URL адреса.
+    Все запросы проходят через общий планировщик (CrawlScheduler), который ограничивает
+    количество одновременных запросов и их частоту.
+    Разбор HTML разметки выполняется общим исполнителем (ParsingExecutor) вне event loop.
+    При наличии кэша (ResponseCache) свежие ответы отдаются без обращения к серверу.
+    Неудачные запросы повторяются согласно RetryPolicy, для каждого хоста работает CircuitBreaker.
+    URL адреса, которые не удалось загрузить, собираются в dead_letters.
+    Тело ответа читается потоково, загрузка прерывается при превышении max_response_size.
+    Соединения закрываются при выходе из асинхронного контекстного менеджера.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        max_connections_per_host: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        timeout: float = 4,
+        workers: int = 20,
+        rate_limit: Optional[float] = None,
+        burst: int = 1,
+        transport: Optional[AsyncBaseTransport] = None,
+        executor: Optional[ParsingExecutor] = None,
+        cache: Optional["ResponseCache"] = None,
+        retry: Optional[RetryPolicy] = None,
+        circuit_breaker_threshold: int = 5,
+        circuit_breaker_timeout: float = 30.0,
+        hedge_after: Optional[float] = None,
+        metrics: Optional[Metrics] = None,
+        max_response_size: Optional[int] = 10 * 1024 * 1024,
+    ) -> None:
+        """
+        :param max_connections: Максимальное количество одновременно открытых соединений.
+        :param max_keepalive_connections: Количество соединений, удерживаемых в пуле.
+        :param max_connections_per_host: Максимальное количество одновременных запросов к одному хосту.
+        :param keepalive_expiry: Время жизни простаивающего соединения в секундах.
+        :param http2: Использовать HTTP/2, если установлен пакет h2.
+        :param timeout: Таймаут запроса в секундах.
+        :param workers: Количество воркеров планировщика (общее ограничение одновременных запросов).
+        :param rate_limit: Максимальное количество запросов в секунду к одному хосту, None - без ограничений.
+        :param burst: Количество запросов к хосту, которое можно отправить подряд без ожидания.
+        :param transport: Транспорт httpx, например, локальная заглушка сервера для тестов.
+        :param executor: Исполнитель для разбора HTML разметки, по умолчанию пул процессов.
+        :param cache: Постоянный кэш HTTP ответов, по умолчанию не используется.
+        :param retry: Политика повторных запросов, по умолчанию 3 попытки.
+        :param circuit_breaker_threshold: Количество ошибок подряд, после которого запросы к хосту приостанавливаются.
+        :param circuit_breaker_timeout: Время в секундах, на которое приостанавливаются запросы к хосту.
+        :param hedge_after: Если запрос не завершился за указанное время в секундах,
+        то отправляется дублирующий запрос и используется первый полученный ответ. None - не дублировать.
+        :param metrics: Реестр метрик, по умолчанию создается новый.
+        :param max_response_size: Максимальный размер тела ответа в байтах, None - без ограничений.
+        Ответы большего размера не загружаются до конца и не повторяются.
+        """
+
+        self.__limits = Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.__http2 = http2 and find_spec("h2") is not None
+        self.__timeout = timeout
+        self.__transport = transport
+        self.__client: Optional[AsyncClient] = None
+        self.__executor = executor if executor is not None else ParsingExecutor()
+        self.__cache = cache
+        # Устаревшие записи кэша для запросов в работе, по ним отправляются условные запросы.
+        self.__stale: dict[str, "CachedResponse"] = {}
+        self.__retry = retry if retry is not None else RetryPolicy()
+        self.__circuit_breaker_threshold = circuit_breaker_threshold
+        self.__circuit_breaker_timeout = circuit_breaker_timeout
+        self.__circuit_breakers: dict[str, CircuitBreaker] = {}
+        self.__hedge_after = hedge_after
+        self.max_response_size = max_response_size
+        self.dead_letters: list[DeadLetter] = []
+        self.__metrics = metrics if metrics is not None else Metrics()
+        self.__scheduler = CrawlScheduler(
+            self.__fetch,
+            workers=workers,
+            max_requests_per_host=max_connections_per_host,
+            rate_limit=rate_limit,
+            burst=burst,
+        )
+        self.__metrics.register_gauge("scheduler_queue_depth", self.__scheduler_pending)
+
+    @property
+    def client(self) -> AsyncClient:
+        """
+        Пул соединений создается при первом обращении.
+        :return: Общий для всех парсеров HTTP клиент.
+        """
+
+        if self.__client is None or self.__client.is_closed:
+            self.__client = AsyncClient(
+                http2=self.__http2,
+                limits=self.__limits,
+                timeout=self.__timeout,
+                transport=self.__transport,
+            )
+        return self.__client
+
+    @property
+    def is_closed(self) -> bool:
+        return self.__client is None or self.__client.is_closed
+
+    @property
+    def scheduler(self) -> CrawlScheduler:
+        return self.__scheduler
+
+    @property
+    def executor(self) -> ParsingExecutor:
+        return self.__executor
+
+    @property
+    def cache(self) -> Optional["ResponseCache"]:
+        return self.__cache
+
+    @property
+    def metrics(self) -> Metrics:
+        return self.__metrics
+
+    async def get(self, target_url: str, priority: int = Priority.PRODUCT) -> Response:
+        """
+        Метод для отправки GET запроса через планировщик и общий пул соединений.
+        Свежие ответы из кэша отдаются сразу, минуя планировщик.
+        Ошибки сети и ответы с кодами из RetryPolicy.retry_statuses повторяются, ожидание
+        между попытками происходит вне планировщика, чтобы не занимать его воркеры.
+        :param target_url: URL адрес запроса.
+        :param priority: Приоритет запроса в очереди планировщика.
+        :return: Объект успешного ответа httpx.
+        :raises FetchError: Если страницу не удалось загрузить, URL адрес добавляется в dead_letters.
+        """
+
+        try:
+            return await self.__get(target_url, priority)
+        except FetchError as error:
+            self.dead_letters.append(DeadLetter.from_error(error))
+            self.metrics.inc("dead_letters_total", error=error.__class__.__name__)
+            raise
+
+    async def __get(self, target_url: str, priority: int) -> Response:
+
+        if self.cache is None:
+            return await self.__send(target_url, priority)
+
+        cached = self.cache.get(target_url)
+
+        if cached is not None and (self.cache.offline or self.cache.is_fresh(cached)):
+            self.metrics.inc("cache_hits_total", result="fresh")
+            return cached.to_response()
+
+        if self.cache.offline:
+            raise CacheMissError(
+                target_url, "The URL is not cached and the cache is in offline mode"
+            )
+
+        if cached is None:
+            return await self.__send(target_url, priority)
+
+        # Устаревшая запись передается в __request, чтобы не читать ее из кэша повторно.
+        self.__stale[target_url] = cached
+        try:
+            return await self.__send(target_url, priority)
+        finally:
+            self.__stale.pop(target_url, None)
+
+    async def __send(self, target_url: str, priority: int) -> Response:
+        """
+        Метод для отправки запроса через планировщик с повторами и автоматическим выключателем хоста.
+        :param target_url: URL адрес запроса.
+        :param priority: Приоритет запроса в очереди планировщика.
+        :return: Объект успешного ответа httpx.
+        """
+
+        circuit_breaker = self.__circuit_breaker(URL(target_url).host)
+        attempt = 0
+
+        while True:
+            attempt += 1
+            retry_after: Optional[float] = None
+
+            if not circuit_breaker.allow_request():
+                raise CircuitOpenError(
+                    target_url, "Requests to the host are suspended", attempts=attempt
+                )
+
+            try:
+                response: Response = await self.scheduler.submit(target_url, priority)
+
+            except TransportError as error:
+                circuit_breaker.record_failure()
+                failure: FetchError = FetchError(
+                    target_url, f"{error.__class__.__name__} {error}", attempts=attempt
+                )
+
+            except ResponseTooLargeError:
+                # Сервер ответил, поэтому хост считается доступным.
+                circuit_breaker.record_success()
+                raise
+
+            except BaseException:
+                circuit_breaker.release()
+                raise
+
+            else:
+                if response.is_success:
+                    circuit_breaker.record_success()
+                    return response
+
+                failure = BadStatusError(
+                    target_url,
+                    f"HTTP {response.status_code}",
+                    status_code=response.status_code,
+                    attempts=attempt,
+                )
+                if response.status_code not in self.__retry.retry_statuses:
+                    circuit_breaker.record_success()
+                    raise failure
+
+                circuit_breaker.record_failure()
+                retry_after = self.__retry.parse_retry_after(
+                    response.headers.get("Retry-After")
+                )
+
+            if attempt >= self.__retry.attempts:
+                raise failure
+
+            self.metrics.inc("http_retries_total")
+            await asyncio.sleep(self.__retry.delay(attempt, retry_after))
+
+    async def __fetch(self, target_url: str) -> Response:
+        """
+        Метод выполняется воркером планировщика. Если задан hedge_after и ответ не получен
+        за это время, то отправляется дублирующий запрос, используется первый успешный ответ.
+        :param target_url: URL адрес запроса.
+        :return: Объект ответа httpx.
+        """
+
+        if self.__hedge_after is None:
+            return await self.__request(target_url)
+
+        requests = {asyncio.ensure_future(self.__request(target_url))}
+        done, _ = await asyncio.wait(requests, timeout=self.__hedge_after)
+        if not done:
+            requests.add(asyncio.ensure_future(self.__request(target_url)))
+
+        try:
+            while True:
+                done, pending = await asyncio.wait(
+                    requests, return_when=asyncio.FIRST_COMPLETED
+                )
+                for request in done:
+                    if request.exception() is None or not pending:
+                        return request.result()
+                requests = pending
+        finally:
+            for request in requests:
+                request.cancel()
+
+    async def __request(self, target_url: str) -> Response:
+        """
+        Метод для отправки одного запроса. Если для URL адреса есть устаревшая
+        запись в кэше, то отправляется условный запрос, и при ответе 304 возвращается запись из кэша.
+        :param target_url: URL адрес запроса.
+        :return: Объект ответа httpx.
+        """
+
+        cached = self.__stale.get(target_url)
+        headers = (
+            self.cache.revalidation_headers(cached) if self.cache is not None else {}
+        )
+
+        with self.metrics.timer(
+            "http_request_duration_seconds", "http_requests_in_flight"
+        ):
+            try:
+                async with self.client.stream(
+                    "GET", target_url, headers=headers
+                ) as stream:
+                    response = await self.__read(target_url, stream)
+            except (TransportError, ResponseTooLargeError) as error:
+                self.metrics.inc("http_requests_total", status=error.__class__.__name__)
+                raise
+
+        self.metrics.inc("http_requests_total", status=response.status_code)
+        self.metrics.inc("http_response_bytes_total", len(response.content))
+
+        if self.cache is None:
+            return response
+
+        if response.status_code == 304 and cached is not None:
+            self.metrics.inc("cache_hits_total", result="revalidated")
+            self.cache.refresh(target_url)
+            return cached.to_response()
+
+        if response.status_code == 200:
+            self.cache.store(target_url, response)
+
+        return response
+
+    async def __read(self, target_url: str, stream: Response) -> Response:
+        """
+        Метод для потокового чтения тела ответа. Размер проверяется по заголовку Content-Length
+        до загрузки и по каждому полученному фрагменту, поэтому в памяти не оказывается
+        больше max_response_size байт одного ответа.
+        :param target_url: URL адрес запроса.
+        :param stream: Ответ httpx, тело которого еще не прочитано.
+        :return: Ответ httpx с прочитанным и распакованным телом.
+        :raises ResponseTooLargeError: Если тело ответа больше max_response_size.
+        """
+
+        limit = self.max_response_size
+        declared = stream.headers.get("Content-Length", "")
+        if limit is not None and declared.isdigit() and int(declared) > limit:
+            raise ResponseTooLargeError(
+                target_url,
+                f"The response body size {declared} exceeds {limit} bytes",
+                status_code=stream.status_code,
+            )
+
+        chunks = []
+        size = 0
+        async for chunk in stream.aiter_bytes():
+            size += len(chunk)
+            if limit is not None and size > limit:
+                raise ResponseTooLargeError(
+                    target_url,
+                    f"The response body exceeds {limit} bytes",
+                    status_code=stream.status_code,
+                )
+            chunks.append(chunk)
+
+        # Тело уже распаковано, поэтому заголовки кодирования и длины сжатого тела не переносятся.
+        headers = [
+            (name, value)
+            for name, value in stream.headers.multi_items()
+            if name.lower()
+            not in ("content-encoding", "content-length", "transfer-encoding")
+        ]
+        return Response(
+            stream.status_code,
+            headers=headers,
+            content=b"".join(chunks),
+            request=stream.request,
+            extensions=stream.extensions,
+        )
+
+    def __scheduler_pending(self) -> float:
+        return self.scheduler.pending
+
+    def __circuit_breaker(self, host: str) -> CircuitBreaker:
+        if host not in self.__circuit_breakers:
+            self.__circuit_breakers[host] = CircuitBreaker(
+                self.__circuit_breaker_threshold, self.__circuit_breaker_timeout
+            )
+        return self.__circuit_breakers[host]
+
+    async def aclose(self) -> None:
+        """
+        Метод для закрытия всех соединений пула.
+        :return: None.
+        """
+
+        await self.scheduler.aclose()
+        self.executor.shutdown()
+
+        if self.cache is not None:
+            self.cache.close()
+
+        if self.__client is not None:
+            await self.__client.aclose()
+            self.__client = None
+
+    async def __aenter__(self) -> "ParserSession":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        await self.aclose()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(http2={self.__http2})"
@@ -0,0 +1,284 @@
+import csv
+import json
+import os
+from abc import ABC
+from abc import abstractmethod
+from types import TracebackType
+from typing import Any
+from typing import Iterable
+from typing import Optional
+from typing import Type
+
+from parsers.models import Product
+
+# Заголовки CSV таблицы с карточками товаров и соответствующие им поля записи товара.
+# Колонки характеристик располагаются между первыми CARD_COLUMNS_BEFORE колонками и остальными.
+CSV_COLUMNS = {
+    "Наименование": "title",
+    "Артикул": "article",
+    "Наличие": "stock",
+    "Цена": "price",
+    "Старая цена": "old_price",
+    "Ссылка на карточку с товаром": "url",
+}
+CARD_COLUMNS_BEFORE = 2
+CARD_COLUMNS_AFTER = len(CSV_COLUMNS) - CARD_COLUMNS_BEFORE
+
+
+def card_headers(description_headers: Iterable[str]) -> list[str]:
+    """
+    :param description_headers: Названия характеристик товара.
+    :return: Полный список заголовков таблицы с карточками товаров.
+    """
+
+    headers = list(CSV_COLUMNS)
+    return [
+        *headers[:CARD_COLUMNS_BEFORE],
+        *description_headers,
+        *headers[CARD_COLUMNS_BEFORE:],
+    ]
+
+
+def widen_csv(
+    filename: str,
+    description_count: int,
+    headers: Optional[list[str]] = None,
+    delimiter: str = ";",
+) -> None:
+    """
+    Функция для выравнивания потоковой CSV таблицы после появления новых характеристик.
+    Новые характеристики добавляются в конец блока характеристик, поэтому строки, записанные раньше,
+    дополняются пустыми значениями. Файл перезаписывается построчно, не загружаясь в память целиком.
+    :param filename: Путь к CSV файлу.
+    :param description_count: Итоговое количество колонок с характеристиками.
+    :param headers: Итоговые заголовки, если первая строка файла содержит заголовки.
+    :param delimiter: Разделитель колонок.
+    :return: None.
+    """
+
+    widened_filename = f"{filename}.tmp"
+    with open(filename, encoding="utf-8-sig", newline="") as source, open(
+        widened_filename, "w", encoding="utf-8-sig", newline=""
+    ) as target:
+        reader = csv.reader(source, delimiter=delimiter)
+        writer = csv.writer(target, delimiter=delimiter)
+
+        if headers is not None:
+            next(reader, None)
+            writer.writerow(headers)
+
+        for row in reader:
+            split_at = len(row) - CARD_COLUMNS_AFTER
+            missing = description_count - (split_at - CARD_COLUMNS_BEFORE)
+            writer.writerow([*row[:split_at], *[""] * missing, *row[split_at:]])
+
+    os.replace(widened_filename, filename)
+
+
+class Sink(ABC):
+    """
+    Базовый класс для записи карточек товаров в файл.
+    Товары накапливаются в буфере и сбрасываются в файл пачками по batch_size строк,
+    записи с типизированными полями (характеристики - словарь) создаются только при сбросе.
+    """
+
+    extension: str = ""
+
+    def __init__(self, filename: str, batch_size: int = 1000) -> None:
+        """
+        :param filename: Название итогового файла без расширения.
+        :param batch_size: Количество строк в одной пачке (группе строк для Parquet).
+        """
+
+        self.filename = f"{filename}.{self.extension}"
+        self.batch_size = max(batch_size, 1)
+        self.rows_count = 0
+        self.__buffer: list[Product] = []
+
+    def write(self, product: Product) -> None:
+        """
+        Метод для добавления карточки товара в буфер.
+        :param product: Данные карточки товара.
+        :return: None.
+        """
+
+        self.__buffer.append(product)
+        if len(self.__buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Метод для записи накопленных строк в файл.
+        :return: None.
+        """
+
+        if self.__buffer:
+            self._write_batch([product.to_record() for product in self.__buffer])
+            self.rows_count += len(self.__buffer)
+            self.__buffer = []
+
+    def close(self) -> None:
+        self.flush()
+        self._close()
+
+    @abstractmethod
+    def _write_batch(self, records: list[dict[str, Any]]) -> None:
+        pass
+
+    @abstractmethod
+    def _close(self) -> None:
+        pass
+
+    def __enter__(self) -> "Sink":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.filename!r})"
+
+
+class CsvSink(Sink):
+    """
+    Запись в CSV с разделителем ";". Колонки характеристик - объединение характеристик всех карточек,
+    значения выравниваются по названию характеристики.
+    """
+
+    extension = "csv"
+
+    def __init__(self, filename: str, batch_size: int = 1000) -> None:
+        super().__init__(filename, batch_size)
+        self.__file = open(self.filename, "w", encoding="utf-8-sig", newline="")
+        self.__writer = csv.writer(self.__file, delimiter=";")
+        self.__description_keys: dict[str, None] = {}
+        self.__widened = False
+
+    def __headers(self) -> list[str]:
+        return card_headers(self.__description_keys)
+
+    def _write_batch(self, records: list[dict[str, Any]]) -> None:
+        known_keys = len(self.__description_keys)
+        for record in records:
+            self.__description_keys.update(dict.fromkeys(record["description"]))
+
+        if not self.rows_count:
+            self.__writer.writerow(self.__headers())
+        elif len(self.__description_keys) > known_keys:
+            self.__widened = True
+
+        fields = list(CSV_COLUMNS.values())
+        for record in records:
+            self.__writer.writerow(
+                [
+                    *[record[field] for field in fields[:CARD_COLUMNS_BEFORE]],
+                    *[
+                        record["description"].get(key)
+                        for key in self.__description_keys
+                    ],
+                    *[record[field] for field in fields[CARD_COLUMNS_BEFORE:]],
+                ]
+            )
+        self.__file.flush()
+
+    def _close(self) -> None:
+        self.__file.close()
+        if self.__widened:
+            widen_csv(self.filename, len(self.__description_keys), self.__headers())
+
+
+class JsonLinesSink(Sink):
+    """
+    Запись в формат JSON Lines: один JSON объект на строку.
+    """
+
+    extension = "jsonl"
+
+    def __init__(self, filename: str, batch_size: int = 1000) -> None:
+        super().__init__(filename, batch_size)
+        self.__file = open(self.filename, "w", encoding="utf-8")
+
+    def _write_batch(self, records: list[dict[str, Any]]) -> None:
+        self.__file.writelines(
+            json.dumps(record, ensure_ascii=False) + "\n" for record in records
+        )
+        self.__file.flush()
+
+    def _close(self) -> None:
+        self.__file.close()
+
+
+class ParquetSink(Sink):
+    """
+    Запись в формат Parquet, каждая пачка записывается отдельной группой строк.
+    Требует установленного пакета pyarrow.
+    """
+
+    extension = "parquet"
+
+    def __init__(self, filename: str, batch_size: int = 1000) -> None:
+        super().__init__(filename, batch_size)
+
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as error:
+            raise ImportError(
+                "Parquet output requires pyarrow, install it with: poetry install -E parquet"
+            ) from error
+
+        self.__pyarrow = pyarrow
+        self.__schema = pyarrow.schema(
+            [
+                ("title", pyarrow.string()),
+                ("article", pyarrow.string()),
+                ("description", pyarrow.map_(pyarrow.string(), pyarrow.string())),
+                ("stock", pyarrow.int64()),
+                ("price", pyarrow.int64()),
+                ("old_price", pyarrow.int64()),
+                ("url", pyarrow.string()),
+            ]
+        )
+        self.__writer = pyarrow.parquet.ParquetWriter(self.filename, self.__schema)
+
+    def _write_batch(self, records: list[dict[str, Any]]) -> None:
+        columns = {
+            name: [record[name] for record in records] for name in self.__schema.names
+        }
+        columns["description"] = [
+            list(value.items()) for value in columns["description"]
+        ]
+        self.__writer.write_table(
+            self.__pyarrow.Table.from_pydict(columns, schema=self.__schema)
+        )
+
+    def _close(self) -> None:
+        self.__writer.close()
+
+
+SINKS: dict[str, Type[Sink]] = {
+    "csv": CsvSink,
+    "jsonl": JsonLinesSink,
+    "parquet": ParquetSink,
+}
+
+
+def create_sink(output_format: str, filename: str, batch_size: int = 1000) -> Sink:
+    """
+    :param output_format: Формат файла: "csv", "jsonl" или "parquet".
+    :param filename: Название итогового файла без расширения.
+    :param batch_size: Количество строк в одной пачке.
+    :return: Объект для записи карточек товаров.
+    """
+
+    if output_format not in SINKS:
+        raise ValueError(
+            'The specified output format "%s" is not one of %s.'
+            % (output_format, ", ".join(SINKS))
+        )
+    return SINKS[output_format](filename, batch_size)
@@ -0,0 +1,244 @@
+import json
+import sqlite3
+import time
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+from typing import NamedTuple
+from typing import Optional
+
+from parsers.models import Product
+
+
+# Отслеживаемые поля товара в порядке колонок таблицы items.
+TRACKED_FIELDS = ("price", "old_price", "stock")
+
+# Поля события, которые записываются в JSON помимо event, article и url.
+_EVENT_FIELDS = {"added": ("new",), "removed": ("old",)}
+
+
+class ChangeEvent(NamedTuple):
+    """
+    Событие изменения каталога между двумя снимками:
+    added / removed - товар появился или исчез (в new / old - его цены и остаток),
+    changed - изменилось поле field.
+    """
+
+    event: str
+    article: str
+    url: str
+    field: Optional[str] = None
+    old: Any = None
+    new: Any = None
+
+    def to_json(self) -> str:
+        """
+        :return: Компактная JSON строка. Для changed всегда записываются field, old и new,
+        в том числе null, если значение поля исчезло или появилось.
+        """
+
+        data = {"event": self.event, "article": self.article, "url": self.url}
+        for key in _EVENT_FIELDS.get(self.event, ("field", "old", "new")):
+            data[key] = getattr(self, key)
+        return json.dumps(data, ensure_ascii=False)
+
+
+class SnapshotStore:
+    """
+    Хранилище снимков каталога в базе SQLite: для каждого снимка по артикулу хранятся
+    цена, старая цена и остаток товара. Снимки сравниваются методом diff.
+    Снимок считается завершенным только после вызова complete, незавершенные снимки
+    (например, прерванного обхода) не возвращаются методом snapshots и удаляются методом prune.
+    """
+
+    def __init__(self, path: str = "snapshots.sqlite3") -> None:
+        """
+        :param path: Путь к файлу базы данных.
+        """
+
+        self.__connection = sqlite3.connect(path)
+        self.__connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS snapshots (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                label TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                completed INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS items (
+                snapshot_id INTEGER NOT NULL,
+                article TEXT NOT NULL,
+                price INTEGER,
+                old_price INTEGER,
+                stock INTEGER,
+                url TEXT NOT NULL,
+                PRIMARY KEY (snapshot_id, article)
+            ) WITHOUT ROWID;
+            """
+        )
+        self.__connection.commit()
+
+    def create(self, label: str = "") -> int:
+        """
+        :param label: Описание снимка, например, категория или дата запуска.
+        :return: Идентификатор нового снимка.
+        """
+
+        with self.__connection:
+            cursor = self.__connection.execute(
+                "INSERT INTO snapshots (label, created_at, completed) VALUES (?, ?, 0)",
+                (label, time.time()),
+            )
+        assert cursor.lastrowid is not None
+        return cursor.lastrowid
+
+    def complete(self, snapshot_id: int) -> None:
+        """
+        Метод отмечает снимок как завершенный: с ним будут сравниваться следующие снимки.
+        :param snapshot_id: Идентификатор снимка.
+        :return: None.
+        """
+
+        with self.__connection:
+            self.__connection.execute(
+                "UPDATE snapshots SET completed = 1 WHERE id = ?", (snapshot_id,)
+            )
+
+    def add(self, snapshot_id: int, products: Iterable[Product]) -> None:
+        """
+        Метод для добавления товаров в снимок. Если артикул повторяется, то сохраняется последний товар.
+        :param snapshot_id: Идентификатор снимка.
+        :param products: Карточки товаров.
+        :return: None.
+        """
+
+        with self.__connection:
+            self.__connection.executemany(
+                "INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        snapshot_id,
+                        product.article,
+                        product.price,
+                        product.old_price,
+                        product.stock,
+                        product.url,
+                    )
+                    for product in products
+                ],
+            )
+
+    def carry_over(self, old_id: int, new_id: int, urls: Iterable[str]) -> None:
+        """
+        Метод для переноса товаров из предыдущего снимка, например, если их карточки
+        не удалось загрузить: такие товары не должны попадать в ленту как удаленные.
+        :param old_id: Идентификатор предыдущего снимка.
+        :param new_id: Идентификатор текущего снимка.
+        :param urls: URL адреса карточек товаров.
+        :return: None.
+        """
+
+        with self.__connection:
+            self.__connection.executemany(
+                "INSERT OR IGNORE INTO items SELECT ?, article, price, old_price, stock, url "
+                "FROM items WHERE snapshot_id = ? AND url = ?",
+                [(new_id, old_id, url) for url in urls],
+            )
+
+    def snapshots(self, label: Optional[str] = None) -> list[int]:
+        """
+        :param label: Описание снимков, None - все снимки.
+        :return: Идентификаторы завершенных снимков от старых к новым.
+        """
+
+        query = "SELECT id FROM snapshots WHERE completed = 1"
+        params: tuple[str, ...] = ()
+        if label is not None:
+            query += " AND label = ?"
+            params = (label,)
+        return [
+            snapshot_id
+            for (snapshot_id,) in self.__connection.execute(
+                query + " ORDER BY id", params
+            )
+        ]
+
+    def diff(self, old_id: int, new_id: int) -> Iterator[ChangeEvent]:
+        """
+        Метод для сравнения снимков. Старый снимок загружается в словарь по артикулу (хэш-индекс),
+        новый снимок читается потоково и сравнивается с ним за один проход.
+        :param old_id: Идентификатор предыдущего снимка.
+        :param new_id: Идентификатор текущего снимка.
+        :return: События: changed для каждого изменившегося поля, added и removed.
+        """
+
+        columns = ", ".join(("article", "url", *TRACKED_FIELDS))
+        query = f"SELECT {columns} FROM items WHERE snapshot_id = ?"
+        previous = {
+            article: (url, values)
+            for article, url, *values in self.__connection.execute(query, (old_id,))
+        }
+
+        for article, url, *values in self.__connection.execute(query, (new_id,)):
+            old = previous.pop(article, None)
+            if old is None:
+                yield ChangeEvent(
+                    "added", article, url, new=dict(zip(TRACKED_FIELDS, values))
+                )
+                continue
+
+            _, old_values = old
+            for field, old_value, new_value in zip(TRACKED_FIELDS, old_values, values):
+                if old_value != new_value:
+                    yield ChangeEvent(
+                        "changed", article, url, field, old_value, new_value
+                    )
+
+        for article, (url, old_values) in previous.items():
+            yield ChangeEvent(
+                "removed", article, url, old=dict(zip(TRACKED_FIELDS, old_values))
+            )
+
+    def prune(self, label: str = "", keep: int = 2) -> None:
+        """
+        Метод для удаления старых и незавершенных снимков.
+        Метод нельзя вызывать, пока с тем же label записывается другой снимок.
+        :param label: Описание снимков, снимки с другим label не удаляются.
+        :param keep: Количество последних завершенных снимков, которые необходимо сохранить.
+        :return: None.
+        """
+
+        stale = [
+            (snapshot_id,) for snapshot_id in self.snapshots(label)[: -keep or None]
+        ]
+        stale += self.__connection.execute(
+            "SELECT id FROM snapshots WHERE completed = 0 AND label = ?", (label,)
+        ).fetchall()
+        with self.__connection:
+            self.__connection.executemany(
+                "DELETE FROM items WHERE snapshot_id = ?", stale
+            )
+            self.__connection.executemany("DELETE FROM snapshots WHERE id = ?", stale)
+
+    def close(self) -> None:
+        self.__connection.commit()
+        self.__connection.close()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}()"
+
+
+def write_events(events: Iterable[ChangeEvent], filename: str) -> int:
+    """
+    Функция для записи событий изменения каталога в формат JSON Lines.
+    :param events: События, например, результат SnapshotStore.diff.
+    :param filename: Название итогового файла без расширения.
+    :return: Количество записанных событий.
+    """
+
+    count = 0
+    with open(f"{filename}.jsonl", "w", encoding="utf-8") as file:
+        for event in events:
+            file.write(event.to_json() + "\n")
+            count += 1
+    return count
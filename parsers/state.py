@@ -0,0 +1,178 @@
+import hashlib
+import json
+import sqlite3
+from typing import Iterator
+from typing import NamedTuple
+from typing import Optional
+
+from parsers.models import Product
+
+
+class CrawlDelta(NamedTuple):
+    """
+    Отчет об изменениях каталога между запусками. Товары указаны артикулами.
+    """
+
+    added: list[str]
+    changed: list[str]
+    removed: list[str]
+    unchanged: int
+
+    def __str__(self):
+        return (
+            f"Added: {len(self.added)}, changed: {len(self.changed)}, "
+            f"removed: {len(self.removed)}, unchanged: {self.unchanged}"
+        )
+
+
+class CrawlState:
+    """
+    Хранилище состояния инкрементального обхода в базе SQLite.
+    Для каждого товара (ключ - артикул) хранится URL адрес карточки, хэш ее содержимого,
+    извлеченные данные и номер последнего запуска, в котором товар был найден.
+    Одно хранилище соответствует одной итоговой таблице.
+    """
+
+    def __init__(self, path: str = "crawl_state.sqlite3") -> None:
+        """
+        :param path: Путь к файлу базы данных.
+        """
+
+        self.__connection = sqlite3.connect(path)
+        self.__connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS products (
+                article TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                product TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                last_run INTEGER NOT NULL
+            )
+            """
+        )
+        self.__connection.execute(
+            "CREATE INDEX IF NOT EXISTS products_url ON products (url)"
+        )
+        self.__connection.commit()
+        self.__run = 0
+
+    @staticmethod
+    def hash_content(content: bytes) -> str:
+        """
+        :param content: Содержимое карточки товара.
+        :return: Хэш содержимого.
+        """
+
+        return hashlib.sha256(content).hexdigest()
+
+    def begin_run(self) -> int:
+        """
+        Метод для начала нового запуска.
+        :return: Номер запуска.
+        """
+
+        (last_run,) = self.__connection.execute(
+            "SELECT COALESCE(MAX(last_run), 0) FROM products"
+        ).fetchone()
+        self.__run = last_run + 1
+        return self.__run
+
+    def is_unchanged(self, url: str, content_hash: str, position: int) -> bool:
+        """
+        Метод проверяет, совпадает ли содержимое карточки с сохраненным,
+        и в этом случае отмечает товар как найденный в текущем запуске.
+        :param url: URL адрес карточки товара.
+        :param content_hash: Хэш содержимого карточки.
+        :param position: Порядковый номер карточки в списке URL адресов текущего запуска.
+        :return: True, если карточка не изменилась.
+        """
+
+        cursor = self.__connection.execute(
+            "UPDATE products SET position = ?, last_run = ? WHERE url = ? AND content_hash = ?",
+            (position, self.__run, url, content_hash),
+        )
+        return cursor.rowcount > 0
+
+    def keep(self, url: str, position: int) -> None:
+        """
+        Метод отмечает товар как найденный в текущем запуске без проверки содержимого,
+        например, если его карточку не удалось загрузить.
+        :param url: URL адрес карточки товара.
+        :param position: Порядковый номер карточки в списке URL адресов текущего запуска.
+        :return: None.
+        """
+
+        self.__connection.execute(
+            "UPDATE products SET position = ?, last_run = ? WHERE url = ?",
+            (position, self.__run, url),
+        )
+
+    def upsert(
+        self, product: Product, content_hash: str, position: int
+    ) -> Optional[str]:
+        """
+        Метод для сохранения данных товара.
+        :param product: Данные карточки товара.
+        :param content_hash: Хэш содержимого карточки.
+        :param position: Порядковый номер карточки в списке URL адресов текущего запуска.
+        :return: "added" для нового товара, "changed" для измененного, None если данные не изменились.
+        """
+
+        serialized = json.dumps(product.astuple(), ensure_ascii=False)
+        row = self.__connection.execute(
+            "SELECT product FROM products WHERE article = ?", (product.article,)
+        ).fetchone()
+
+        self.__connection.execute(
+            "INSERT OR REPLACE INTO products VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                product.article,
+                product.url,
+                content_hash,
+                serialized,
+                position,
+                self.__run,
+            ),
+        )
+
+        if row is None:
+            return "added"
+        return "changed" if row[0] != serialized else None
+
+    def remove_unseen(self) -> list[str]:
+        """
+        Метод удаляет товары, которые не были найдены в текущем запуске.
+        :return: Артикулы удаленных товаров.
+        """
+
+        removed = [
+            article
+            for (article,) in self.__connection.execute(
+                "SELECT article FROM products WHERE last_run < ? ORDER BY article",
+                (self.__run,),
+            )
+        ]
+        self.__connection.execute(
+            "DELETE FROM products WHERE last_run < ?", (self.__run,)
+        )
+        self.__connection.commit()
+        return removed
+
+    def products(self) -> Iterator[Product]:
+        """
+        :return: Итератор по сохраненным товарам в порядке URL адресов последнего запуска.
+        """
+
+        for (serialized,) in self.__connection.execute(
+            "SELECT product FROM products ORDER BY position, url"
+        ):
+            title, article, description, *rest = json.loads(serialized)
+            yield Product(title, article, [tuple(pair) for pair in description], *rest)
+
+    def close(self) -> None:
+        self.__connection.commit()
+        self.__connection.close()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}()"
@@ -0,0 +1,227 @@
+import sqlite3
+import time
+from typing import NamedTuple
+from typing import Optional
+
+
+# Колонка таблицы categories, в которой хранится время индексации каждого уровня.
+INDEX_LEVELS = {
+    "categories": "last_seen",
+    "pages": "pages_indexed_at",
+    "products": "products_indexed_at",
+}
+
+
+class IndexRefresh(NamedTuple):
+    """
+    Отчет об обновлении индекса: найденные и исчезнувшие карточки товаров.
+    """
+
+    added: list[str]
+    removed: list[str]
+    pages: int
+
+    def __str__(self):
+        return (
+            f"Added: {len(self.added)}, removed: {len(self.removed)}, "
+            f"pages checked: {self.pages}"
+        )
+
+
+class URLIndex:
+    """
+    Постоянный индекс URL адресов магазина в базе SQLite: категории, страницы категорий
+    и карточки товаров на каждой странице. Для каждого URL адреса хранится время,
+    когда он был найден последний раз.
+    URLParser отдает URL адреса из индекса без обхода магазина, если категория
+    проиндексирована полностью и запись не старше max_age.
+    """
+
+    def __init__(
+        self, path: str = "url_index.sqlite3", max_age: Optional[float] = None
+    ) -> None:
+        """
+        :param path: Путь к файлу базы данных.
+        :param max_age: Время в секундах, в течение которого индекс категории считается актуальным,
+        None - без ограничений.
+        """
+
+        self.max_age = max_age
+        self.__connection = sqlite3.connect(path)
+        self.__connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS categories (
+                category TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                last_seen REAL NOT NULL,
+                pages_indexed_at REAL,
+                products_indexed_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                category TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                last_seen REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS products (
+                url TEXT PRIMARY KEY,
+                page_url TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                last_seen REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS pages_category ON pages (category, position);
+            CREATE INDEX IF NOT EXISTS products_page ON products (page_url, position);
+            """
+        )
+        self.__connection.commit()
+
+    def save_categories(self, categories: list[tuple[str, str]]) -> None:
+        """
+        :param categories: Пары (категория, URL адрес) в порядке блока nav_menu.
+        :return: None.
+        """
+
+        now = time.time()
+        for position, (category, url) in enumerate(categories):
+            self.__connection.execute(
+                """
+                INSERT INTO categories (category, url, position, last_seen) VALUES (?, ?, ?, ?)
+                ON CONFLICT (category) DO UPDATE SET
+                    url = excluded.url, position = excluded.position, last_seen = excluded.last_seen
+                """,
+                (category, url, position, now),
+            )
+        self.__connection.commit()
+
+    def save_pages(self, category: str, pages: list[str]) -> None:
+        """
+        Метод для замены списка страниц категории. Карточки исчезнувших страниц удаляются.
+        :param category: Категория товара.
+        :param pages: URL адреса страниц в порядке блока pagen.
+        :return: None.
+        """
+
+        now = time.time()
+        self.__connection.executemany(
+            "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?)",
+            [(url, category, position, now) for position, url in enumerate(pages)],
+        )
+        self.__connection.execute(
+            "DELETE FROM products WHERE page_url IN "
+            "(SELECT url FROM pages WHERE category = ? AND last_seen < ?)",
+            (category, now),
+        )
+        self.__connection.execute(
+            "DELETE FROM pages WHERE category = ? AND last_seen < ?", (category, now)
+        )
+        self.__connection.execute(
+            "UPDATE categories SET pages_indexed_at = ? WHERE category = ?",
+            (now, category),
+        )
+        self.__connection.commit()
+
+    def save_products(self, page_url: str, products: list[str]) -> None:
+        """
+        Метод для замены списка карточек товаров на странице.
+        :param page_url: URL адрес страницы категории.
+        :param products: URL адреса карточек товаров в порядке их расположения на странице.
+        :return: None.
+        """
+
+        self.__connection.execute(
+            "DELETE FROM products WHERE page_url = ?", (page_url,)
+        )
+        now = time.time()
+        self.__connection.executemany(
+            "INSERT OR REPLACE INTO products VALUES (?, ?, ?, ?)",
+            [(url, page_url, position, now) for position, url in enumerate(products)],
+        )
+        self.__connection.commit()
+
+    def mark_products_indexed(self, category: str) -> None:
+        """
+        Метод отмечает, что карточки товаров всех страниц категории проиндексированы.
+        :param category: Категория товара.
+        :return: None.
+        """
+
+        self.__connection.execute(
+            "UPDATE categories SET products_indexed_at = ? WHERE category = ?",
+            (time.time(), category),
+        )
+        self.__connection.commit()
+
+    def categories(self) -> list[tuple[str, str]]:
+        """
+        :return: Пары (категория, URL адрес) в порядке блока nav_menu.
+        """
+
+        return self.__connection.execute(
+            "SELECT category, url FROM categories ORDER BY position"
+        ).fetchall()
+
+    def is_indexed(
+        self, categories: list[str], level: str = "products", fresh: bool = True
+    ) -> bool:
+        """
+        :param categories: Категории товара.
+        :param level: Что проверяется: "categories" - сами категории, "pages" - страницы категорий,
+        "products" - карточки товаров.
+        :param fresh: Если флаг True, то индекс не должен быть старше max_age.
+        :return: True, если все категории проиндексированы и индекс не старше max_age.
+        """
+
+        if not categories:
+            return False
+
+        column = INDEX_LEVELS[level]
+        oldest = (
+            0.0 if self.max_age is None or not fresh else time.time() - self.max_age
+        )
+        (indexed,) = self.__connection.execute(
+            f"SELECT COUNT(*) FROM categories WHERE {column} >= ? AND category IN "
+            f"({', '.join('?' * len(categories))})",
+            (oldest, *categories),
+        ).fetchone()
+        return indexed == len(categories)
+
+    def pages(self, category: str) -> list[str]:
+        """
+        :param category: Категория товара.
+        :return: URL адреса страниц категории в порядке блока pagen.
+        """
+
+        return [
+            url
+            for (url,) in self.__connection.execute(
+                "SELECT url FROM pages WHERE category = ? ORDER BY position",
+                (category,),
+            )
+        ]
+
+    def products(self, category: str) -> list[str]:
+        """
+        :param category: Категория товара.
+        :return: URL адреса карточек товаров категории в порядке страниц и расположения на странице.
+        """
+
+        return [
+            url
+            for (url,) in self.__connection.execute(
+                """
+                SELECT products.url FROM products
+                JOIN pages ON pages.url = products.page_url
+                WHERE pages.category = ?
+                ORDER BY pages.position, products.position
+                """,
+                (category,),
+            )
+        ]
+
+    def close(self) -> None:
+        self.__connection.commit()
+        self.__connection.close()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}()"
@@ -1,11 +1,36 @@
 import asyncio
 from re import Match
 from re import search
+from typing import AsyncIterator
+from typing import NamedTuple
 from typing import Optional
-
-from bs4 import BeautifulSoup
+from typing import TYPE_CHECKING
 
 from parsers.abc_class import Parser
+from parsers.extractors import extract_page_links
+from parsers.extractors import extract_product_links
+from parsers.extractors import PageLinks
+from parsers.frontier import Frontier
+from parsers.frontier import normalize_url
+from parsers.pipeline import iterate
+from parsers.pipeline import stream_map
+from parsers.resilience import FetchError
+from parsers.scheduler import Priority
+from parsers.session import ParserSession
+
+if TYPE_CHECKING:
+    from parsers.url_index import IndexRefresh
+    from parsers.url_index import URLIndex
+
+
+class ListingPage(NamedTuple):
+    """
+    Страница с товарами. Для первой страницы категории ссылки на товары уже известны.
+    """
+
+    url: str
+    products: Optional[tuple[str, ...]]
+    category: str = ""
 
 
 class URLParser(Parser):
@@ -17,9 +42,35 @@ class URLParser(Parser):
     - URL адреса каждого товара из указанной категории.
     """
 
-    def __init__(self):
-        self.__starting_url = "https://parsinger.ru/html/index1_page_1.html"
-        self.__base_shop_url = "https://parsinger.ru/html/"
+    def __init__(
+        self,
+        session: Optional[ParserSession] = None,
+        base_shop_url: str = "https://parsinger.ru/html/",
+        max_pages: Optional[int] = None,
+        max_depth: Optional[int] = None,
+        expected_urls: Optional[int] = None,
+        url_index: Optional["URLIndex"] = None,
+    ):
+        """
+        :param session: Общая сессия парсеров.
+        :param base_shop_url: Базовый URL адрес магазина, например, адрес локального тестового сервера.
+        :param max_pages: Максимальное количество URL адресов (страниц и карточек товаров) за один обход.
+        :param max_depth: Максимальная глубина обхода: 1 - категории, 2 - страницы категорий, 3 - товары.
+        :param expected_urls: Ожидаемое количество URL адресов для очень больших обходов,
+        если указано, то повторы отсеиваются фильтром Блума.
+        :param url_index: Постоянный индекс URL адресов. Если категория уже проиндексирована,
+        то URL адреса отдаются из индекса без обхода магазина.
+        """
+
+        super().__init__(session)
+        self.__starting_url = base_shop_url + "index1_page_1.html"
+        self.__base_shop_url = base_shop_url
+        self.__max_pages = max_pages
+        self.__max_depth = max_depth
+        self.__expected_urls = expected_urls
+        self.__url_index = url_index
+        self.__start_links: Optional[PageLinks] = None
+        self.__start_lock: Optional[asyncio.Lock] = None
 
     async def get_category_urls(self) -> list[str]:
         """
@@ -27,106 +78,573 @@ class URLParser(Parser):
         :return: Список, содержащий URL адреса категорий товаров.
         """
 
-        soup = BeautifulSoup(await self.get_response(self.starting_url), "lxml")
-        category_urls_tags = soup.find("div", class_="nav_menu").find_all("a")
-        return [self.base_shop_url + tags["href"] for tags in category_urls_tags]
+        with self.session.metrics.stage("get_category_urls"):
+            indexed = self.__indexed_categories(None, level="categories")
+            if indexed is not None:
+                return [url for _, url in indexed]
+
+            start_links = await self.__fetch_start_page(self.__new_frontier())
+            return [url for _, url in self.__named_categories(start_links)]
 
-    async def get_url_for_each_category_page(self) -> list[str]:
+    async def get_url_for_each_category_page(
+        self, specific: Optional[str] = None
+    ) -> list[str]:
         """
         Метод для получения списка URL адресов каждой страницы каждой категорий.
+        В случае, если определен параметр specific, то загружается только страница указанной категории.
+        :param specific: Категория товара, страницы которой необходимо получить.
         :return: Список URL адресов.
         """
 
-        category_urls = await self.get_category_urls()
+        with self.session.metrics.stage("get_url_for_each_category_page"):
+            frontier = self.__new_frontier()
+            url_index = self.__url_index
+            indexed = self.__indexed_categories(specific, level="pages")
+            if (
+                url_index is not None
+                and indexed is not None
+                and frontier.allows(depth=2)
+            ):
+                return [
+                    url for category, _ in indexed for url in url_index.pages(category)
+                ]
 
-        async def fetch_category_page_urls(category_url: str) -> list:
-            """
-            Вложенная функция для обработки URL адресов каждой категории товаров.
-            :param category_url: URL адрес категории товаров.
-            :return: Функция возвращает списки, содержащие URL адреса на каждую страницу товаров каждой категории.
-            """
-
-            category_pages_html = await self.get_response(category_url)
-            soup = BeautifulSoup(category_pages_html, "lxml")
-            category_urls_tags = soup.find("div", class_="pagen").find_all("a")
-            return [
-                self.base_shop_url + category_url["href"]
-                for category_url in category_urls_tags
-            ]
-
-        tasks = [
-            fetch_category_page_urls(each_category_url)
-            for each_category_url in category_urls
-        ]
-        all_category_list_url = await asyncio.gather(*tasks)
-        return [url for sublist in all_category_list_url for url in sublist]
+            listing_pages = await self.__discover_listing_pages(frontier, specific)
+            return [page.url for page in listing_pages]
 
     async def get_url_for_each_product_card(
         self, specific: Optional[str] = None
-    ) -> Optional[list[str]]:
+    ) -> list[str]:
         """
         Метод позволяет получить URL адреса каждого товара каждой категории.
         В случае, если определен параметр specific, то будут возвращены URL адреса всех товаров из той категории,
-        которую указал пользователь.
+        которую указал пользователь. При этом загружаются только страницы указанной категории.
         :param specific: Категория товара из которой необходимо получить URL адреса всех товаров.
         :return: Список URL адресов.
         """
 
-        product_list_urls = await self.get_url_for_each_category_page()
+        with self.session.metrics.stage("get_url_for_each_product_card"):
+            frontier = self.__new_frontier()
+            if not frontier.allows(depth=3):
+                return []
 
-        async def fetch_products_page_urls(product_url: str) -> list:
-            """
-            Вложенная функция для обработки каждой страницы каждой категории товара.
-            :param product_url: URL адрес каждой страницы всех категорий.
-            :return: Множество списков, каждый из которых содержит URL адрес на товар.
-            """
+            indexed = self.__indexed_categories(specific, level="products")
+            if indexed is not None:
+                return self.__indexed_product_urls(indexed, specific)
+
+            listing_pages = await self.__discover_listing_pages(frontier, specific)
+            tasks = [
+                self.__fetch_products_page_urls(frontier, page)
+                for page in listing_pages
+            ]
+            all_products_list_url = await asyncio.gather(*tasks)
+            self.__mark_products_indexed(frontier, listing_pages)
 
-            product_pages_html = await self.get_response(product_url)
-            soup = BeautifulSoup(product_pages_html, "lxml")
-            product_url_tags = soup.find_all("div", class_="sale_button")
             return [
-                self.base_shop_url + product_url.find_all("a")[0]["href"]
-                for product_url in product_url_tags
+                url
+                for sublist in all_products_list_url
+                for url in sublist
+                if self.__admit_product_url(frontier, url, specific)
             ]
 
-        async def compile_final_url_list() -> list[str]:
-            """
-            Вложенная функция для составления итогового списка URL адресов товаров со всех категорий.
-            :return: Список URL адресов товаров со всех категорий.
-            """
+    async def iter_url_for_each_category_page(
+        self,
+        specific: Optional[str] = None,
+        concurrency: int = 20,
+        queue_size: int = 100,
+    ) -> AsyncIterator[str]:
+        """
+        Потоковый аналог get_url_for_each_category_page.
+        URL адреса страниц отдаются сразу после обработки очередной категории.
+        :param specific: Категория товара, страницы которой необходимо получить.
+        :param concurrency: Количество одновременно обрабатываемых категорий.
+        :param queue_size: Размер очереди готовых URL адресов.
+        :return: Асинхронный итератор по URL адресам страниц с товарами.
+        """
 
-            tasks = [
-                fetch_products_page_urls(each_product_urls)
-                for each_product_urls in product_list_urls
-            ]
-            all_products_list_url = await asyncio.gather(*tasks)
-            return [url for sublist in all_products_list_url for url in sublist]
+        with self.session.metrics.stage("iter_url_for_each_category_page"):
+            frontier = self.__new_frontier()
+            url_index = self.__url_index
+            indexed = self.__indexed_categories(specific, level="pages")
+            if (
+                url_index is not None
+                and indexed is not None
+                and frontier.allows(depth=2)
+            ):
+                for category, _ in indexed:
+                    for url in url_index.pages(category):
+                        yield url
+                return
+
+            async for page in self.__iter_listing_pages(
+                frontier, specific, concurrency, queue_size
+            ):
+                yield page.url
+
+    async def iter_url_for_each_product_card(
+        self,
+        specific: Optional[str] = None,
+        concurrency: int = 20,
+        queue_size: int = 100,
+    ) -> AsyncIterator[str]:
+        """
+        Потоковый аналог get_url_for_each_product_card.
+        URL адреса товаров отдаются по мере обработки страниц с товарами,
+        не дожидаясь обхода всего каталога.
+        :param specific: Категория товара из которой необходимо получить URL адреса всех товаров.
+        :param concurrency: Количество одновременно обрабатываемых страниц.
+        :param queue_size: Размер очереди готовых URL адресов.
+        :return: Асинхронный итератор по URL адресам карточек товаров.
+        """
+
+        with self.session.metrics.stage("iter_url_for_each_product_card"):
+            frontier = self.__new_frontier()
+            if not frontier.allows(depth=3):
+                return
+
+            indexed = self.__indexed_categories(specific, level="products")
+            if indexed is not None:
+                for url in self.__indexed_product_urls(indexed, specific):
+                    yield url
+                return
+
+            listing_pages: list[ListingPage] = []
+
+            async def fetch_products_page_urls(page: ListingPage) -> list[str]:
+                listing_pages.append(page)
+                return await self.__fetch_products_page_urls(frontier, page)
 
-        if specific is None:
-            # В случае, если категория товара не указана, то вернутся адреса товаров из всех категорий.
-            return await compile_final_url_list()
+            async for url in stream_map(
+                self.__iter_listing_pages(frontier, specific, concurrency, queue_size),
+                fetch_products_page_urls,
+                concurrency=concurrency,
+                queue_size=queue_size,
+                metrics=self.session.metrics,
+                name="fetch_products_page_urls",
+                flatten=True,
+            ):
+                if self.__admit_product_url(frontier, url, specific):
+                    yield url
 
-        if specific.strip().lower() in self.available_categories:
-            # В случае, если категория определена, то будут возвращены адреса из указанной категории.
-            urls_list: list = []
+            self.__mark_products_indexed(frontier, listing_pages)
 
-            for url_page in await compile_final_url_list():
-                pattern: Match[str] | None = search(rf"\b{specific}/\d", url_page)
-                if pattern is not None:
-                    urls_list.append(pattern.string)
-                else:
-                    pass
+    async def refresh_index(self, specific: Optional[str] = None) -> "IndexRefresh":
+        """
+        Метод для быстрого обновления индекса URL адресов. Повторно загружаются только
+        страницы категорий (блок pagen): по ним определяются новые страницы, новые и исчезнувшие товары.
+        Стартовая страница и карточки товаров не загружаются.
+        Если категория еще не проиндексирована, то выполняется полный обход.
+        :param specific: Категория товара, индекс которой необходимо обновить, None - все категории.
+        :return: Отчет с добавленными и удаленными URL адресами карточек товаров.
+        """
+
+        from parsers.url_index import IndexRefresh
+
+        if self.__url_index is None:
+            raise ValueError("The URL index is not set for %r." % self)
+
+        with self.session.metrics.stage("refresh_index"):
+            indexed = self.__indexed_categories(specific, level="pages", fresh=False)
+            if indexed is None:
+                product_urls = await self.get_url_for_each_product_card(specific)
+                pages = await self.get_url_for_each_category_page(specific)
+                return IndexRefresh(product_urls, [], len(pages))
+
+            refreshed = await asyncio.gather(
+                *(self.__refresh_category(category) for category, _ in indexed)
+            )
+            return IndexRefresh(
+                [url for added, _, _ in refreshed for url in added],
+                [url for _, removed, _ in refreshed for url in removed],
+                sum(pages for _, _, pages in refreshed),
+            )
+
+    def __new_frontier(self) -> Frontier:
+        """
+        Для каждого обхода создается новая граница, ограничения обхода задаются в конструкторе.
+        :return: Граница обхода.
+        """
+
+        return Frontier(self.__max_pages, self.__max_depth, self.__expected_urls)
+
+    async def __fetch_start_page(self, frontier: Frontier) -> PageLinks:
+        """
+        Метод для загрузки стартовой страницы, с которой начинается обход.
+        Страница загружается один раз за время жизни парсера, поэтому одновременные обходы
+        нескольких категорий (см. parsers.jobs) не повторяют ее загрузку.
+        :param frontier: Граница обхода.
+        :return: Ссылки стартовой страницы.
+        """
+
+        frontier.add(self.starting_url, depth=0)
+        if self.__start_lock is None:
+            self.__start_lock = asyncio.Lock()
+
+        async with self.__start_lock:
+            if self.__start_links is None:
+                starting_page_html = await self.get_content(
+                    self.starting_url, Priority.CATEGORY
+                )
+                start_links = await self.parse(extract_page_links, starting_page_html)
+                if self.__url_index is not None:
+                    self.__url_index.save_categories(
+                        self.__named_categories(start_links)
+                    )
+                self.__start_links = start_links
+        return self.__start_links
+
+    def __named_categories(self, start_links: PageLinks) -> list[tuple[str, str]]:
+        """
+        Категория в блоке nav_menu определяется по метке ссылки, а если метка не совпадает
+        ни с одной из available_categories - по порядку категорий в available_categories.
+        :param start_links: Ссылки стартовой страницы.
+        :return: Пары (категория, URL адрес) в порядке блока nav_menu.
+        """
 
-            return urls_list
+        menu = start_links.categories
+        by_position = len(menu) == len(self.available_categories)
+        return [
+            (
+                self.available_categories[position]
+                if by_position and label not in self.available_categories
+                else label or href,
+                normalize_url(self.base_shop_url + href),
+            )
+            for position, (href, label) in enumerate(menu)
+        ]
 
-        if specific.strip().lower() not in self.available_categories:
+    def __check_category(self, specific: str) -> str:
+        """
+        :param specific: Категория товара, указанная пользователем.
+        :return: Категория товара в нижнем регистре.
+        :raises ValueError: Если категория не входит в available_categories.
+        """
+
+        specific = specific.strip().lower()
+        if specific not in self.available_categories:
             raise ValueError(
                 'The specified category "%s" does not match any of the available pattern.'
                 % specific
             )
+        return specific
+
+    def __select_categories(
+        self, frontier: Frontier, start_links: PageLinks, specific: Optional[str]
+    ) -> list[tuple[str, str]]:
+        """
+        Метод для выбора категорий, по которым продолжается обход.
+        :param frontier: Граница обхода.
+        :param start_links: Ссылки стартовой страницы.
+        :param specific: Категория товара, None - все категории.
+        :return: Пары (категория, URL адрес) выбранных категорий.
+        """
+
+        categories = self.__named_categories(start_links)
+
+        if specific is not None:
+            specific = self.__check_category(specific)
+            matched = [
+                (category, url) for category, url in categories if category == specific
+            ]
+            # Если категорию не удалось определить, то обходятся все категории,
+            # а товары отбираются по URL адресу.
+            categories = matched or categories
+
+        starting_url = normalize_url(self.starting_url)
 
+        # Стартовая страница уже загружена и сама является страницей одной из категорий.
+        return [
+            (category, url)
+            for category, url in categories
+            if frontier.add(url, depth=1) or url == starting_url
+        ]
+
+    def __indexed_categories(
+        self, specific: Optional[str], level: str, fresh: bool = True
+    ) -> Optional[list[tuple[str, str]]]:
+        """
+        :param specific: Категория товара, None - все категории.
+        :param level: Уровень индекса: "categories", "pages" или "products".
+        :param fresh: Если флаг True, то учитывается срок актуальности индекса (max_age).
+        :return: Пары (категория, URL адрес) из индекса или None,
+        если категории нужно обойти заново.
+        """
+
+        if self.__url_index is None:
+            return None
+
+        categories = self.__url_index.categories()
+        if specific is not None:
+            specific = self.__check_category(specific)
+            categories = [
+                (category, url) for category, url in categories if category == specific
+            ]
+
+        names = [category for category, _ in categories]
+        if self.__url_index.is_indexed(names, level, fresh):
+            return categories
         return None
 
+    def __indexed_product_urls(
+        self, categories: list[tuple[str, str]], specific: Optional[str]
+    ) -> list[str]:
+        """
+        :param categories: Пары (категория, URL адрес) из индекса.
+        :param specific: Категория товара, None - все категории.
+        :return: URL адреса карточек товаров из индекса без повторов.
+        """
+
+        assert self.__url_index is not None
+        product_urls = dict.fromkeys(
+            url
+            for category, _ in categories
+            for url in self.__url_index.products(category)
+            if specific is None or self.__is_specific_product_url(url, specific)
+        )
+        return list(product_urls)
+
+    def __mark_products_indexed(
+        self, frontier: Frontier, listing_pages: list[ListingPage]
+    ) -> None:
+        """
+        Метод отмечает в индексе категории, все страницы которых были обработаны.
+        Если обход был ограничен или часть страниц не загрузилась, то индекс остается неполным.
+        :param frontier: Граница обхода.
+        :param listing_pages: Обработанные страницы с товарами.
+        :return: None.
+        """
+
+        if self.__url_index is None or frontier.exhausted or not frontier.allows(3):
+            return
+
+        failed = {
+            page.category for page in listing_pages if page.url in frontier.failed
+        }
+        for category in dict.fromkeys(page.category for page in listing_pages):
+            if category not in failed:
+                self.__url_index.mark_products_indexed(category)
+
+    async def __discover_listing_pages(
+        self, frontier: Frontier, specific: Optional[str]
+    ) -> list[ListingPage]:
+        """
+        Метод для получения страниц с товарами выбранных категорий.
+        :param frontier: Граница обхода.
+        :param specific: Категория товара, None - все категории.
+        :return: Страницы с товарами в порядке категорий и страниц.
+        """
+
+        start_links = await self.__fetch_start_page(frontier)
+
+        tasks = [
+            self.__fetch_category_page_urls(frontier, category, start_links)
+            for category in self.__select_categories(frontier, start_links, specific)
+        ]
+        all_category_pages = await asyncio.gather(*tasks)
+        return [
+            page for category_pages in all_category_pages for page in category_pages
+        ]
+
+    async def __iter_listing_pages(
+        self,
+        frontier: Frontier,
+        specific: Optional[str],
+        concurrency: int,
+        queue_size: int,
+    ) -> AsyncIterator[ListingPage]:
+        """
+        Потоковый аналог __discover_listing_pages.
+        """
+
+        start_links = await self.__fetch_start_page(frontier)
+
+        async def fetch_category_page_urls(
+            category: tuple[str, str]
+        ) -> list[ListingPage]:
+            return await self.__fetch_category_page_urls(
+                frontier, category, start_links
+            )
+
+        async for page in stream_map(
+            iterate(self.__select_categories(frontier, start_links, specific)),
+            fetch_category_page_urls,
+            concurrency=concurrency,
+            queue_size=queue_size,
+            metrics=self.session.metrics,
+            name="fetch_category_page_urls",
+            flatten=True,
+        ):
+            yield page
+
+    async def __fetch_category_page_urls(
+        self,
+        frontier: Frontier,
+        category: tuple[str, str],
+        start_links: PageLinks,
+    ) -> list[ListingPage]:
+        """
+        Метод для обработки URL адресов каждой категории товаров.
+        Первая страница категории разбирается один раз: ссылки на ее товары сохраняются
+        и повторно страница не загружается.
+        :param frontier: Граница обхода.
+        :param category: Пара (категория, URL адрес категории товаров).
+        :param start_links: Ссылки уже загруженной стартовой страницы.
+        :return: Список страниц товаров категории.
+        """
+
+        if not frontier.allows(depth=2):
+            return []
+
+        name, category_url = category
+
+        if category_url == normalize_url(self.starting_url):
+            links = start_links
+        else:
+            try:
+                category_pages_html = await self.get_content(
+                    category_url, Priority.CATEGORY
+                )
+            except FetchError:
+                frontier.failed.add(category_url)
+                return []
+            links = await self.parse(extract_page_links, category_pages_html)
+
+        page_urls = [
+            normalize_url(self.base_shop_url + href) for href in links.pagination
+        ]
+        if self.__url_index is not None:
+            self.__url_index.save_pages(name, page_urls)
+
+        pages: list[ListingPage] = []
+        for url in page_urls:
+            if url == category_url:
+                pages.append(ListingPage(url, links.products, name))
+            elif frontier.add(url, depth=2):
+                pages.append(ListingPage(url, None, name))
+        return pages
+
+    async def __fetch_products_page_urls(
+        self, frontier: Frontier, page: ListingPage
+    ) -> list[str]:
+        """
+        Метод для обработки каждой страницы каждой категории товара.
+        :param frontier: Граница обхода.
+        :param page: Страница категории.
+        :return: Список, содержащий URL адреса на товары со страницы.
+        """
+
+        product_links = page.products
+        if product_links is None:
+            try:
+                product_pages_html = await self.get_content(page.url, Priority.LISTING)
+            except FetchError:
+                frontier.failed.add(page.url)
+                return []
+            product_links = await self.parse(extract_product_links, product_pages_html)
+
+        product_urls = [
+            normalize_url(self.base_shop_url + href) for href in product_links
+        ]
+        if self.__url_index is not None:
+            self.__url_index.save_products(page.url, product_urls)
+        return product_urls
+
+    async def __fetch_listing_links(self, url: str) -> Optional[PageLinks]:
+        """
+        :param url: URL адрес страницы категории.
+        :return: Ссылки страницы или None, если страницу не удалось загрузить.
+        """
+
+        try:
+            html = await self.get_content(url, Priority.LISTING)
+        except FetchError:
+            return None
+        return await self.parse(extract_page_links, html)
+
+    async def __refresh_category(
+        self, category: str
+    ) -> tuple[list[str], list[str], int]:
+        """
+        Метод для обновления индекса одной категории по ее страницам.
+        Список страниц берется из блока pagen первой загруженной страницы, новые страницы
+        загружаются дополнительно. Для страниц, которые не удалось загрузить, сохраняются прежние товары.
+        :param category: Категория товара.
+        :return: Добавленные и удаленные URL адреса карточек товаров, количество загруженных страниц.
+        """
+
+        url_index = self.__url_index
+        assert url_index is not None
+        before = url_index.products(category)
+        known_pages = url_index.pages(category)
+
+        links = dict(
+            zip(
+                known_pages,
+                await asyncio.gather(*map(self.__fetch_listing_links, known_pages)),
+            )
+        )
+        loaded = [page_links for page_links in links.values() if page_links is not None]
+        if not loaded:
+            return [], [], 0
+
+        page_urls = [
+            normalize_url(self.base_shop_url + href) for href in loaded[0].pagination
+        ]
+        new_pages = [url for url in page_urls if url not in links]
+        links.update(
+            zip(
+                new_pages,
+                await asyncio.gather(*map(self.__fetch_listing_links, new_pages)),
+            )
+        )
+
+        for url in page_urls:
+            page_links = links[url]
+            if page_links is not None:
+                url_index.save_products(
+                    url,
+                    [
+                        normalize_url(self.base_shop_url + href)
+                        for href in page_links.products
+                    ],
+                )
+        url_index.save_pages(category, page_urls)
+        if all(links[url] is not None for url in page_urls):
+            url_index.mark_products_indexed(category)
+
+        after = url_index.products(category)
+        after_set, before_set = set(after), set(before)
+        return (
+            [url for url in after if url not in before_set],
+            [url for url in before if url not in after_set],
+            len(links),
+        )
+
+    def __admit_product_url(
+        self, frontier: Frontier, url: str, specific: Optional[str]
+    ) -> bool:
+        """
+        :param frontier: Граница обхода.
+        :param url: URL адрес карточки товара.
+        :param specific: Категория товара, None - все категории.
+        :return: True, если товар относится к категории и еще не был найден.
+        """
+
+        if specific is not None and not self.__is_specific_product_url(url, specific):
+            return False
+        return frontier.add(url, depth=3)
+
+    @staticmethod
+    def __is_specific_product_url(url: str, specific: str) -> bool:
+        """
+        :param url: URL адрес карточки товара.
+        :param specific: Категория товара.
+        :return: True, если товар относится к указанной категории.
+        """
+
+        pattern: Optional[Match[str]] = search(rf"\b{specific}/\d", url)
+        return pattern is not None
+
     @property
     def starting_url(self):
         return self.__starting_url